@@ -0,0 +1,337 @@
+""""
+DESCRIPTION
+    Measure how the pipeline scales: generate realistic bank and retailer exports (and the configuration files for them) in a temporary copy of the folder layout,
+    time each building block of the pipeline on its own, in isolation (IsolatedSteps), and each stage end-to-end (Stages), and report rows/s, files/s and peak memory as JSON
+    A stage that logs an error or doesn't get every file through is reported as Failed, without a throughput, and the benchmark exits with 1
+    Nothing outside the temporary folder is read or written, so it's safe to run next to real data
+
+PARAMETERS
+    --rows N
+        - Optional
+        - Rows per generated file (default 10000)
+    --files N
+        - Optional
+        - Files per source (default 3); consecutive files of a source cover overlapping date windows, as real exports do
+    --sources N
+        - Optional
+        - Number of sources (default 2); sources alternate between bank and retailer exports
+    --dirty-rate R
+        - Optional
+        - Share of rows (0 to 1, default 0.01) that are dirty: a blank amount, an unparseable date, or a repeat of the row before it
+    --seed N
+        - Optional
+        - Seed of the random data, so that runs can be compared (default 0)
+    --workers N
+        - Optional
+        - Workers used by LoadFileToBronze (default 1)
+    --storage-format Text|Parquet|Feather
+        - Optional
+        - The Utilities.StorageFormat to benchmark (default Text)
+    --output <FullPath>
+        - Optional
+        - Write the report to this file; if not used, it's written to standard output
+    --keep
+        - Optional
+        - Keep the temporary folder (its path is in the report) instead of deleting it
+"""
+
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import argparse
+import contextlib
+import csv
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import Utilities
+from datetime import datetime
+from Utilities import pd #pandas, imported the first time it's used
+
+#****************************************************************************************
+#GLOBAL VARIABLES
+#   Set these variables to either empty or hard-coded values
+#   These variables can change value by any function
+#****************************************************************************************
+Brands = ['Acme', 'Bolt', 'Contoso', 'Evergreen', 'Fabrikam', 'Globex', 'Initech', 'Northwind', 'Summit', 'Umbrella']
+Categories = ['Dining', 'Electronics', 'Entertainment', 'Fuel', 'Groceries', 'Household', 'Travel', 'Utilities']
+CurrentScriptFile = os.path.realpath(__file__)
+Items = ['Batteries', 'Coffee', 'Detergent', 'Headphones', 'Light Bulbs', 'Notebook', 'Paper Towels', 'Shampoo', 'Socks', 'Toothpaste']
+Merchants = ['Amazon', 'Costco', 'Home Depot', 'Kroger', 'Netflix', 'Shell', 'Starbucks', 'Target', 'Uber', 'Walmart']
+OverlapShare = 0.2 #Share of each generated file that repeats the end of the file before it, as overlapping exports do
+Sellers = ['Amazon', 'Best Buy', 'Costco', 'eBay', 'Etsy', 'Target', 'Walmart']
+SourceTemplates = { #Columns: column name in the file: (Datatype, IsNaturalKey); Expressions: calculated column: Expression rule
+    'Bank': {
+        'Delimiter': ','
+        , 'Columns': {'Date': ('Date', 1), 'Description': ('Text', 1), 'Amount': ('Decimal', 1), 'Balance': ('Decimal', 1)}
+        , 'Expressions': {'Direction': "'Debit' if Number(row['Amount']) < 0 else 'Credit'", 'Merchant': "Upper(Strip(Replace(row['Description'], '#', '')))", 'TransactionMonth': "Month(Date(row['Date'], '%Y-%m-%d'))"}
+    }
+    , 'Retailer': {
+        'Delimiter': ';'
+        , 'Columns': {'OrderDate': ('Date', 1), 'OrderID': ('Text', 1), 'Item': ('Text', 1), 'Brand': ('Text', ''), 'Category': ('Text', ''), 'Seller': ('Text', ''), 'Quantity': ('Integer', ''), 'Price': ('Decimal', '')}
+        , 'Expressions': {'Total': "Round(Number(row['Quantity']) * Number(row['Price']), 2)", 'IsBulk': "Number(row['Quantity']) >= 3 and row['Category'] in ['Groceries', 'Household']", 'TransactionMonth': "Month(Date(row['OrderDate'], '%Y-%m-%d'))"}
+    }
+}
+
+#****************************************************************************************
+#FUNCTIONS
+#****************************************************************************************
+def GenerateConfigurations(Sources):
+    #Write file & column level configurations for the generated sources, in the layout's Admin folder
+    FileConfigurations = []
+    ColumnConfigurations = []
+    for ConfigurationFileID, (Source, Template) in enumerate(Sources.items(), start = 1):
+        FileConfigurations.append({'Account': f'{Source} Account', 'ChunkSize': '', 'ConfigurationFileID': ConfigurationFileID, 'DefaultCategory': 'Uncategorized', 'Delimiter': SourceTemplates[Template]['Delimiter'], 'Source': Source, 'TextQualifier': ''}) #A blank TextQualifier is a double quote
+        for Order, (Column, (Datatype, IsNaturalKey)) in enumerate(SourceTemplates[Template]['Columns'].items(), start = 1):
+            ColumnConfigurations.append({'ColumnName_Bronze': Column, 'ColumnName_File': Column, 'ColumnName_Silver': Column, 'ColumnName_Gold': '', 'ConfigurationColumnOrder': Order, 'ConfigurationFileID': ConfigurationFileID, 'Datatype': Datatype, 'IsNaturalKey': IsNaturalKey, 'Transformation_FileToBronze': ''})
+        for Order, (Column, Formula) in enumerate(SourceTemplates[Template]['Expressions'].items(), start = len(SourceTemplates[Template]['Columns']) + 1):
+            ColumnConfigurations.append({'ColumnName_Bronze': Column, 'ColumnName_File': '', 'ColumnName_Silver': Column, 'ColumnName_Gold': '', 'ConfigurationColumnOrder': Order, 'ConfigurationFileID': ConfigurationFileID, 'Datatype': '', 'IsNaturalKey': '', 'Transformation_BronzeToSilver': Formula, 'Transformation_BronzeToSilver_Type': 'Expression', 'Transformation_FileToBronze': ''})
+    pd.DataFrame(FileConfigurations, columns = Utilities.FileDefinition_Configuration_File).to_csv(Utilities.FullPath_Configurations_File, sep = Utilities.DelimiterDefault, index = False)
+    pd.DataFrame(ColumnConfigurations, columns = Utilities.FileDefinition_Configuration_Column).to_csv(Utilities.FullPath_Configurations_Column, sep = Utilities.DelimiterDefault, index = False)
+
+def GenerateExports(Sources, Rows, Files, DirtyRate, Seed):
+    #Write Files overlapping exports of Rows rows for every source to /<Root>/Bronze/Inbound/<Source>/; return every file written
+    import numpy as np #Only generating the exports needs numpy directly, so don't import it before the pipeline does
+    Random = np.random.RandomState(Seed)
+    Step = max(int(Rows * (1 - OverlapShare)), 1) #Each file starts this many transactions after the one before it
+    Written = []
+    for Source, Template in Sources.items():
+        Transactions = GenerateTransactions(Template, Step * (Files - 1) + Rows, Random)
+        os.makedirs(os.path.join(Utilities.FullPath_Bronze_Inbound, Source), exist_ok = True)
+        for FileNumber in range(Files):
+            Export = Transactions.iloc[FileNumber * Step:FileNumber * Step + Rows].copy()
+            Export = MakeDirty(Export, Template, DirtyRate, Random)
+            FullPath = os.path.join(Utilities.FullPath_Bronze_Inbound, Source, f'{Source}.Export{FileNumber + 1:03d}.csv')
+            Export.to_csv(FullPath, sep = SourceTemplates[Template]['Delimiter'], index = False)
+            Written.append((Source, FullPath))
+    return Written
+
+def GenerateTransactions(Template, Rows, Random):
+    #Generate Rows transactions in date order; a bank export is a running statement, a retailer export is order lines
+    Dates = (pd.Timestamp('2020-01-01') + pd.to_timedelta(sorted(Random.randint(0, 5 * 365, Rows)), unit = 'D')).strftime('%Y-%m-%d')
+    if(Template == 'Bank'):
+        Amounts = (-Random.gamma(2, 30, Rows)).round(2)
+        Amounts[Random.random_sample(Rows) < 0.05] *= -20 #Every so often, a deposit
+        return pd.DataFrame({
+            'Date': Dates
+            , 'Description': [f'{Merchant} #{Store}' for Merchant, Store in zip(Random.choice(Merchants, Rows), Random.randint(100, 999, Rows))]
+            , 'Amount': Amounts
+            , 'Balance': (5000 + Amounts.cumsum()).round(2)
+        })
+    return pd.DataFrame({
+        'OrderDate': Dates
+        , 'OrderID': [f'ORD-{OrderNumber:09d}' for OrderNumber in Random.randint(0, 10 ** 9, Rows)]
+        , 'Item': Random.choice(Items, Rows)
+        , 'Brand': Random.choice(Brands, Rows)
+        , 'Category': Random.choice(Categories, Rows)
+        , 'Seller': Random.choice(Sellers, Rows)
+        , 'Quantity': Random.randint(1, 5, Rows)
+        , 'Price': Random.gamma(2, 15, Rows).round(2)
+    })
+
+def Main(Arguments = None):
+    Parser = argparse.ArgumentParser(prog = 'python -m Benchmark', description = 'Benchmark the pipeline against generated exports')
+    Parser.add_argument('--rows', default = 10000, type = int)
+    Parser.add_argument('--files', default = 3, type = int)
+    Parser.add_argument('--sources', default = 2, type = int)
+    Parser.add_argument('--dirty-rate', default = 0.01, type = float)
+    Parser.add_argument('--seed', default = 0, type = int)
+    Parser.add_argument('--workers', default = 1, type = int)
+    Parser.add_argument('--storage-format', default = 'Text', choices = sorted(Utilities.StorageFormats))
+    Parser.add_argument('--output', default = '')
+    Parser.add_argument('--keep', action = 'store_true')
+    Arguments = Parser.parse_args(Arguments)
+
+    #Work in a temporary copy of the folder layout
+    Utilities.RootFolder = tempfile.mkdtemp(prefix = 'PipelineBenchmark.')
+    Utilities.StorageFormat = Arguments.storage_format
+    Report = {
+        'Begin': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+        , 'Environment': {'Machine': platform.machine(), 'pandas': pd.__version__, 'Platform': platform.platform(), 'Python': platform.python_version()}
+        , 'Parameters': {'DirtyRate': Arguments.dirty_rate, 'Files': Arguments.files, 'Rows': Arguments.rows, 'Seed': Arguments.seed, 'Sources': Arguments.sources, 'StorageFormat': Arguments.storage_format, 'Workers': Arguments.workers}
+        , 'RootFolder': Utilities.RootFolder
+        , 'IsolatedSteps': [] #Each building block timed on its own over the generated exports, outside of any load; not a breakdown of Stages
+        , 'Stages': []
+    }
+    try:
+        with contextlib.redirect_stdout(sys.stderr): #Anything the pipeline prints goes to standard error, so that standard output is just the report
+            LogEntries = []
+            LogEntries, Result = Utilities.SetGlobalVariables(CurrentScriptFile, 'Main', LogEntries, '')
+            LogEntries, Result = Utilities.ValidateLogFile('Main', LogEntries, '')
+
+            #Generate the configurations and exports
+            Sources = {f'{Template}{Number // 2 + 1}': Template for Number, Template in ((Number, ['Bank', 'Retailer'][Number % 2]) for Number in range(Arguments.sources))}
+            GenerateConfigurations(Sources)
+            Files = Measure(Report['Stages'], 'Generate', lambda: GenerateExports(Sources, Arguments.rows, Arguments.files, Arguments.dirty_rate, Arguments.seed), Arguments.rows * Arguments.files * Arguments.sources, Arguments.files * Arguments.sources)
+            LogEntries, Result = Utilities.CompileConfigurations('Main', LogEntries, '')
+
+            #Time each building block on its own, against the generated exports
+            RunSteps(Report['IsolatedSteps'], Files, Arguments.rows)
+            shutil.rmtree(Utilities.FullPath_Silver_Fingerprint) #Forget the rows fingerprinted by the steps, so that the stages load every row again
+            os.makedirs(Utilities.FullPath_Silver_Fingerprint)
+            Utilities.FingerprintPartitions.clear()
+
+            #Time each stage end-to-end
+            import LoadFileToBronze
+            import LoadBronzeToSilver
+            MeasureStage(Report['Stages'], 'LoadFileToBronze', lambda: LoadFileToBronze.Main(Workers = Arguments.workers), Arguments.rows * len(Files), len(Files), lambda: {'FilesStaged': CountFiles(Utilities.FullPath_Silver_Inbound), 'FilesRejected': CountFiles(Utilities.FullPath_Bronze_Error)}, 'FilesStaged')
+            MeasureStage(Report['Stages'], 'LoadBronzeToSilver', lambda: LoadBronzeToSilver.Main(), Arguments.rows * len(Files), len(Files), lambda: {'FilesLoaded': len(Utilities.Manifest)}, 'FilesLoaded') #A file is only added to the manifest once every chunk of it has been transformed
+        Report['End'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+    finally:
+        if not Arguments.keep: shutil.rmtree(Utilities.RootFolder, ignore_errors = True)
+
+    #Write the report
+    if(Arguments.output != ''):
+        with open(Arguments.output, 'w') as f: json.dump(Report, f, indent = 2)
+    else:
+        print(json.dumps(Report, indent = 2))
+    return Report
+
+def MakeDirty(Export, Template, DirtyRate, Random):
+    #Spoil DirtyRate of the rows, evenly split between a blank amount, an unparseable date, and a repeat of the row before it
+    IsDirty = Random.random_sample(len(Export)) < DirtyRate
+    Kind = Random.randint(0, 3, len(Export))
+    AmountColumn, DateColumn = ('Amount', 'Date') if Template == 'Bank' else ('Price', 'OrderDate')
+    Export[AmountColumn] = Export[AmountColumn].astype(object)
+    Export.loc[IsDirty & (Kind == 0), AmountColumn] = ''
+    Export.loc[IsDirty & (Kind == 1), DateColumn] = 'N/A'
+    IsRepeat = IsDirty & (Kind == 2)
+    IsRepeat[0] = False
+    Export.iloc[IsRepeat.nonzero()[0]] = Export.iloc[IsRepeat.nonzero()[0] - 1].values
+    return Export
+
+def Measure(Results, Name, Function, Rows, Files, Outcome = None):
+    #Run Function once and record its wall & CPU time, throughput and the peak memory of the process so far
+    WallBegin = time.perf_counter()
+    CPUBegin = time.process_time()
+    Returned = Function()
+    Seconds = time.perf_counter() - WallBegin
+    Entry = {
+        'Name': Name
+        , 'Seconds': round(Seconds, 6)
+        , 'CPUSeconds': round(time.process_time() - CPUBegin, 6)
+        , 'Rows': Rows
+        , 'Files': Files
+        , 'RowsPerSecond': round(Rows / Seconds, 1) if Seconds > 0 else None
+        , 'FilesPerSecond': round(Files / Seconds, 3) if Seconds > 0 else None
+        , 'PeakRSSBytes': Utilities.RetrievePeakRSS()
+    }
+    if(Outcome is not None): Entry.update(Outcome())
+    Results.append(Entry)
+    return Returned
+
+def MeasureStage(Results, Name, Function, Rows, Files, Outcome, FilesDone):
+    #Measure a load end-to-end, as Measure does; the load failed if it logged an error or got fewer than all of the Files through (FilesDone names the count in Outcome), and then its throughput means nothing, so it's left out
+    ErrorsBefore = CountLoggedErrors()
+    Measure(Results, Name, Function, Rows, Files, Outcome)
+    Entry = Results[-1]
+    Entry['Errors'] = CountLoggedErrors() - ErrorsBefore
+    Entry['Failed'] = (Entry['Errors'] > 0) or (Entry[FilesDone] < Files)
+    if Entry['Failed']:
+        Entry.update({'FilesPerSecond': None, 'RowsPerSecond': None})
+        print(f'{Name} failed: {Entry[FilesDone]} of {Files} files, {Entry["Errors"]} errors logged (use --keep to look at the log)', file = sys.stderr)
+
+def CountFiles(Folder):
+    #Don't log this function
+    return sum(len(FileNames) for _, _, FileNames in os.walk(Folder))
+
+def CountLoggedErrors():
+    #Don't log this function
+    #The number of errors in the log of the temporary layout so far
+    if(Utilities.LogBackend == 'SQLite'):
+        LogDatabase = Utilities.ConnectLogDatabase()
+        try: return LogDatabase.execute('SELECT COUNT(*) FROM Log WHERE Severity = ?', (Utilities.Severity_Error,)).fetchone()[0]
+        finally: LogDatabase.close()
+    if not os.path.exists(Utilities.FullPath_LogFile): return 0
+    with open(Utilities.FullPath_LogFile, newline = '') as f: return sum(1 for Entry in csv.DictReader(f, fieldnames = Utilities.FileDefinition_Log, delimiter = Utilities.DelimiterDefault) if Entry['Severity'] == Utilities.Severity_Error)
+
+def RunSteps(Results, Files, Rows):
+    #Time the pipeline's building blocks one at a time, each over every generated file, the way the loaders use them but outside of any load; these times are of each block in isolation, not a breakdown of a stage
+    Configurations = {Source: Utilities.Configurations_Compiled[Source] for Source, _ in Files}
+    Exports = []
+    Rows = Rows * len(Files)
+
+    def ValidateHeaders():
+        LogEntries = []
+        for Source, FullPath in Files:
+            LogEntries, Result, ColumnHeader, IsEmpty = Utilities.RetrieveColumnHeader('Main', Configurations[Source].Delimiter, FullPath, LogEntries, '', Configurations[Source].TextQualifier)
+            LogEntries, Result, Issue = Utilities.ValidateColumnHeader(ColumnHeader, 'Main', list(Configurations[Source].ColumnHeader), LogEntries, '')
+    Measure(Results, 'HeaderValidation', ValidateHeaders, 0, len(Files))
+
+    def ReadExports():
+        for Source, FullPath in Files: Exports.append((Source, pd.read_csv(FullPath, delimiter = Configurations[Source].Delimiter, dtype = {Column: str for Column in Configurations[Source].Datatypes})))
+    Measure(Results, 'Read', ReadExports, Rows, len(Files))
+
+    def RemoveDuplicateRows():
+        for Source, Export in Exports:
+            Export, Fingerprints = Utilities.RemoveDuplicateRows(Export, Configurations[Source].Account, Configurations[Source].NaturalKeyColumns, Configurations[Source].NaturalKeyDateColumn, Configurations[Source].NaturalKeyDateFormat)
+            Utilities.RecordRowFingerprints(Configurations[Source].Account, Fingerprints)
+    Measure(Results, 'RowDeduplication', RemoveDuplicateRows, Rows, len(Files))
+
+    MemoryBytes = {'Before': sum(int(Export.memory_usage(deep = True).sum()) for _, Export in Exports)}
+    def ApplyDatatypes():
+        for Source, Export in Exports: Utilities.ApplyDatatypes(Export, Configurations[Source].Datatypes)
+        MemoryBytes['After'] = sum(int(Export.memory_usage(deep = True).sum()) for _, Export in Exports)
+    Measure(Results, 'Datatypes', ApplyDatatypes, Rows, len(Files), Outcome = lambda: {'MemoryBytesBefore': MemoryBytes['Before'], 'MemoryBytesAfter': MemoryBytes['After']})
+
+    def ApplyExpressions():
+        for Source, Export in Exports: Utilities.ApplyExpressions(Export, Configurations[Source].Expressions)
+    Measure(Results, 'Expressions', ApplyExpressions, Rows, len(Files))
+
+    #Lookups, ToMap and dimension appends work on the values that name a dimension member: a bank's Description, a retailer's Seller
+    Values = [(Source, Export['Description' if 'Description' in Export.columns else 'Seller'].astype(str)) for Source, Export in Exports]
+    Dimension = pd.DataFrame({'Name': pd.unique(pd.concat([Value for _, Value in Values]))})
+    Dimension['SellerGUID'] = Utilities.BuildSurrogateKeys('Seller', Dimension, ['Name'])
+
+    def Lookup():
+        for _, Value in Values: pd.merge(Value.rename('Name').to_frame(), Dimension, on = 'Name', how = 'left')
+    Measure(Results, 'Lookups', Lookup, Rows, len(Files))
+
+    def DeriveKeys():
+        #The same keys as Lookups, worked out from the values themselves rather than joined from the dimension (SurrogateKeyMode Derived)
+        for _, Value in Values: Utilities.BuildSurrogateKeys('Seller', Value.rename('Name').to_frame(), ['Name'])
+    Measure(Results, 'DerivedKeys', DeriveKeys, Rows, len(Files))
+
+    #Half the values are already mapped, as they would be after the first few runs; the Account stands in for its AccountGUID
+    Mapped = pd.concat([pd.DataFrame({'AccountGUID': Configuration.Account, 'SourceValue': Dimension['Name'].iloc[::2]}) for Configuration in Configurations.values()], ignore_index = True)
+    for Column in Utilities.MappingColumns + ['DateTimeInserted']: Mapped[Column] = Mapped['SourceValue']
+    Mapped.to_csv(Utilities.FullPath_Configurations_BrandCategoryProductServiceSeller, columns = Utilities.FileDefinition_Configuration_BrandCategoryProductServiceSeller, index = False, sep = Utilities.DelimiterDefault)
+    def ResolveMappings():
+        #Load the mappings once, resolve every row, and write the values not mapped yet to ToMap once, as a run does
+        LogEntries = []
+        LogEntries, Result = Utilities.RetrieveMappings('Main', LogEntries, '')
+        for Source, Value in Values: Utilities.ResolveMappings(Value.rename('SourceValue').to_frame(), Configurations[Source].Account, 'SourceValue')
+        Utilities.FlushMappings()
+    Measure(Results, 'ToMap', ResolveMappings, Rows, len(Files))
+
+    def AppendToDimension():
+        LogEntries = []
+        LogEntries, Result, FullPath, Existing = Utilities.ValidateSilverDimension('Main', 'Seller', LogEntries, '')
+        for _, Value in Values:
+            New = pd.DataFrame({'DateTimeInserted': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f'), 'Name': pd.unique(Value)})
+            New['SellerGUID'] = Utilities.BuildSurrogateKeys('Seller', New, ['Name'])
+            ToAppend = Utilities.RemoveExistingNaturalKeys(New, ['Name'], FullPath, Existing, ['Name'])
+            if not ToAppend.empty:
+                Utilities.WriteTable(FullPath, ToAppend, Append = True)
+                Utilities.AppendToNaturalKeyIndex(FullPath, ToAppend, ['Name'])
+                Utilities.AppendToCachedFile(FullPath, ToAppend)
+    Measure(Results, 'DimensionAppends', AppendToDimension, Rows, len(Files))
+
+    def WriteLog():
+        #One log entry per row, which is far more than a run writes, to measure the log's throughput
+        LogEntries = Utilities.LogSink()
+        Begin = datetime.now()
+        for Number in range(Rows): Utilities.LogStep(Begin, CurrentScriptFile, 'Main > Benchmark', str(Number), LogEntries, {}, Result = Utilities.Result_Success, Severity = Utilities.Severity_Info)
+        LogEntries.Close()
+    Measure(Results, 'LogWrite', WriteLog, Rows, 0)
+
+#****************************************************************************************
+#ENTRY
+#****************************************************************************************
+if __name__ == '__main__':
+    Report = Main()
+    if any(Stage.get('Failed') for Stage in Report['Stages']): raise SystemExit(1) #A failed stage fails the benchmark, so that a script running it notices
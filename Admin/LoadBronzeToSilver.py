@@ -3,10 +3,10 @@
 #****************************************************************************************
 import datetime
 import os
-import pandas as pd
 import Utilities
 import uuid
 from datetime import datetime
+from Utilities import pd #pandas, imported the first time it's used
 
 #****************************************************************************************
 #GLOBAL VARIABLES
@@ -14,17 +14,15 @@ from datetime import datetime
 #   These variables can change value by any function
 #****************************************************************************************
 AllInboundFolders = True
-ConfigurationFileID = 0
-Configurations_Column_CurrentFile = pd.DataFrame()
-Configurations_File_CurrentFile = pd.DataFrame()
+Configuration = None #The compiled SourceConfiguration of the current source
+Configurations_Column_CurrentFile = None #A DataFrame of the column level configurations of the current source
 CurrentScriptFile = os.path.realpath(__file__)
-ExpectedDelimiter = ''
 FullPath_Bronze_Archive_CurrentSource = ''
 FullPath_Silver_Error_CurrentSource = ''
 FullPath_Silver_Inbound_CurrentSource = ''
 InboundFileFound = False
 IsValid_LogFile = False
-LogEntries = []
+LogEntries = Utilities.LogSink() #Writes the log entries of the run to the log file in batches as the run goes
 
 #****************************************************************************************
 #FUNCTIONS
@@ -64,41 +62,45 @@ def Main(InboundSourceFolder = '', ParentExecutionGUID = ''):
         LogEntries, Result = Utilities.ValidateLogFile(CurrentFunction, LogEntries, ExecutionGUID)
         if(Result != Utilities.Result_Success): raise Exception(Result) #Report the error and don't continue - can't log the error because log file is invalid
 
-        #Get all file level configurations; do this only once per process execution
-        LogEntries, Result = Utilities.RetrieveConfigurations_File(CurrentFunction, LogEntries, ExecutionGUID)
-        if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveConfigurations_File') #Log the error and don't continue
+        #Get the compiled file & column level configurations of every source; do this only once per process execution
+        LogEntries, Result = Utilities.CompileConfigurations(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in CompileConfigurations') #Log the error and don't continue
 
-        #Get all column level configurations for the current ConfigurationFileID; do this only once per process execution
-        LogEntries, Result = Utilities.RetrieveConfigurations_Column(CurrentFunction, LogEntries, ExecutionGUID)
-        if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveConfigurations_Column') #Log the error and don't continue
+        #Finish or undo the commit of a run that crashed, then stage every write and file move of this run until it commits; do this before anything is read from disk
+        LogEntries, Result = Utilities.BeginRun(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in BeginRun') #Log the error and don't continue
+
+        #Get every file already ingested, so that repeats can be skipped; do this only once per process execution
+        LogEntries, Result = Utilities.RetrieveManifest(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveManifest') #Log the error and don't continue
+
+        #Get the mappings of source values to Brand, Category, ProductService and Seller, moving any filled in ToMap rows to them; do this only once per process execution
+        LogEntries, Result = Utilities.RetrieveMappings(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveMappings') #Log the error and don't continue
 
         #Validate root level parameters
         Result = ValidateRootParameters(CurrentFunction, InboundSourceFolder, ExecutionGUID)
         if(Result != Utilities.Result_Success): raise Exception('Error in ValidateRootParameters') #Log the error and don't continue
 
-        #Validate Silver Dimensions
-#        Result, LogEntries, FullPath_Silver_Dimension_Account, SilverDimension_Account = Utilities.ValidateSilverDimension(CurrentFunction, 'Account', LogEntries, ParentExecutionGUID)
-#        Result, LogEntries, FullPath_Silver_Dimension_AccountType, SilverDimension_AccountType = Utilities.ValidateSilverDimension(CurrentFunction, 'AccountType', LogEntries, ParentExecutionGUID)
-#        Result, LogEntries, FullPath_Silver_Dimension_Brand, SilverDimension_Brand = Utilities.ValidateSilverDimension(CurrentFunction, 'Brand', LogEntries, ParentExecutionGUID)
-#        Result, LogEntries, FullPath_Silver_Dimension_Category, SilverDimension_Category = Utilities.ValidateSilverDimension(CurrentFunction, 'Category', LogEntries, ParentExecutionGUID)
-#        Result, LogEntries, FullPath_Silver_Dimension_PriceType, SilverDimension_PriceType = Utilities.ValidateSilverDimension(CurrentFunction, 'PriceType', LogEntries, ParentExecutionGUID)
-#        Result, LogEntries, FullPath_Silver_Dimension_ProductService, SilverDimension_ProductService = Utilities.ValidateSilverDimension(CurrentFunction, 'ProductService', LogEntries, ParentExecutionGUID)
-#        Result, LogEntries, FullPath_Silver_Dimension_Seller, SilverDimension_Seller = Utilities.ValidateSilverDimension(CurrentFunction, 'Seller', LogEntries, ParentExecutionGUID)
-#        Result, LogEntries, FullPath_Silver_Dimension_UnitOfMeasurement, SilverDimension_UnitOfMeasurement = Utilities.ValidateSilverDimension(CurrentFunction, 'UnitOfMeasurement', LogEntries, ParentExecutionGUID)
-
     except Exception as e:
         print(Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, False, Parameters)) #Report the error
 
-    if(Utilities.IsValid_LogFile):
+    if(Utilities.IsValid_LogFile) and (Result == Utilities.Result_Success):
         #Now process all Inbound folders, along with all necessary validations
         try:
             if AllInboundFolders: #Process all Inbound sub-folders
-#                for FolderName in os.listdir(Utilities.FullPath_Silver_Inbound):
-                for FolderName in Utilities.Configurations_File_All['Source'].unique():
+                for FolderName in Utilities.Configurations_Compiled:
                     Result = ProcessInboundFolder(CurrentFunction, ExecutionGUID, FolderName)
             else: #Process just the specified Inbound sub-folder
                 Result = ProcessInboundFolder(CurrentFunction, ExecutionGUID, InboundSourceFolder)
 
+            #Write the mappings and ToMap rows of the whole run at once
+            Utilities.FlushMappings()
+
+            #Make every Silver append, manifest entry and mapping of the run at once
+            LogEntries, CommitResult = Utilities.CommitRun(CurrentFunction, LogEntries, ExecutionGUID)
+            if(CommitResult != Utilities.Result_Success): raise Exception('Error in CommitRun') #Log the error and don't continue
+
             if not InboundFileFound: Result = Utilities.Result_Success #If no Inbound files were found, set the result to success so that the script doesn't fail; this is not an error, just a condition
 
             #Log the step
@@ -106,68 +108,118 @@ def Main(InboundSourceFolder = '', ParentExecutionGUID = ''):
 
         except Exception as e:
             Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-            LogStep(Begin, CurrentFunction, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+            LogStep(Begin, CurrentFunction, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
             print(Result) #Report the error
 
         finally:
             Utilities.WriteToLogFile(CurrentFunction, LogEntries, ExecutionGUID)
 
-def ProcessInboundFile(BronzeData, CallStack, InboundFile, ParentExecutionGUID, Source):
+def ProcessInboundFile(CallStack, InboundFile, ParentExecutionGUID, Source):
     #Variable(s) defined outside of this function, but set within this function
     global LogEntries
 
     #Local variables
     Begin = datetime.now()
-    InboundFile = ''
     CurrentFunction = 'ProcessInboundFile'
     CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
     ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    CoercedCounts = {} #How many values of each column couldn't be converted to its Datatype, and were made missing, across every chunk of the file
+    DuplicateCount = 0
     Parameters = {
-        'InboundFile': InboundFile
+        'Account': Configuration.Account
+        , 'ChunkSize': Configuration.ChunkSize
+        , 'InboundFile': InboundFile
+        , 'NaturalKeyColumns': Configuration.NaturalKeyColumns
         , 'ParentExecutionGUID': ParentExecutionGUID
         , 'Source': Source
     }
     Result = Utilities.Result_Success
+    RowCount = 0
     try:
         FileName = os.path.basename(InboundFile) #Get the file name from the full path
         FileExtension = os.path.splitext(FileName)[1] #Get the file extension of the current file
 
+        #Skip any file identical to one already ingested from the same source, before reading any of it, and move it out of the way to the Error folder, as LoadFileToBronze does, so that it's only ever hashed once
+        ContentHash, Duplicate = Utilities.FindInManifest(InboundFile, Source)
+        if(Duplicate is not None):
+            LogEntries, Result = Utilities.MoveFile(CallStack, InboundFile, os.path.join(FullPath_Silver_Error_CurrentSource, os.path.splitext(FileName)[0] + '.Duplicate' + FileExtension), LogEntries, ParentExecutionGUID)
+            if(Result != Utilities.Result_Success): raise Exception('Error in MoveFile') #Log the error and don't continue
+            LogStep(Begin, CallStack, ExecutionGUID, Parameters, Action = 'Skip', File = InboundFile, ParentExecutionGUID = ParentExecutionGUID, Result = f'Skipped: identical to {Duplicate["FileName"]}, ingested {Duplicate["DateTimeInserted"]}', Severity = Utilities.Severity_Info)
+            return Result
+
         #Process only .csv or .txt files
         if FileName.lower().endswith(('.csv', '.txt')):
-            #Read the current file into a dataframe
-            CurrentFile = pd.read_csv(InboundFile, delimiter = ExpectedDelimiter)
-
-            #Remove duplicate rows from the file
-            CurrentFile.drop_duplicates()
-
-            if not CurrentFile.empty:
-                #Add metadata columns to the Bronze data
-                CurrentFile['DateTimeInserted'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f') #The current date and time
-                CurrentFile['ExecutionGUID'] = ExecutionGUID
-                CurrentFile['SourceFile'] = FileName
-
-                #Transform the Bronze files into Silver data entities
-                Result = TransformBronzeToSilver(CurrentFile, CallStack, ParentExecutionGUID, CurrentFile)
-                if(Result != Utilities.Result_Success): raise Exception('Error in TransformBronzeToSilver') #Log the error and don't continue
+            #Set the metadata once per file so that every chunk of the file gets the same values; the file's BatchID is all of its lineage a row carries, the rest is in the manifest
+            BatchID = Utilities.AllocateBatchID()
+            DateTimeInserted = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f') #The current date and time
+
+            #Read the current file ChunkSize rows at a time so that memory stays the same regardless of the size of the file; a ChunkSize of 0 reads the entire file at once
+            #Read every configured column as text, so that a natural key hashes the same in every chunk and file and no type is left to pandas to guess; each column gets its configured type once duplicate rows are removed
+            TextDatatypes = {Column: str for Column in Configuration.Datatypes}
+            if(Configuration.ChunkSize > 0): Chunks = pd.read_csv(InboundFile, delimiter = Configuration.Delimiter, chunksize = Configuration.ChunkSize, dtype = TextDatatypes)
+            else: Chunks = (pd.read_csv(InboundFile, delimiter = Configuration.Delimiter, dtype = TextDatatypes) for _ in [InboundFile]) #Read only once iterated, so that reading is measured the same way whether or not the file is chunked
+
+            for CurrentChunk in Utilities.MeasureChunks(Chunks, f'{CallStack} > Read', Source):
+                #Remove rows already loaded for the account, whether from earlier in this file or from any other file, in this run or an earlier one
+                ChunkRowCount = len(CurrentChunk)
+                with Utilities.MeasureStep(f'{CallStack} > RemoveDuplicateRows', Source, RowsIn = ChunkRowCount) as Step:
+                    CurrentChunk, Fingerprints = Utilities.RemoveDuplicateRows(CurrentChunk, Configuration.Account, Configuration.NaturalKeyColumns, Configuration.NaturalKeyDateColumn, Configuration.NaturalKeyDateFormat)
+                    Step.RowsOut = len(CurrentChunk)
+                DuplicateCount += ChunkRowCount - len(CurrentChunk)
+
+                if not CurrentChunk.empty:
+                    #Convert each column to the compact type of its configured Datatype: dates, numbers and categoricals instead of text
+                    with Utilities.MeasureStep(f'{CallStack} > ApplyDatatypes', Source, RowsIn = len(CurrentChunk)) as Step:
+                        CurrentChunk, Coerced = Utilities.ApplyDatatypes(CurrentChunk, Configuration.Datatypes)
+                        for Column, Count in Coerced.items(): CoercedCounts[Column] = CoercedCounts.get(Column, 0) + Count
+                        Step.RowsOut = len(CurrentChunk)
+
+                    #Add the file's BatchID to the Bronze data, rather than repeating its ExecutionGUID, SourceFile and DateTimeInserted on every row; Utilities.JoinLineage adds them back when needed
+                    CurrentChunk['BatchID'] = pd.Series(BatchID, index = CurrentChunk.index, dtype = Utilities.BatchIDDatatype)
+
+                    #Calculate the columns of the source's Expression rules over the whole chunk at once
+                    if(len(Configuration.Expressions) > 0):
+                        with Utilities.MeasureStep(f'{CallStack} > ApplyExpressions', Source, RowsIn = len(CurrentChunk)) as Step:
+                            CurrentChunk = Utilities.ApplyExpressions(CurrentChunk, Configuration.Expressions, DateTimeInserted)
+                            Step.RowsOut = len(CurrentChunk)
+
+                    #Transform the Bronze chunk into Silver data entities
+                    with Utilities.MeasureStep(f'{CallStack} > Transform', Source, RowsIn = len(CurrentChunk)) as Step:
+                        Result = TransformBronzeToSilver(CurrentChunk, CallStack, ParentExecutionGUID, FileName)
+                        if(Result != Utilities.Result_Success): raise Exception('Error in TransformBronzeToSilver') #Log the error and don't continue
+                        Step.RowsOut = len(CurrentChunk)
+                    RowCount += len(CurrentChunk)
+
+                    #Record the rows as loaded only once they have been
+                    with Utilities.MeasureStep(f'{CallStack} > RecordRowFingerprints', Source, RowsIn = len(Fingerprints)):
+                        Utilities.RecordRowFingerprints(Configuration.Account, Fingerprints)
+
+            #Record the file as ingested so that it, or any identical file, is skipped from now on
+            Utilities.AddToManifest(InboundFile, Source, ExecutionGUID, ContentHash, BatchID)
+
+            #Archive the file, along with its rows, so that Silver/Inbound only ever holds files still to be loaded; its BatchID keeps it apart from any later export of the same name
+            LogEntries, Result = Utilities.MoveFile(CallStack, InboundFile, os.path.join(FullPath_Bronze_Archive_CurrentSource, f'{os.path.splitext(FileName)[0]}.{BatchID}{FileExtension}'), LogEntries, ParentExecutionGUID)
+            if(Result != Utilities.Result_Success): raise Exception('Error in MoveFile') #Log the error and don't continue
+            if(len(CoercedCounts) > 0): LogStep(Begin, CallStack, ExecutionGUID, Parameters, Action = 'ApplyDatatypes', File = InboundFile, ParentExecutionGUID = ParentExecutionGUID, Result = 'Values that don\'t match their Datatype were loaded as missing: ' + ', '.join(f'{Column} ({Count})' for Column, Count in CoercedCounts.items()), RowCount = sum(CoercedCounts.values()), Severity = Utilities.Severity_Warning)
+            if(DuplicateCount > 0): LogStep(Begin, CallStack, ExecutionGUID, Parameters, Action = 'RemoveDuplicateRows', File = InboundFile, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = DuplicateCount, Severity = Utilities.Severity_Info)
 
         #Log the step
-        LogStep(Begin, CallStack, ExecutionGUID, Parameters, File = InboundFile, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, File = InboundFile, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = RowCount, Severity = Utilities.Severity_Info)
 
     except Exception as e:
         Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, File = InboundFile, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
         print(Result) #Report the error
 
     finally:
         #Return the result
         return Result
 
-def ProcessInboundFolder(CallStack, ParentExecutionGUID, Source):
+def ProcessInboundFolder(CallStack, ParentExecutionGUID, Source, FileNames = None):
+    #FileNames limits the files processed to the given ones (as Watch.py does, one file at a time); if None, every file in the folder is processed
     #Variable(s) defined outside of this function, but set within this function
-    global ConfigurationFileID
+    global Configuration
     global Configurations_Column_CurrentFile
-    global Configurations_File_CurrentFile
-    global ExpectedDelimiter
     global FullPath_Bronze_Archive_CurrentSource
     global FullPath_Silver_Error_CurrentSource
     global FullPath_Silver_Inbound_CurrentSource
@@ -176,7 +228,6 @@ def ProcessInboundFolder(CallStack, ParentExecutionGUID, Source):
 
     #Local variables
     Begin = datetime.now()
-    BronzeData = pd.DataFrame() #Dataframe to hold all Bronze files for the current source
     CurrentFunction = 'ProcessInboundFolder'
     CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
     EmptyFolder = ''
@@ -188,11 +239,12 @@ def ProcessInboundFolder(CallStack, ParentExecutionGUID, Source):
     }
     Result = Utilities.Result_Success
     try:
-#        InboundFolder = os.path.join(Utilities.FullPath_Silver_Inbound, Source)
-        LogEntries, Result, InboundFolder = Utilities.BuildFolderPath(CallStack, Utilities.FullPath_Bronze_Inbound, Source, LogEntries, ParentExecutionGUID)
+        #Files are staged for this script in /<Root>/Silver/Inbound/<Source>/ by LoadFileToBronze
+        LogEntries, Result, InboundFolder = Utilities.BuildFolderPath(CallStack, Utilities.FullPath_Silver_Inbound, Source, LogEntries, ParentExecutionGUID)
 
         #Loop through all files in the current Inbound sub-folder
-        if not os.listdir(InboundFolder):
+        if(FileNames is None): FileNames = os.listdir(InboundFolder)
+        if not FileNames:
             #There are no files in the folder
             InboundFileFound = False
             if(EmptyFolder != ''): EmptyFolder = EmptyFolder + ', '
@@ -207,38 +259,36 @@ def ProcessInboundFolder(CallStack, ParentExecutionGUID, Source):
             LogEntries, Result, FullPath_Silver_Error_CurrentSource = Utilities.BuildFolderPath(CallStack, Utilities.FullPath_Bronze_Error, Source, LogEntries, ParentExecutionGUID)
             LogEntries, Result, FullPath_Silver_Inbound_CurrentSource = Utilities.BuildFolderPath(CallStack, Utilities.FullPath_Silver_Inbound, Source, LogEntries, ParentExecutionGUID)
 
-            #Filter file level configurations by Source
-            Configurations_File_CurrentFile = Utilities.Configurations_File_All[Utilities.Configurations_File_All['Source'] == Source]
-            if(len(Configurations_File_CurrentFile) == 0):
+            #Get the compiled configuration of the current source
+            Configuration = Utilities.Configurations_Compiled.get(Source)
+            if(Configuration is None):
                 #No file level configurations were found for the current source
                 Result = f'No configuration records were found for source "{Source}" in file {Utilities.FullPath_Configurations_File}'
                 LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error)
             else:
-                #Get ConfigurationID from the file level configurations for the current source
-                ConfigurationFileID = Configurations_File_CurrentFile[['ConfigurationFileID']].iloc[0,0] #Use .iloc[0,0] to pinpoint the exact cell and exclude the column header in the return value
-
-                #Get Delimiter of current file from file level configurations
-                ExpectedDelimiter = Configurations_File_CurrentFile[['Delimiter']].iloc[0,0]
-
-                #Filter column level configurations by ConfigurationFileID
-                Configurations_Column_CurrentFile = Utilities.Configurations_Column_All[Utilities.Configurations_Column_All['ConfigurationFileID'] == int(ConfigurationFileID)]
+                #Column level configurations of the current source, as a DataFrame for the transformations
+                Configurations_Column_CurrentFile = pd.DataFrame(Configuration.Columns, columns = Utilities.ColumnConfiguration._fields)
 
-                if(len(Configurations_Column_CurrentFile) == 0):
+                if(len(Configuration.Columns) == 0):
                     #No column level configurations were found for the current source
-                    Result = f'No configuration records were found for ConfigurationFileID {ConfigurationFileID} in file {Utilities.FullPath_Configurations_Column}'
+                    Result = f'No configuration records were found for ConfigurationFileID {Configuration.ConfigurationFileID} in file {Utilities.FullPath_Configurations_Column}'
                     LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error)
                 else:
-                    #Append each file in the current Inbound folder to the BronzeData dataframe
-                    for FileName in os.listdir(InboundFolder):
-                        Result = ProcessInboundFile(BronzeData, CallStack, FileName, ExecutionGUID, Source)
-                        if(Result != Utilities.Result_Success): raise Exception('Error in ProcessInboundFile') #Log the error and don't continue
+                    #Transform each file in the current Inbound folder, one chunk at a time
+                    for FileName in FileNames:
+                        InboundFile = os.path.join(InboundFolder, FileName) #Generate the full path and file name of the file
+                        Savepoint = Utilities.CreateSavepoint() #A file is loaded whole or not at all: if it fails, everything it staged is undone, and the run commits only the files before it
+                        Result = ProcessInboundFile(CallStack, InboundFile, ExecutionGUID, Source)
+                        if(Result != Utilities.Result_Success):
+                            Utilities.RollbackToSavepoint(Savepoint)
+                            raise Exception('Error in ProcessInboundFile') #Log the error and don't continue
 
         #Log the step
         LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
 
     except Exception as e:
         Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
         print(Result) #Report the error
 
     finally:
@@ -246,6 +296,9 @@ def ProcessInboundFolder(CallStack, ParentExecutionGUID, Source):
         return Result
 
 def TransformBronzeToSilver(BronzeData, CallStack, ParentExecutionGUID, SourceFile):
+    #Variable(s) defined outside of this function, but set within this function
+    global LogEntries
+
     #Local variables
     Begin = datetime.now()
     CurrentFunction = 'TransformBronzeToSilver'
@@ -256,158 +309,72 @@ def TransformBronzeToSilver(BronzeData, CallStack, ParentExecutionGUID, SourceFi
     }
     Result = Utilities.Result_Success
     try:
-        def ProcessDimension(BronzeDataTransformed, Dimension, Lookup, SourceFile):
-            SilverDimension = pd.DataFrame() #Initialize the Silver Dimension dataframe
-            FullPath_Silver_Dimension = '' #Initialize the full path to the Silver Dimension file
-            #Validate the Silver Dimension
+        def ProcessDimension(BronzeDataTransformed, Dimension, SourceFile):
+            #Variable(s) defined outside of this function, but set within this function
+            global LogEntries
+
+            #Process lookups to Silver dimensions: the column whose values name the members of the dimension; if several columns look up the same dimension, the one flagged IsNaturalKey
+            IsLookup = (TransformationConfigurations['Transformation_BronzeToSilver_Type'] == 'Lookup') & (TransformationConfigurations['ColumnName_Silver'] == f'{Dimension}GUID')
+            if not IsLookup.any(): return BronzeDataTransformed
+            LookupConfigurations = TransformationConfigurations[IsLookup]
+            IsNaturalKey = LookupConfigurations['IsNaturalKey'].astype(str).str.strip().str.upper().isin(Utilities.NaturalKeyFlags)
+            if IsNaturalKey.any(): LookupConfigurations = LookupConfigurations[IsNaturalKey]
+            LookupColumn = LookupConfigurations['ColumnName_File'].iloc[0] or LookupConfigurations['ColumnName_Bronze'].iloc[0] #A calculated column has only a ColumnName_Bronze
+
+            #Validate the Silver Dimension; it's read from disk only once per run (or again if it changed), and served from Utilities.DimensionCache for every other file
             LogEntries, Result, FullPath_Silver_Dimension, SilverDimension = Utilities.ValidateSilverDimension(CallStack, Dimension, LogEntries, ParentExecutionGUID)
             if(Result != Utilities.Result_Success): raise Exception('Error in ValidateSilverDimension') #Log the error and don't continue
 
-            #Process direct copies, no transformations
-#            if(TransformationConfigurations[TransformationConfigurations[['Transformation_BronzeToSilver_Type']] == 'Direct']):
-
-            #Process transformations built with expressions
-#            if(TransformationConfigurations[TransformationConfigurations[['Transformation_BronzeToSilver_Type']] == 'Expression']):
-
-            #Process lookups to Silver dimensions
-            if(TransformationConfigurations[TransformationConfigurations[['Transformation_BronzeToSilver_Type']] == 'Lookup']):
-                TransformationConfigurations_Dimension = TransformationConfigurations[TransformationConfigurations[['SilverEntity']] == f'{Dimension}GUID']
-                if(not Lookup.empty) and (TransformationConfigurations_Dimension[['Transformation_BronzeToSilver_Type']].iloc[0, 0] == 'Lookup'): 
-                    BronzeDataTransformed[f'{Dimension}GUID'] = pd.merge(BronzeDataTransformed, Lookup, left_on = TransformationConfigurations_Dimension[['ColumnName_Bronze']].iloc[0,0], right_on = 'Name', how = 'left')[f'{Dimension}GUID']
-            
-            if(not SilverDimension.empty):
-                DimensionNaturalKey = TransformationConfigurations[TransformationConfigurations[['ColumnIsInNaturalKey']] == 'Yes']
-                DimensionNaturalKeyList = DimensionNaturalKey['SilverColumn'].values.tolist() #Get the list of columns that are in the natural key
-                SourceFileNaturalKeyList = DimensionNaturalKey['ColumnName_Bronze'].values.tolist() #Get the list of columns that are in the natural key from the source file
-
-                #Remove from the Bronze data that already exists in the Silver Dimension
-                ToAppend = BronzeDataTransformed[~BronzeDataTransformed[[f'{SourceFileNaturalKeyList}']].apply(tuple, 1).isnotin(SilverDimension[[f'{DimensionNaturalKeyList}']].apply(tuple, 1))]
-
-                #Append the transformed data to the Silver Dimension
-                if(not ToAppend.empty): ToAppend.to_csv(FullPath_Silver_Dimension, mode = 'a', header = False, index = False, sep = Utilities.DelimiterDefault)
-
-                #Log the step
-                LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = len(ToAppend), Severity = Utilities.Severity_Info), Source = SourceFile, Target = FullPath_Silver_Dimension
-
-        #Load lookup dependents
-        Account = pd.read_csv(Utilities.FullPath_Silver_Dimension_Account, delimiter = Utilities.DelimiterDefault)
-        Account = Account[['Name'] == Configurations_File_CurrentFile[['Account']].iloc[0, 0]] #Filter the Account dataframe by the AccountName from the file level configurations
-        AccountGUID = Account['AccountGUID'].iloc[0, 0] if not Account.empty else None #Get the AccountGUID from the filtered dataframe
-        Brand = pd.read_csv(Utilities.FullPath_Silver_Dimension_Brand, delimiter = Utilities.DelimiterDefault)
-        Category = pd.read_csv(Utilities.FullPath_Silver_Dimension_Category, delimiter = Utilities.DelimiterDefault)
-#        PriceType = pd.read_csv(Utilities.FullPath_Silver_Dimension_PriceType, delimiter = Utilities.DelimiterDefault)
-        ProductService = pd.read_csv(Utilities.FullPath_Silver_Dimension_ProductService, delimiter = Utilities.DelimiterDefault)
-        Seller = pd.read_csv(Utilities.FullPath_Silver_Dimension_Seller, delimiter = Utilities.DelimiterDefault)
-#        UnitOfMeasurement = pd.read_csv(Utilities.FullPath_Silver_Dimension_UnitOfMeasurement, delimiter = Utilities.DelimiterDefault)
+            #Remove from the names in the Bronze data those already in the Silver Dimension; the natural key index of the Silver Dimension is built once and kept up to date on every append
+            Names = pd.DataFrame({'Name': BronzeDataTransformed[LookupColumn].astype(str).where(BronzeDataTransformed[LookupColumn].notna())}, index = BronzeDataTransformed.index)
+            ToAppend = Utilities.RemoveExistingNaturalKeys(Names.dropna(), ['Name'], FullPath_Silver_Dimension, SilverDimension, ['Name'])
+
+            #Append the new names to the Silver Dimension, each new member with its key
+            if(not ToAppend.empty):
+                ToAppend = ToAppend.assign(DateTimeInserted = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f'))
+                ToAppend[f'{Dimension}GUID'] = Utilities.BuildSurrogateKeys(Dimension, ToAppend, ['Name'])
+                ToAppend = ToAppend.reindex(columns = SilverDimension.columns)
+                Utilities.WriteTable(FullPath_Silver_Dimension, ToAppend, Append = True)
+                Utilities.AppendToNaturalKeyIndex(FullPath_Silver_Dimension, ToAppend, ['Name'])
+                Utilities.AppendToCachedFile(FullPath_Silver_Dimension, ToAppend)
+                if(Utilities.SurrogateKeyMode == 'Random'): Utilities.DerivedKeyDimensions[FullPath_Silver_Dimension] = False #The new members' keys can't be worked out from their names
+
+            #A derived key is worked out from the name itself, exactly as it was when the member was added, so there is nothing to join to; a random key, or any key of a dimension with members added before it was Derived, has to be looked up
+            Keys = Utilities.RetrieveSurrogateKeys(Dimension, FullPath_Silver_Dimension, pd.concat([SilverDimension, ToAppend], ignore_index = True), Names)
+            if(f'{Dimension}GUID' in BronzeDataTransformed.columns): Keys = BronzeDataTransformed[f'{Dimension}GUID'].where(BronzeDataTransformed[f'{Dimension}GUID'].notna(), Keys) #A row already resolved through its mapping keeps it
+            BronzeDataTransformed[f'{Dimension}GUID'] = Keys
+
+            #Log the step
+            LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = len(ToAppend), Severity = Utilities.Severity_Info, Source = SourceFile, Target = FullPath_Silver_Dimension)
+
+            return BronzeDataTransformed
+
+        #Load lookup dependents; each Silver Dimension is read from disk only once per run (or again if it changed), and served from Utilities.DimensionCache for every other file
+        LogEntries, Result, _, Account = Utilities.ValidateSilverDimension(CallStack, 'Account', LogEntries, ParentExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in ValidateSilverDimension') #Log the error and don't continue
+        Account = Account[Account['Name'] == Configuration.Account] #Filter the Account dataframe by the AccountName from the file level configurations
+        AccountGUID = Account['AccountGUID'].iloc[0] if not Account.empty else None #Get the AccountGUID from the filtered dataframe
+
+        #Resolve the Brand, Category, ProductService and Seller of every row through the BrandCategoryProductServiceSeller index in one lookup; a value not mapped yet is added to ToMap (both files are written once, at the end of the run) and its rows carry on without them
+        if(Configuration.MappingColumn != ''): BronzeData = Utilities.ResolveMappings(BronzeData, AccountGUID, Configuration.MappingColumn)
 
         #Filter for only columns that are mapped to Silver columns
-        TransformationConfigurations = Configurations_Column_CurrentFile[Configurations_Column_CurrentFile[['SilverEntity']] != '']
-
-        #Process ToMap so that BrandCategoryProductServiceSeller is up to date
-        ToMap = pd.read_csv(Utilities.FullPath_Configurations_ToMap, delimiter = Utilities.DelimiterDefault)
-        ToMap.drop_duplicates(subset = ['AccountGUID', 'SourceValue'], inplace = True, keep = 'first') #Drop duplicates based on the foreign keys
-        if(not ToMap.empty):
-            #Get foreign keys
-            ToMap['AccountGUID'] = AccountGUID
-            ToMap['BrandGUID'] = pd.merge(ToMap, Brand, on = 'Brand', how = 'inner')[['BrandGUID']] #Join on Brand to get BrandGUID
-            ToMap['CategoryGUID'] = pd.merge(ToMap, Category, on = 'Category', how = 'inner')[['CategoryGUID']] #Join on Category to get CategoryGUID
-            ToMap['ProductServiceGUID'] = pd.merge(ToMap, ProductService, on = 'ProductService', how = 'inner')[['ProductServiceGUID']] #Join on ProductService to get ProductServiceGUID
-            ToMap['SellerGUID'] = pd.merge(ToMap, Seller, on = 'Seller', how = 'inner')[['SellerGUID']] #Join on Seller to get SellerGUID
-
-            #Remove already existing
-            BrandCategoryProductServiceSeller = pd.read_csv(Utilities.FullPath_Configurations_BrandCategoryProductServiceSeller, delimiter = Utilities.DelimiterDefault)
-            ToMap = ToMap[~ToMap[['AccountGUID', 'BrandGUID', 'CategoryGUID', 'ProductServiceGUID', 'SellerGUID']].apply(tuple, 1).isnotin(BrandCategoryProductServiceSeller[['AccountGUID', 'BrandGUID', 'CategoryGUID', 'ProductServiceGUID', 'SellerGUID']].apply(tuple, 1))]
-
-            #Append the new mappings to the BrandCategoryProductServiceSeller file
-            if(not ToMap.empty): ToMap.to_csv(Utilities.FullPath_Configurations_BrandCategoryProductServiceSeller, mode = 'a', header = False, index = False, sep = Utilities.DelimiterDefault)
-
-            #Remove just appended
-            BrandCategoryProductServiceSeller = pd.read_csv(Utilities.FullPath_Configurations_BrandCategoryProductServiceSeller, delimiter = Utilities.DelimiterDefault)
-            ToMap = ToMap[~ToMap[['AccountGUID', 'BrandGUID', 'CategoryGUID', 'ProductServiceGUID', 'SellerGUID']].apply(tuple, 1).isnotin(BrandCategoryProductServiceSeller[['AccountGUID', 'BrandGUID', 'CategoryGUID', 'ProductServiceGUID', 'SellerGUID']].apply(tuple, 1))]
-
-            BronzeData_CannotProcess = BronzeData.copy() #Create a copy of the Bronze data that cannot be processed
-            BronzeData_CannotProcess = BronzeData_CannotProcess[~BronzeData_CannotProcess[['SourceFile']].apply(tuple, 1).isnotin(ToMap[['SourceFile']].apply(tuple, 1))]
-
-            #Write the Bronze data that cannot be processed to the ToMap file
-            if(not BronzeData_CannotProcess.empty): BronzeData_CannotProcess.to_csv(Utilities.FullPath_Configurations_ToMap, mode = 'a', header = False, index = False, sep = Utilities.DelimiterDefault)
-
-            #Remove the Bronze data that cannot be processed from the original Bronze data
-            BronzeData = BronzeData[~BronzeData[['SourceFile']].apply(tuple, 1).isnotin(BronzeData_CannotProcess[['SourceFile']].apply(tuple, 1))]
-
-            #Create a copy of the Bronze data that will be transformed into Silver data
-            BronzeDataTransformed = BronzeData.copy()
-
-            BronzeDataTransformed = ProcessDimension(BronzeDataTransformed, 'Brand', Brand, SourceFile)
-            BronzeDataTransformed = ProcessDimension(BronzeDataTransformed, 'Category', Category, SourceFile)
-            BronzeDataTransformed = ProcessDimension(BronzeDataTransformed, 'ProductService', ProductService, SourceFile)
-            BronzeDataTransformed = ProcessDimension(BronzeDataTransformed, 'Seller', Seller, SourceFile)
-
-            #
-
-#        for Dimension in Utilities.Silver_Dimensions:
-#            SilverDimension = pd.DataFrame() #Initialize the Silver Dimension dataframe
-#            FullPath_Silver_Dimension = '' #Initialize the full path to the Silver Dimension file
-#            #Validate the Silver Dimension
-#            LogEntries, Result, FullPath_Silver_Dimension, SilverDimension = Utilities.ValidateSilverDimension(CallStack, Dimension, LogEntries, ParentExecutionGUID)
-#            if(Result != Utilities.Result_Success): raise Exception('Error in ValidateSilverDimension') #Log the error and don't continue
-
-#            #Create a copy of the Bronze data that will be transformed into Silver data
-#            BronzeDataTransformed = BronzeData.copy()
-
-            #Process direct copies, no transformations
-#            if(TransformationConfigurations[TransformationConfigurations[['Transformation_BronzeToSilver_Type']] == 'Direct']):
-
-            #Process transformations built with expressions
-#            if(TransformationConfigurations[TransformationConfigurations[['Transformation_BronzeToSilver_Type']] == 'Expression']):
-
-#            #Process lookups to Silver dimensions
-#            if(TransformationConfigurations[TransformationConfigurations[['Transformation_BronzeToSilver_Type']] == 'Lookup']):
-#                TransformationConfigurations_Dimension = TransformationConfigurations[TransformationConfigurations[['SilverEntity']] == f'{Dimension}GUID']
-#                Lookup = pd.DataFrame()
-#                if(Dimension == 'Brand'): Lookup = Brand
-#                elif(Dimension == 'Category'): Lookup = Category
-#                elif(Dimension == 'ProductService'): Lookup = ProductService
-#                elif(Dimension == 'Seller'): Lookup = Seller
-#                if(not Lookup.empty) and (TransformationConfigurations_Dimension[['Transformation_BronzeToSilver_Type']].iloc[0,0] == 'Lookup'): 
-#                    BronzeDataTransformed[f'{Dimension}GUID'] = pd.merge(BronzeDataTransformed, Lookup, left_on = TransformationConfigurations_Dimension[['ColumnName_Bronze']].iloc[0,0], right_on = 'Name', how = 'left')[f'{Dimension}GUID']
-                
-
-#            if Dimension == 'Brand':
-##                ToProcess = BronzeData.copy()[Utilities.Silver_Dimension_Definition_Brand]
-#                TransformationConfigurations_Brand = TransformationConfigurations[TransformationConfigurations[['SilverColumn']] == 'BrandGUID']
-#                #Transform received value into Silver value; lookup the GUID from the Silver dimension
-#                if(TransformationConfigurations_Brand[['Transformation_BronzeToSilver_Type']].iloc[0,0] == 'Lookup'): 
-#                    BronzeDataTransformed['BrandGUID'] = pd.merge(BronzeDataTransformed, Brand, left_on = TransformationConfigurations_Brand[['ColumnName_Bronze']].iloc[0,0], right_on = 'Name', how = 'left')['BrandGUID']
-            
-
-            #Apply any formulas to the columns in BronzeData (such as data type conversions, column replacments, etc.)
-#            for _, config_row in TransformationConfiguration.drop_duplicates(subset = ['ColumnName_Bronze']).iterrows():
-#                ColumnName_Bronze = config_row['ColumnName_Bronze']
-#                Formula = config_row.get('Transformation_BronzeToSilver', None)
-#                if ColumnName_Bronze and isinstance(Formula, str) and Formula.strip(): #Only create and populate if there is a formula
-#                    BronzeDataTransformed[ColumnName_Bronze] = BronzeDataTransformed.apply(
-#                        lambda row: eval(Formula, {'row': row, 'pd': pd, 'IngestDatetime': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')}) #Put the formula for IngestDatetime here so that it is written only once (instead of multiple times in the column level configuration file) but applied to every row, regardless of file or source
-#                        , axis = 1
-#                    )
-
-#            #Map columns from File to Bronze without creating duplicates
-#            Seen = set()
-#            UniqueMapping = {}
-#            for ColumnName_Source, ColumnName_Target in zip(TransformationConfiguration['ColumnName_File'], TransformationConfiguration['ColumnName_Silver']):
-#                if pd.notnull(ColumnName_Target) and pd.notnull(ColumnName_Target) and ColumnName_Target not in Seen:
-#                    UniqueMapping[ColumnName_Source] = ColumnName_Target
-#                    Seen.add(ColumnName_Target)
-#            ColumnMapping = UniqueMapping
-#            BronzeDataTransformed = BronzeDataTransformed.rename(columns = ColumnMapping)
-
-#            #Align RecordsToCopy to ExistingBronze columns by dropping any columns not in ExistingBronze
-##            Bronze_Transaction = pd.read_csv(Utilities.FullPath_Bronze_Transaction, delimiter = Utilities.DelimiterDefault)
-#            BronzeDataTransformed = BronzeDataTransformed[[col for col in SilverDimension.columns if col in BronzeDataTransformed.columns]]
+        TransformationConfigurations = Configurations_Column_CurrentFile[Configurations_Column_CurrentFile['ColumnName_Silver'] != '']
+
+        #Transform the chunk in place; it isn't used again once it has been transformed, so there is no need to copy it
+        BronzeDataTransformed = BronzeData
+
+        BronzeDataTransformed = ProcessDimension(BronzeDataTransformed, 'Brand', SourceFile)
+        BronzeDataTransformed = ProcessDimension(BronzeDataTransformed, 'Category', SourceFile)
+        BronzeDataTransformed = ProcessDimension(BronzeDataTransformed, 'ProductService', SourceFile)
+        BronzeDataTransformed = ProcessDimension(BronzeDataTransformed, 'Seller', SourceFile)
 
+        #Append the chunk's rows to the partitions of the Silver Transaction fact for the source and their months; LoadSilverToGold adds whatever was appended since it last ran to the Gold aggregates
+        Utilities.AppendToSilverFact(Utilities.BuildSilverFact(BronzeDataTransformed, AccountGUID, Configuration.FactColumns), Configuration.Source)
 
     except Exception as e:
         Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
         print(Result) #Report the error
 
     finally:
@@ -439,7 +406,7 @@ def ValidateRootParameters(CallStack, InboundSourceFolder, ParentExecutionGUID):
 
     except Exception as e:
         Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
         print(Result) #Report the error
 
     finally:
@@ -1,360 +1,385 @@
-""""
-DESCRIPTION
-    Load all valid files into the Bronze layer
-
-PARAMETERS
-    InboundSourceFolder
-        - Optional
-        - The name of a single folder in /<Root>/Bronze/Inbound/
-        - If used, only files in this folder will be processed
-        - If not used, all folders in /<Root>/Bronze/Inbound/ will be processed
-    ParentExecutionGUID
-        - Optional
-        - The GUID of the parent script that called this script
-        - If used, this will be used to link the log entries of this script to the parent script
-        - If not used, a new GUID will be generated for this script
-
-STEPS
-1. Validate all required folders
-    a. Create them if they don't already exist
-2. Validate Log file
-    a. If not found in /<Root>/Admin/:
-        1. Create Log file in /<Root>/Admin/ with definition stored in Utilities.py
-    b. If found:
-        1. Validate column header
-            a. If actual column header doesn't match expected column header stored in Utilities.py:
-                1. Create Log file in /<Root>/Admin/ with definition stored in Utilities.py
-3. Validate Root Parameters
-    a. Make sure all required parameters have a value
-    b. Make sure all provided values are valid
-4. Validate configuration files
-    a. Validate file level configuration file
-        1. If file doesn't exist, create it with definition stored in Utilities.py
-        2. If file exists
-            a. Validate column header
-                1. If actual column header doesn't match expected column header stored in Utilities.py:
-                    a. Log error
-                    b. Fail entire script
-                2. If actual column header matches expected column header:
-                    a. load entire file into memory
-    b. Validate column level configuration file
-        1. If file doesn't exist, create it with definition stored in Utilities.py
-        2. If file exists
-            a. Validate column header
-                1. If actual column header doesn't match expected column header stored in Utilities.py:
-                    a. Log error
-                    b. Fail entire script
-                2. If actual column header matches expected column header:
-                    a. load entire file into memory
-5. Loop through all /<Root>/Bronze/Inbound/<Source>/ folders
-    a. Validate configuration files for specific <Source>
-        1. If no records are found in in-memory file or column level configurations for specific <Source>
-            a. Log error
-            b. Do NOTHING with files in current /<Root>/Bronze/Inbound/<Source>/ folder
-            c. Move to next /<Root>/Bronze/Inbound/<Source>/ folder
-    b. For each file in current /<Root>/Bronze/Inbound/<Source>/ folder:
-        1. If actual column header doesn't match expected column header
-            a. Rename file to reflect issue
-            b. Move file to appropriate /<Root>/Bronze/Inbound/<Source>/Error/ folder
-        2. If actual column header matches expected column header
-            a. Move file to appropriate /<Root>/Silver/Inbound/<Source>/
-"""
-
-#****************************************************************************************
-#REFERENCES
-#****************************************************************************************
-import datetime
-import os
-import pandas as pd
-import Utilities
-import uuid
-from datetime import datetime
-
-#****************************************************************************************
-#GLOBAL VARIABLES
-#   Set these variables to either empty or hard-coded values
-#   These variables can change value by any function
-#****************************************************************************************
-AllInboundFolders = True
-ConfigurationFileID = 0
-Configurations_Column_CurrentFile = pd.DataFrame()
-Configurations_File_CurrentFile = pd.DataFrame()
-CurrentScriptFile = os.path.realpath(__file__)
-ExpectedDelimiter = ''
-FullPath_Bronze_Error_CurrentSource = ''
-#FullPath_Bronze_Inbound_CurrentSource = ''
-FullPath_Silver_Inbound_CurrentSource = ''
-InboundFileFound = False
-IsValid_LogFile = False
-LogEntries = []
-
-#****************************************************************************************
-#FUNCTIONS
-#****************************************************************************************
-def LogStep(Begin, CallStack, ExecutionGUID, Parameters, **VariedParameters): #The explicit parameters are required; anything passed into **VariedParameters is optional; different parameters may be passed into **VariedParameters
-    #Even though this local function calls another of the same name in a different script, keep this local function to be able to use "**VariedParameters"
-    #Variable(s) defined outside of this function, but set within this function
-    global LogEntries
-    #Add the step to the current set
-    LogEntries = Utilities.LogStep(Begin, CurrentScriptFile, CallStack, ExecutionGUID, LogEntries, Parameters, **VariedParameters)
-
-def Main(InboundSourceFolder = '', ParentExecutionGUID = ''):
-    #Variable(s) defined outside of this function, but set within this function
-    global LogEntries
-
-    #Local variables
-    Begin = datetime.now()
-    CurrentFunction = r'Main'
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    FullPath_Bronze_Inbound_Source = ''
-    Parameters = {
-        'InboundSourceFolder': InboundSourceFolder
-        , 'ParentExecutionGUID': ParentExecutionGUID
-    }
-    Result = Utilities.Result_Success
-
-    #Perform the actions that could cause the entire script to fail; if this block fails, report the failure, don't log the failure, and don't continue
-    try:
-        #Set global variables to be used downstream
-        LogEntries, Result = Utilities.SetGlobalVariables(CurrentScriptFile, CurrentFunction, LogEntries, ExecutionGUID)
-        if(Result != Utilities.Result_Success): raise Exception('Error in SetGlobalVariables') #Log the error and don't continue
-
-        #Set script-wide calculated variables - included in the "try/except" block in case an expression fails
-        if(InboundSourceFolder == ''): AllInboundFolders = True #If no source folder was specified
-        elif(Utilities.FullPath_Root not in InboundSourceFolder): AllInboundFolders = False #If source folder was specified, but not the full path (as expected)
-
-        #Validate the log file so that all subsequent steps & errors can be properly logged
-        LogEntries, Result = Utilities.ValidateLogFile(CurrentFunction, LogEntries, ExecutionGUID)
-        if(Result != Utilities.Result_Success): raise Exception(Result) #Report the error and don't continue - can't log the error because log file is invalid
-
-        #Get all file level configurations; do this only once per process execution
-        LogEntries, Result = Utilities.RetrieveConfigurations_File(CurrentFunction, LogEntries, ExecutionGUID)
-        if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveConfigurations_File') #Log the error and don't continue
-
-        #Get all column level configurations for the current ConfigurationFileID; do this only once per process execution
-        LogEntries, Result = Utilities.RetrieveConfigurations_Column(CurrentFunction, LogEntries, ExecutionGUID)
-        if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveConfigurations_Column') #Log the error and don't continue
-
-        #Validate root level parameters
-        Result = ValidateRootParameters(CurrentFunction, InboundSourceFolder, ExecutionGUID)
-        if(Result != Utilities.Result_Success): raise Exception('Error in ValidateRootParameters') #Log the error and don't continue
-
-    except Exception as e:
-        print(Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, False, Parameters)) #Report the error
-
-    if(Utilities.IsValid_LogFile):
-        #Now process all Inbound folders, along with all necessary validations
-        try:
-            if AllInboundFolders: #Process all Inbound sub-folders
-                for FolderName in os.listdir(Utilities.FullPath_Bronze_Inbound):
-                    InboundFolder = os.path.join(Utilities.FullPath_Bronze_Inbound, FolderName)
-                    Result = ProcessInboundFolder(CurrentFunction, InboundFolder, ExecutionGUID)
-            else: #Process just the specified Inbound sub-folder
-                InboundFolder = os.path.join(Utilities.FullPath_Bronze_Inbound, InboundSourceFolder)
-                Result = ProcessInboundFolder(CurrentFunction, InboundFolder, ExecutionGUID)
-
-            if not InboundFileFound: Result = Utilities.Result_Success #If no Inbound files were found, set the result to success so that the script doesn't fail; this is not an error, just a condition
-
-            #Log the step
-            LogStep(Begin, CurrentFunction, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
-
-        except Exception as e:
-            Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-            LogStep(Begin, CurrentFunction, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
-            print(Result) #Report the error
-
-        finally:
-            Utilities.WriteToLogFile(CurrentFunction, LogEntries, ExecutionGUID)
-
-def ProcessInboundFile(CallStack, InboundFile, ParentExecutionGUID, Source):
-    #Variable(s) defined outside of this function, but set within this function
-    global Bronze
-    global LogEntries
-
-    #Local variables
-    Begin = datetime.now()
-    InboundFile = ''
-    CurrentFunction = 'ProcessInboundFile'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Parameters = {
-        'InboundFile': InboundFile
-        , 'ParentExecutionGUID': ParentExecutionGUID
-        , 'Source': Source
-    }
-    Result = Utilities.Result_Success
-    try:
-        FileName = os.path.basename(InboundFile) #Get the file name from the full path
-        FileExtension = os.path.splitext(FileName)[1] #Get the file extension of the current file
-
-        #Process only .csv or .txt files
-        if FileName.lower().endswith(('.csv', '.txt')):
-            #Read the current file into a dataframe
-            CurrentFile = pd.read_csv(InboundFile, delimiter = ExpectedDelimiter)
-
-            if (CurrentFile.empty): #Do not continue only if the current file is empty
-                #Rename the file to indicate that it is empty
-                FileName = FileName.replace(FileExtension, '') + '.Empty' + FileExtension
-            else:
-                #Add "standard" columns
-                CurrentFile['ExecutionGUID'] = ExecutionGUID #Add the ExecutionGUID
-                CurrentFile['IngestDatetime'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f') #Add the current date/time to the IngestDatetime column
-                CurrentFile['Source'] = Source #Add the Inbound source folder
-                CurrentFile['SourceFile'] = FileName #Add the file name of the current file
-                #Put actual column headers into a list
-                ActualColumnsAsList = CurrentFile.columns.tolist()
-
-                #Put expected column headers into a list
-                ExpectedColumnsAsList = Configurations_Column_CurrentFile['ColumnName_File'].values.tolist() #Use the values in the column [ColumnName_File] in the column level configurations
-                ExpectedColumnsAsList = [x for x in ExpectedColumnsAsList if pd.notnull(x)] #Remove any null values from the list
-
-                #Validate the actual column header
-                Issue = ''
-                LogEntries, Result, Issue = Utilities.ValidateColumnHeader(ActualColumnsAsList, CallStack, ExpectedColumnsAsList, LogEntries, ParentExecutionGUID)
-                if(Result != Utilities.Result_Success): #There was an issue validating the column header
-                    #Rename the file to indicate the issue found
-                    FileName = FileName.replace(FileExtension, '') + '.InvalidColumnHeader.' + Issue + FileExtension #Change the file name to indicate that it has an invalid column header
-                    FullPath_Error_CurrentFile = os.path.join(FullPath_Bronze_Error_CurrentSource, FileName) #Set the full path of the error file
-                   
-                    #Move the file to the appropriate Error folder                    
-                    LogEntries, Result = Utilities.MoveFile(CallStack, InboundFile, FullPath_Error_CurrentFile, LogEntries, ParentExecutionGUID)
-
-        #Log the step
-        LogStep(Begin, CallStack, ExecutionGUID, Parameters, File = InboundFile, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
-
-    except Exception as e:
-        Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return Result
-
-def ProcessInboundFolder(CallStack, FullPath_Bronze_Inbound_CurrentSource, ParentExecutionGUID, Source):
-    #Variable(s) defined outside of this function, but set within this function
-    global ConfigurationFileID
-    global Configurations_Column_CurrentFile
-    global Configurations_File_CurrentFile
-    global ExpectedDelimiter
-    global FullPath_Bronze_Error_CurrentSource
-    global FullPath_Silver_Inbound_CurrentSource
-    global InboundFileFound
-    global LogEntries
-
-    #Local variables
-    Begin = datetime.now()
-    CurrentFunction = 'ProcessInboundFolder'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    EmptyFolder = ''
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    InboundFileFound = False
-    Parameters = {
-        'FullPath_Bronze_Inbound_CurrentSource': FullPath_Bronze_Inbound_CurrentSource
-        , 'ParentExecutionGUID': ParentExecutionGUID
-        , 'Source': Source
-    }
-    Result = Utilities.Result_Success
-    try:
-        #Loop through all files in the current Inbound sub-folder
-        if not os.listdir(FullPath_Bronze_Inbound_CurrentSource):
-            #There are no files in the folder
-            InboundFileFound = False
-            if(EmptyFolder != ''): EmptyFolder = EmptyFolder + ', '
-            EmptyFolder = EmptyFolder + FullPath_Bronze_Inbound_CurrentSource
-            Result = 'No files were found for processing in ' + EmptyFolder
-        else:
-            #There are files in the folder
-            InboundFileFound = True
-
-            #Set & validate the full paths of subfolders for the current source
-            LogEntries, Result, FullPath_Bronze_Error_CurrentSource = Utilities.BuildFolderPath(CallStack, Utilities.FullPath_Bronze_Error, Source, LogEntries, ParentExecutionGUID)
-            LogEntries, Result, FullPath_Silver_Inbound_CurrentSource = Utilities.BuildFolderPath(CallStack, Utilities.FullPath_Silver_Inbound, Source, LogEntries, ParentExecutionGUID)
-
-            #Filter file level configurations by Source
-            Configurations_File_CurrentFile = Utilities.Configurations_File_All[Utilities.Configurations_File_All['Source'] == Source]
-            if(len(Configurations_File_CurrentFile) == 0):
-                #No file level configurations were found for the current source
-                Result = f'No configuration records were found for source "{Source}" in file {Utilities.FullPath_Configurations_File}'
-                LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error)
-            else:
-                #Get ConfigurationID from the file level configurations for the current source
-                ConfigurationFileID = Configurations_File_CurrentFile[['ConfigurationFileID']].iloc[0,0] #Use .iloc[0,0] to pinpoint the exact cell and exclude the column header in the return value
-
-                #Get Delimiter of current file from file level configurations
-                ExpectedDelimiter = Configurations_File_CurrentFile[['Delimiter']].iloc[0,0]
-
-                #Filter column level configurations by ConfigurationFileID
-                Configurations_Column_CurrentFile = Utilities.Configurations_Column_All[Utilities.Configurations_Column_All['ConfigurationFileID'] == int(ConfigurationFileID)]
-
-                if(len(Configurations_Column_CurrentFile) == 0):
-                    #No column level configurations were found for the current source
-                    Result = f'No configuration records were found for ConfigurationFileID {ConfigurationFileID} in file {Utilities.FullPath_Configurations_Column}'
-                    LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error)
-                else:
-                    #Ingest each file in the current Inbound folder
-                    for FileName in os.listdir(Source):
-                        InboundFile = os.path.join(FullPath_Bronze_Inbound_CurrentSource, Source, FileName) #Generate the full path and file name of the file
-                        Result = ProcessInboundFile(CallStack, InboundFile, ExecutionGUID, Source)
-                        if(Result != Utilities.Result_Success): raise Exception('Error in ProcessInboundFile') #Log the error and don't continue
-
-                        #Move the file to the appropriate Silver Inbound folder
-                        FullPath_TargetFile = os.path.join(FullPath_Silver_Inbound_CurrentSource, FileName)
-                        Result, LogEntries = Utilities.MoveFile(CallStack, InboundFile, FullPath_TargetFile, LogEntries, ParentExecutionGUID)
-                        if(Result != Utilities.Result_Success): raise Exception('Error in MoveFile') #Log the error and don't continue
-
-        #Log the step
-        LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
-
-    except Exception as e:
-        Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return Result
-
-def ValidateRootParameters(CallStack, InboundSourceFolder, ParentExecutionGUID):
-    #Local variables
-    Begin = datetime.now()
-    CurrentFunction = 'ValidateRootParameters'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    Continue = True
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Parameters = {
-        'InboundSourceFolder': InboundSourceFolder
-        , 'ParentExecutionGUID': ParentExecutionGUID
-    }
-    Result = Utilities.Result_Success
-    try:
-        #Validate that each required parameter has a value; don't explicitly raise any excpetion if an issue is found, just log it and move on to the next parameter
-        if Continue:
-            #Validate folders
-            if(InboundSourceFolder != '') and not os.path.exists(InboundSourceFolder):
-                os.mkdir(InboundSourceFolder) #If a value was provided but doesn't exist, create it
-                Result = 'Folder path specified was not found and therefore created: ' + InboundSourceFolder #Return the warning but continue and don't fail
-       
-            #Log the step
-            LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
-
-    except Exception as e:
-        Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return Result
-
-#****************************************************************************************
-#ENTRY
-#****************************************************************************************
-print('***********************************************************************************') #Delineate manual runs
-if __name__ == '__main__':
-    Main()
-
-#****************************************************************************************
-#DONE
-#****************************************************************************************
-print(datetime.now(), ': Done')
+""""
+DESCRIPTION
+    Load all valid files into the Bronze layer
+
+PARAMETERS
+    InboundSourceFolder
+        - Optional
+        - The name of a single folder in /<Root>/Bronze/Inbound/
+        - If used, only files in this folder will be processed
+        - If not used, all folders in /<Root>/Bronze/Inbound/ will be processed
+    ParentExecutionGUID
+        - Optional
+        - The GUID of the parent script that called this script
+        - If used, this will be used to link the log entries of this script to the parent script
+        - If not used, a new GUID will be generated for this script
+    Workers
+        - Optional
+        - The number of /<Root>/Bronze/Inbound/<Source>/ folders to process at the same time
+        - If greater than 1, each folder is processed by its own worker with its own context; all workers write to the same log
+        - If not used, folders are processed one at a time
+
+STEPS
+1. Validate all required folders
+    a. Create them if they don't already exist
+2. Validate Log file
+    a. If not found in /<Root>/Admin/:
+        1. Create Log file in /<Root>/Admin/ with definition stored in Utilities.py
+    b. If found:
+        1. Validate column header
+            a. If actual column header doesn't match expected column header stored in Utilities.py:
+                1. Create Log file in /<Root>/Admin/ with definition stored in Utilities.py
+3. Validate Root Parameters
+    a. Make sure all required parameters have a value
+    b. Make sure all provided values are valid
+4. Validate configuration files
+    a. Validate file level configuration file
+        1. If file doesn't exist, create it with definition stored in Utilities.py
+        2. If file exists
+            a. Validate column header
+                1. If actual column header doesn't match expected column header stored in Utilities.py:
+                    a. Log error
+                    b. Fail entire script
+                2. If actual column header matches expected column header:
+                    a. load entire file into memory
+    b. Validate column level configuration file
+        1. If file doesn't exist, create it with definition stored in Utilities.py
+        2. If file exists
+            a. Validate column header
+                1. If actual column header doesn't match expected column header stored in Utilities.py:
+                    a. Log error
+                    b. Fail entire script
+                2. If actual column header matches expected column header:
+                    a. load entire file into memory
+5. Loop through all /<Root>/Bronze/Inbound/<Source>/ folders (in parallel if Workers is greater than 1)
+    a. Validate configuration files for specific <Source>
+        1. If no records are found in in-memory file or column level configurations for specific <Source>
+            a. Log error
+            b. Do NOTHING with files in current /<Root>/Bronze/Inbound/<Source>/ folder
+            c. Move to next /<Root>/Bronze/Inbound/<Source>/ folder
+    b. For each file in current /<Root>/Bronze/Inbound/<Source>/ folder:
+        0. If the file is identical (same size and content hash) to a file already ingested from the same <Source>
+            a. Rename file to reflect issue
+            b. Move file to appropriate /<Root>/Bronze/Inbound/<Source>/Error/ folder
+            c. Log it as skipped
+        1. Read only the column header (the first record, using the configured Delimiter and TextQualifier) and check whether any rows follow it
+        2. If the file has no rows
+            a. Rename file to reflect issue
+            b. Move file to appropriate /<Root>/Bronze/Inbound/<Source>/Error/ folder
+        3. If actual column header doesn't match expected column header
+            a. Rename file to reflect issue
+            b. Move file to appropriate /<Root>/Bronze/Inbound/<Source>/Error/ folder
+        4. If actual column header matches expected column header
+            a. Move file to appropriate /<Root>/Silver/Inbound/<Source>/
+"""
+
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import datetime
+import os
+import Utilities
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+#****************************************************************************************
+#GLOBAL VARIABLES
+#   Set these variables to either empty or hard-coded values
+#   These variables can change value by any function
+#   Anything specific to a single /<Root>/Bronze/Inbound/<Source>/ folder lives in that folder's context (see BuildSourceContext), not here
+#****************************************************************************************
+AllInboundFolders = True
+CurrentScriptFile = os.path.realpath(__file__)
+InboundFileFound = False
+IsValid_LogFile = False
+LogEntries = Utilities.LogSink() #Writes the log entries of the run to the log file in batches as the run goes
+
+#****************************************************************************************
+#FUNCTIONS
+#****************************************************************************************
+def BuildSourceContext(FullPath_Bronze_Inbound_CurrentSource, Source):
+    #Hold everything specific to the current source in one object so that each source can be processed by its own worker without sharing state with any other source
+    #The only thing shared is the LogSink of the run, which can be written to by several workers at once
+    return {
+        'Configuration': None #The compiled SourceConfiguration of the current source
+        , 'FullPath_Bronze_Error_CurrentSource': ''
+        , 'FullPath_Bronze_Inbound_CurrentSource': FullPath_Bronze_Inbound_CurrentSource
+        , 'FullPath_Silver_Inbound_CurrentSource': ''
+        , 'InboundFileFound': False
+        , 'LogEntries': LogEntries
+        , 'Source': Source
+    }
+
+def LogStep(Begin, CallStack, ExecutionGUID, Parameters, Context = None, **VariedParameters): #The explicit parameters are required; anything passed into **VariedParameters is optional; different parameters may be passed into **VariedParameters
+    #Even though this local function calls another of the same name in a different script, keep this local function to be able to use "**VariedParameters"
+    #Variable(s) defined outside of this function, but set within this function
+    global LogEntries
+    #Add the step to the set of the current source if there is one, otherwise to the current set
+    if(Context is not None): Context['LogEntries'] = Utilities.LogStep(Begin, CurrentScriptFile, CallStack, ExecutionGUID, Context['LogEntries'], Parameters, **VariedParameters)
+    else: LogEntries = Utilities.LogStep(Begin, CurrentScriptFile, CallStack, ExecutionGUID, LogEntries, Parameters, **VariedParameters)
+
+def Main(InboundSourceFolder = '', ParentExecutionGUID = '', Workers = 1):
+    #Variable(s) defined outside of this function, but set within this function
+    global AllInboundFolders
+    global InboundFileFound
+    global LogEntries
+
+    #Local variables
+    Begin = datetime.now()
+    Contexts = []
+    CurrentFunction = r'Main'
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'InboundSourceFolder': InboundSourceFolder
+        , 'ParentExecutionGUID': ParentExecutionGUID
+        , 'Workers': Workers
+    }
+    Result = Utilities.Result_Success
+
+    #Perform the actions that could cause the entire script to fail; if this block fails, report the failure, don't log the failure, and don't continue
+    try:
+        #Set global variables to be used downstream
+        LogEntries, Result = Utilities.SetGlobalVariables(CurrentScriptFile, CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in SetGlobalVariables') #Log the error and don't continue
+
+        #Set script-wide calculated variables - included in the "try/except" block in case an expression fails
+        if(InboundSourceFolder == ''): AllInboundFolders = True #If no source folder was specified
+        elif(Utilities.FullPath_Root not in InboundSourceFolder): AllInboundFolders = False #If source folder was specified, but not the full path (as expected)
+
+        #Validate the log file so that all subsequent steps & errors can be properly logged
+        LogEntries, Result = Utilities.ValidateLogFile(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception(Result) #Report the error and don't continue - can't log the error because log file is invalid
+
+        #Get the compiled file & column level configurations of every source; do this only once per process execution
+        LogEntries, Result = Utilities.CompileConfigurations(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in CompileConfigurations') #Log the error and don't continue
+
+        #Finish or undo the commit of a run that crashed, then stage every write and file move of this run until it commits; do this before anything is read from disk
+        LogEntries, Result = Utilities.BeginRun(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in BeginRun') #Log the error and don't continue
+
+        #Get every file already ingested, so that repeats can be skipped; do this only once per process execution
+        LogEntries, Result = Utilities.RetrieveManifest(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveManifest') #Log the error and don't continue
+
+        #Validate root level parameters
+        Result = ValidateRootParameters(CurrentFunction, InboundSourceFolder, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in ValidateRootParameters') #Log the error and don't continue
+
+    except Exception as e:
+        print(Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, False, Parameters)) #Report the error
+
+    if(Utilities.IsValid_LogFile) and (Result == Utilities.Result_Success):
+        #Now process all Inbound folders, along with all necessary validations
+        try:
+            if AllInboundFolders: #Process all Inbound sub-folders
+                Sources = [FolderName for FolderName in os.listdir(Utilities.FullPath_Bronze_Inbound) if os.path.isdir(os.path.join(Utilities.FullPath_Bronze_Inbound, FolderName))]
+            else: #Process just the specified Inbound sub-folder
+                Sources = [InboundSourceFolder]
+
+            if(Workers > 1) and (len(Sources) > 1):
+                #Give each Inbound sub-folder its own worker; the folders don't share any state, so they can be processed at the same time
+                with ThreadPoolExecutor(max_workers = Workers) as Executor:
+                    Futures = [Executor.submit(ProcessInboundFolder, CurrentFunction, os.path.join(Utilities.FullPath_Bronze_Inbound, Source), ExecutionGUID, Source) for Source in Sources]
+                    Contexts = [Future.result() for Future in Futures] #Collect in submission order, regardless of which worker finished first
+            else:
+                Contexts = [ProcessInboundFolder(CurrentFunction, os.path.join(Utilities.FullPath_Bronze_Inbound, Source), ExecutionGUID, Source) for Source in Sources]
+
+            #Merge the results of every source into the results of the run; the first error is kept, and sources that had files come first, so that a later source's error, or an empty folder's "No files were found", never hides it
+            InboundFileFound = False
+            for Context in sorted(Contexts, key = lambda Context: not Context['InboundFileFound']):
+                if(Context['InboundFileFound']): InboundFileFound = True
+                if(Context['Result'] != Utilities.Result_Success) and (Result == Utilities.Result_Success): Result = Context['Result']
+
+            #Make every file move of the run at once
+            LogEntries, CommitResult = Utilities.CommitRun(CurrentFunction, LogEntries, ExecutionGUID)
+            if(CommitResult != Utilities.Result_Success): raise Exception('Error in CommitRun') #Log the error and don't continue
+
+            if not InboundFileFound: Result = Utilities.Result_Success #If no Inbound files were found, set the result to success so that the script doesn't fail; this is not an error, just a condition
+
+            #Log the step
+            LogStep(Begin, CurrentFunction, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
+
+        except Exception as e:
+            Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+            LogStep(Begin, CurrentFunction, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+            print(Result) #Report the error
+
+        finally:
+            #Write whatever log entries of the run (from every source) haven't been written yet
+            Utilities.WriteToLogFile(CurrentFunction, LogEntries, ExecutionGUID)
+
+def ProcessInboundFile(CallStack, Context, InboundFile, ParentExecutionGUID):
+    #Local variables
+    Begin = datetime.now()
+    CurrentFunction = 'ProcessInboundFile'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'InboundFile': InboundFile
+        , 'ParentExecutionGUID': ParentExecutionGUID
+        , 'Source': Context['Source']
+    }
+    Result = Utilities.Result_Success
+    try:
+        FileName = os.path.basename(InboundFile) #Get the file name from the full path
+        FileExtension = os.path.splitext(FileName)[1] #Get the file extension of the current file
+
+        #Skip any file identical to one already ingested from the same source, whatever its name
+        with Utilities.MeasureStep(f'{CallStack} > FindInManifest', Context['Source']): ContentHash, Duplicate = Utilities.FindInManifest(InboundFile, Context['Source'])
+        if(Duplicate is not None):
+            #Rename the file to indicate that it is a repeat and move it to the appropriate Error folder
+            FileName = FileName.replace(FileExtension, '') + '.Duplicate' + FileExtension
+            FullPath_Error_CurrentFile = os.path.join(Context['FullPath_Bronze_Error_CurrentSource'], FileName) #Set the full path of the error file
+            Context['LogEntries'], Result = Utilities.MoveFile(CallStack, InboundFile, FullPath_Error_CurrentFile, Context['LogEntries'], ParentExecutionGUID)
+            if(Result != Utilities.Result_Success): raise Exception('Error in MoveFile') #Log the error and don't continue
+            LogStep(Begin, CallStack, ExecutionGUID, Parameters, Context, Action = 'Skip', File = InboundFile, ParentExecutionGUID = ParentExecutionGUID, Result = f'Skipped: identical to {Duplicate["FileName"]}, ingested {Duplicate["DateTimeInserted"]}', Severity = Utilities.Severity_Info)
+            return Result
+
+        #Process only .csv or .txt files
+        if FileName.lower().endswith(('.csv', '.txt')):
+            #Read only the column header of the current file; the Bronze layer doesn't need anything else to decide where the file goes
+            ActualColumnsAsList = []
+            IsEmpty = True
+            Context['LogEntries'], Result, ActualColumnsAsList, IsEmpty = Utilities.RetrieveColumnHeader(CallStack, Context['Configuration'].Delimiter, InboundFile, Context['LogEntries'], ParentExecutionGUID, Context['Configuration'].TextQualifier)
+            if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveColumnHeader') #Log the error and don't continue
+
+            #Put expected column headers into a list
+            ExpectedColumnsAsList = list(Context['Configuration'].ColumnHeader)
+
+            #Validate the actual column header
+            Issue = ''
+            if(IsEmpty): #Do not continue if the current file has no rows
+                #Rename the file to indicate that it is empty
+                Result = 'Empty'
+                FileName = FileName.replace(FileExtension, '') + '.Empty' + FileExtension
+            else:
+                Context['LogEntries'], Result, Issue = Utilities.ValidateColumnHeader(ActualColumnsAsList, CallStack, ExpectedColumnsAsList, Context['LogEntries'], ParentExecutionGUID)
+                if(Result != Utilities.Result_Success): FileName = FileName.replace(FileExtension, '') + '.InvalidColumnHeader.' + Issue + FileExtension #Change the file name to indicate that it has an invalid column header
+
+            if(Result != Utilities.Result_Success): #There was an issue with the current file
+                #Move the renamed file to the appropriate Error folder
+                FullPath_Error_CurrentFile = os.path.join(Context['FullPath_Bronze_Error_CurrentSource'], FileName) #Set the full path of the error file
+                Context['LogEntries'], Result = Utilities.MoveFile(CallStack, InboundFile, FullPath_Error_CurrentFile, Context['LogEntries'], ParentExecutionGUID)
+            else:
+                #Move the file to the appropriate Silver Inbound folder
+                FullPath_TargetFile = os.path.join(Context['FullPath_Silver_Inbound_CurrentSource'], FileName)
+                Context['LogEntries'], Result = Utilities.MoveFile(CallStack, InboundFile, FullPath_TargetFile, Context['LogEntries'], ParentExecutionGUID)
+
+        #Log the step
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, Context, File = InboundFile, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
+
+    except Exception as e:
+        Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, Context, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return Result
+
+def ProcessInboundFolder(CallStack, FullPath_Bronze_Inbound_CurrentSource, ParentExecutionGUID, Source, FileNames = None):
+    #Nothing in this function (or any function it calls) sets a global variable, so that it can run in its own worker; everything specific to the current source is kept in Context
+    #FileNames limits the files processed to the given ones (as Watch.py does, one file at a time); if None, every file in the folder is processed
+
+    #Local variables
+    Begin = datetime.now()
+    Context = BuildSourceContext(FullPath_Bronze_Inbound_CurrentSource, Source)
+    CurrentFunction = 'ProcessInboundFolder'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    EmptyFolder = ''
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'FullPath_Bronze_Inbound_CurrentSource': FullPath_Bronze_Inbound_CurrentSource
+        , 'ParentExecutionGUID': ParentExecutionGUID
+        , 'Source': Source
+    }
+    Result = Utilities.Result_Success
+    try:
+        #Loop through all files in the current Inbound sub-folder
+        if(FileNames is None): FileNames = os.listdir(FullPath_Bronze_Inbound_CurrentSource)
+        if not FileNames:
+            #There are no files in the folder
+            Context['InboundFileFound'] = False
+            if(EmptyFolder != ''): EmptyFolder = EmptyFolder + ', '
+            EmptyFolder = EmptyFolder + FullPath_Bronze_Inbound_CurrentSource
+            Result = 'No files were found for processing in ' + EmptyFolder
+        else:
+            #There are files in the folder
+            Context['InboundFileFound'] = True
+
+            #Set & validate the full paths of subfolders for the current source
+            Context['LogEntries'], Result, Context['FullPath_Bronze_Error_CurrentSource'] = Utilities.BuildFolderPath(CallStack, Utilities.FullPath_Bronze_Error, Source, Context['LogEntries'], ParentExecutionGUID)
+            Context['LogEntries'], Result, Context['FullPath_Silver_Inbound_CurrentSource'] = Utilities.BuildFolderPath(CallStack, Utilities.FullPath_Silver_Inbound, Source, Context['LogEntries'], ParentExecutionGUID)
+
+            #Get the compiled configuration of the current source
+            Context['Configuration'] = Utilities.Configurations_Compiled.get(Source)
+            if(Context['Configuration'] is None):
+                #No file level configurations were found for the current source
+                Result = f'No configuration records were found for source "{Source}" in file {Utilities.FullPath_Configurations_File}'
+                LogStep(Begin, CallStack, ExecutionGUID, Parameters, Context, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error)
+            else:
+                if(len(Context['Configuration'].Columns) == 0):
+                    #No column level configurations were found for the current source
+                    Result = f'No configuration records were found for ConfigurationFileID {Context["Configuration"].ConfigurationFileID} in file {Utilities.FullPath_Configurations_Column}'
+                    LogStep(Begin, CallStack, ExecutionGUID, Parameters, Context, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error)
+                else:
+                    #Ingest each file in the current Inbound folder; ProcessInboundFile moves each file to either the Error or the Silver Inbound folder
+                    for FileName in FileNames:
+                        InboundFile = os.path.join(FullPath_Bronze_Inbound_CurrentSource, FileName) #Generate the full path and file name of the file
+                        Result = ProcessInboundFile(CallStack, Context, InboundFile, ExecutionGUID)
+                        if(Result != Utilities.Result_Success): raise Exception('Error in ProcessInboundFile') #Log the error and don't continue
+
+        #Log the step
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, Context, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
+
+    except Exception as e:
+        Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, Context, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the context, which carries the result and the log entries of the current source
+        Context['Result'] = Result
+        return Context
+
+def ValidateRootParameters(CallStack, InboundSourceFolder, ParentExecutionGUID):
+    #Local variables
+    Begin = datetime.now()
+    CurrentFunction = 'ValidateRootParameters'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    Continue = True
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'InboundSourceFolder': InboundSourceFolder
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Utilities.Result_Success
+    try:
+        #Validate that each required parameter has a value; don't explicitly raise any excpetion if an issue is found, just log it and move on to the next parameter
+        if Continue:
+            #Validate folders
+            if(InboundSourceFolder != '') and not os.path.exists(InboundSourceFolder):
+                os.mkdir(InboundSourceFolder) #If a value was provided but doesn't exist, create it
+                Result = 'Folder path specified was not found and therefore created: ' + InboundSourceFolder #Return the warning but continue and don't fail
+       
+            #Log the step
+            LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
+
+    except Exception as e:
+        Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return Result
+
+#****************************************************************************************
+#ENTRY
+#****************************************************************************************
+if __name__ == '__main__':
+    print('***********************************************************************************') #Delineate manual runs
+    Main()
+    print(datetime.now(), ': Done')
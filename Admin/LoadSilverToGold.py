@@ -0,0 +1,300 @@
+""""
+DESCRIPTION
+    Bring the Gold aggregates of the Silver Transaction fact (spend by account, category and seller, per day and per month) up to date for Power BI
+    Only the Silver rows appended since an aggregate was last brought up to date are read into it, so a run costs the same however much history there is
+    The Gold Date dimension is extended with only the dates it doesn't have yet, never generated again as a whole at startup
+
+PARAMETERS
+    Rebuild
+        - Optional
+        - If True, every Gold aggregate is built again from the entire Silver Transaction fact; the fallback for an aggregate that's in doubt, or one that was just added
+        - The Date dimension is also generated again, so that a change to the holiday table reaches dates it already has
+        - If not used, only the Silver rows with a BatchID above the watermark of each aggregate (the delta) are added to it
+    ParentExecutionGUID
+        - Optional
+        - The GUID of the parent script that called this script
+        - If used, this will be used to link the log entries of this script to the parent script
+        - If not used, a new GUID will be generated for this script
+
+STEPS
+1. Validate all required folders and the Log file, as the other loads do
+2. Finish or undo the commit of a run that crashed (Utilities.BeginRun)
+3. Add every date of the past Utilities.DateDimensionYearsBack years and the current year that the Gold Date dimension doesn't have yet
+    a. Every attribute (calendar, ISO week, fiscal period, holiday from /<Root>/Admin/ConfigurationHoliday.txt) is calculated over all of the missing dates at once
+4. Get the watermark of each Gold aggregate (Utilities.Gold_Aggregates) from /<Root>/Admin/Watermark.txt
+5. Read the Silver Transaction fact rows above the lowest watermark (the delta), and add any of their dates the Date dimension doesn't have yet
+6. For each Gold aggregate:
+    a. Sum the rows of the delta above its watermark by its grain
+    b. Add the sums to the rows of the aggregate with the same grain, and add a row for each grain it doesn't have yet; every other row is left as it is
+    c. Move its watermark up to the highest BatchID of the delta
+7. Write the aggregates, the watermarks and the new dates at once (Utilities.CommitRun), so that an aggregate never has rows its watermark doesn't account for
+"""
+
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import os
+import Utilities
+import uuid
+from datetime import datetime
+from Utilities import pd #pandas, imported the first time it's used
+
+#****************************************************************************************
+#GLOBAL VARIABLES
+#   Set these variables to either empty or hard-coded values
+#   These variables can change value by any function
+#****************************************************************************************
+CurrentScriptFile = os.path.realpath(__file__)
+FactColumns = ['AccountGUID', 'Amount', 'BatchID', 'CategoryGUID', 'Date', 'SellerGUID'] #The columns of the Silver Transaction fact the aggregates are built from
+LogEntries = Utilities.LogSink() #Writes the log entries of the run to the log file in batches as the run goes
+
+#****************************************************************************************
+#FUNCTIONS
+#****************************************************************************************
+def AggregateDelta(Delta, Period):
+    #Don't log this function
+    #Sum the measures of Silver rows by the grain of an aggregate; rows without a date or a key are kept, under a grain of their own
+    return Delta.groupby(Utilities.Gold_Aggregate_Grain + [Period], dropna = False, observed = True, sort = False).agg(Amount = ('Amount', 'sum'), TransactionCount = ('Amount', 'size')).reset_index()
+
+def BuildDateDimension(Dates, Holidays):
+    #Don't log this function
+    #Every attribute of the Gold Date dimension for each of Dates, a whole column at a time rather than a date at a time; Holidays is the holiday table (Date, Name)
+    Dates = pd.DatetimeIndex(Dates).normalize()
+    Year = Dates.year.to_numpy()
+    Month = Dates.month.to_numpy()
+    Day = Dates.day.to_numpy()
+    Quarter = (Month - 1) // 3 + 1
+    FiscalMonth = (Month - Utilities.FiscalYearStartMonth) % 12 + 1
+    ISOCalendar = Dates.isocalendar()
+    HolidayNames = pd.Series(Holidays['Name'].astype(str).to_numpy(), index = pd.to_datetime(Holidays['Date'], errors = 'coerce'))
+    HolidayNames = HolidayNames[HolidayNames.index.notna() & ~HolidayNames.index.duplicated()].reindex(Dates).to_numpy() #The first name of a date listed twice
+    return pd.DataFrame({
+        'Date': Dates
+        , 'DateKey': (Year * 10000 + Month * 100 + Day).astype('int32')
+        , 'DayName': pd.Categorical(Dates.day_name())
+        , 'DayOfMonth': Day.astype('int8')
+        , 'DayOfWeek': (Dates.dayofweek.to_numpy() + 1).astype('int8')
+        , 'DayOfYear': Dates.dayofyear.to_numpy().astype('int16')
+        , 'FiscalMonth': FiscalMonth.astype('int8')
+        , 'FiscalQuarter': ((FiscalMonth - 1) // 3 + 1).astype('int8')
+        , 'FiscalYear': (Year + ((Utilities.FiscalYearStartMonth > 1) & (Month >= Utilities.FiscalYearStartMonth))).astype('int16')
+        , 'HolidayName': HolidayNames
+        , 'ISOWeek': ISOCalendar['week'].to_numpy().astype('int8')
+        , 'ISOYear': ISOCalendar['year'].to_numpy().astype('int16')
+        , 'IsHoliday': pd.notna(HolidayNames)
+        , 'IsWeekend': Dates.dayofweek.to_numpy() >= 5
+        , 'Month': Month.astype('int8')
+        , 'MonthKey': (Year * 100 + Month).astype('int32')
+        , 'MonthName': pd.Categorical(Dates.month_name())
+        , 'Quarter': Quarter.astype('int8')
+        , 'QuarterKey': (Year * 10 + Quarter).astype('int32')
+        , 'Year': Year.astype('int16')
+    }, columns = Utilities.Gold_Dimension_Definition_Date)
+
+def ExtendDateDimension(CallStack, ParentExecutionGUID, DateFirst, DateLast, Rebuild = False):
+    #Add every date from DateFirst through DateLast that the Gold Date dimension doesn't have yet, and only those, so that the dimension is never generated again as a whole; with Rebuild, generate it again from the holiday table as it is now
+    #Variable(s) defined outside of this function, but set within this function
+    global LogEntries
+
+    #Local variables
+    Begin = datetime.now()
+    CurrentFunction = 'ExtendDateDimension'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'DateFirst': str(DateFirst)
+        , 'DateLast': str(DateLast)
+        , 'ParentExecutionGUID': ParentExecutionGUID
+        , 'Rebuild': Rebuild
+    }
+    Result = Utilities.Result_Success
+    RowCount = 0
+    try:
+        #Compare the dates by their integer keys, reading only the key column of the dimension
+        Dates = pd.date_range(pd.Timestamp(DateFirst).normalize(), pd.Timestamp(DateLast).normalize(), freq = 'D')
+        Append = Utilities.TableExists(Utilities.FullPath_Gold_Dimension_Date) and not Rebuild
+        if Append: Dates = Dates[~pd.Index(Dates.year * 10000 + Dates.month * 100 + Dates.day).isin(Utilities.ReadTable(Utilities.FullPath_Gold_Dimension_Date, ['DateKey'])['DateKey'])]
+
+        if(len(Dates) > 0):
+            LogEntries, Result, Holidays = Utilities.RetrieveOrCreateFile(CallStack, Utilities.FileDefinition_Configuration_Holiday, Utilities.FullPath_Configurations_Holiday, LogEntries, ExecutionGUID)
+            if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveOrCreateFile') #Log the error and don't continue
+            Utilities.WriteTable(Utilities.FullPath_Gold_Dimension_Date, BuildDateDimension(Dates, Holidays), Append = Append)
+            RowCount = len(Dates)
+
+        #Log the step
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = RowCount, Severity = Utilities.Severity_Info, Target = Utilities.FullPath_Gold_Dimension_Date)
+
+    except Exception as e:
+        Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return Result
+
+def LogStep(Begin, CallStack, ExecutionGUID, Parameters, **VariedParameters): #The explicit parameters are required; anything passed into **VariedParameters is optional; different parameters may be passed into **VariedParameters
+    #Even though this local function calls another of the same name in a different script, keep this local function to be able to use "**VariedParameters"
+    #Variable(s) defined outside of this function, but set within this function
+    global LogEntries
+    #Add the step to the current set
+    LogEntries = Utilities.LogStep(Begin, CurrentScriptFile, CallStack, ExecutionGUID, LogEntries, Parameters, **VariedParameters)
+
+def Main(Rebuild = False, ParentExecutionGUID = ''):
+    #Variable(s) defined outside of this function, but set within this function
+    global LogEntries
+
+    #Local variables
+    Begin = datetime.now()
+    CurrentFunction = r'Main'
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'ParentExecutionGUID': ParentExecutionGUID
+        , 'Rebuild': Rebuild
+    }
+    Result = Utilities.Result_Success
+
+    #Perform the actions that could cause the entire script to fail; if this block fails, report the failure, don't log the failure, and don't continue
+    try:
+        #Set global variables to be used downstream
+        LogEntries, Result = Utilities.SetGlobalVariables(CurrentScriptFile, CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in SetGlobalVariables') #Log the error and don't continue
+
+        #Validate the log file so that all subsequent steps & errors can be properly logged
+        LogEntries, Result = Utilities.ValidateLogFile(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception(Result) #Report the error and don't continue - can't log the error because log file is invalid
+
+        #Finish or undo the commit of a run that crashed, then stage every write of this run until it commits; do this before anything is read from disk
+        LogEntries, Result = Utilities.BeginRun(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in BeginRun') #Log the error and don't continue
+
+    except Exception as e:
+        print(Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, False, Parameters)) #Report the error
+
+    if(Utilities.IsValid_LogFile) and (Result == Utilities.Result_Success):
+        try:
+            #Make sure the Date dimension covers the past DateDimensionYearsBack years and the current one before anything else
+            Today = datetime.now()
+            Result = ExtendDateDimension(CurrentFunction, ExecutionGUID, datetime(Today.year - Utilities.DateDimensionYearsBack, 1, 1), datetime(Today.year, 12, 31), Rebuild)
+            if(Result != Utilities.Result_Success): raise Exception('Error in ExtendDateDimension') #Log the error and don't continue
+
+            Result = UpdateAggregates(CurrentFunction, ExecutionGUID, Rebuild)
+            if(Result != Utilities.Result_Success): raise Exception('Error in UpdateAggregates') #Log the error and don't continue
+
+            #Make the aggregates and their watermarks at once
+            LogEntries, Result = Utilities.CommitRun(CurrentFunction, LogEntries, ExecutionGUID)
+            if(Result != Utilities.Result_Success): raise Exception('Error in CommitRun') #Log the error and don't continue
+
+            #Log the step
+            LogStep(Begin, CurrentFunction, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
+
+        except Exception as e:
+            Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+            LogStep(Begin, CurrentFunction, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+            print(Result) #Report the error
+
+        finally:
+            Utilities.WriteToLogFile(CurrentFunction, LogEntries, ExecutionGUID)
+    return Result
+
+def MergeAggregate(Aggregate, Changes, Period):
+    #Don't log this function
+    #Add the sums of a delta to the rows of the aggregate with the same grain, in place, with one hashed lookup, and append a row for each grain the aggregate doesn't have yet
+    Keys = Utilities.Gold_Aggregate_Grain + [Period]
+    Aggregate[Period] = pd.to_datetime(Aggregate[Period]) #A Text table reads its dates back as text
+    Positions = Utilities.HashNaturalKey(Aggregate, Keys).get_indexer(Utilities.HashNaturalKey(Changes, Keys))
+    IsFound = Positions >= 0
+    for Measure in Utilities.Gold_Aggregate_Measures:
+        Values = Aggregate[Measure].to_numpy(copy = True)
+        Values[Positions[IsFound]] += Changes[Measure].to_numpy()[IsFound] #Each grain appears only once in Changes, so no position is added to twice
+        Aggregate[Measure] = Values
+    return pd.concat([Aggregate, Changes[~IsFound]], ignore_index = True)
+
+def PrepareDelta(Delta):
+    #Don't log this function
+    #Reduce Silver rows to what the aggregates are built from: the IDs of their keys (a missing key gets the ID of a missing key), their day and month, and their amount
+    Prepared = pd.DataFrame({
+        'AccountID': Utilities.ConvertSurrogateKeyToID(Delta['AccountGUID'])
+        , 'Amount': pd.to_numeric(Delta['Amount'], errors = 'coerce')
+        , 'BatchID': Delta['BatchID'].astype('int64')
+        , 'CategoryID': Utilities.ConvertSurrogateKeyToID(Delta['CategoryGUID'])
+        , 'Date': pd.to_datetime(Delta['Date'], errors = 'coerce').dt.normalize()
+        , 'SellerID': Utilities.ConvertSurrogateKeyToID(Delta['SellerGUID'])
+    })
+    Prepared['Month'] = Prepared['Date'].dt.to_period('M').dt.start_time
+    return Prepared
+
+def RetrieveWatermarks():
+    #Don't log this function
+    #The highest BatchID already added to each Gold table, keyed by table; a table that isn't listed has had nothing added to it
+    if not os.path.exists(Utilities.FullPath_Watermark): return {}
+    Watermarks = pd.read_csv(Utilities.FullPath_Watermark, delimiter = Utilities.DelimiterDefault, dtype = {'BatchID': 'int64', 'Table': str})
+    return dict(zip(Watermarks['Table'], Watermarks['BatchID']))
+
+def UpdateAggregates(CallStack, ParentExecutionGUID, Rebuild = False):
+    #Bring every Gold aggregate up to date with the Silver rows appended since its watermark, or, with Rebuild, build it again from every Silver row
+
+    #Local variables
+    Begin = datetime.now()
+    CurrentFunction = 'UpdateAggregates'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'FullPath_Silver_Fact_Transaction': Utilities.FullPath_Silver_Fact_Transaction
+        , 'ParentExecutionGUID': ParentExecutionGUID
+        , 'Rebuild': Rebuild
+    }
+    Result = Utilities.Result_Success
+    RowCount = 0
+    try:
+        Watermarks = RetrieveWatermarks()
+        if Rebuild: Watermarks.update({Aggregate: 0 for Aggregate in Utilities.Gold_Aggregates})
+        WatermarkLowest = min(Watermarks.get(Aggregate, 0) for Aggregate in Utilities.Gold_Aggregates)
+
+        #Read only the Silver rows at least one aggregate doesn't have yet, opening only the partitions that hold any
+        Delta = PrepareDelta(Utilities.ReadSilverFact(FactColumns, BatchIDAbove = WatermarkLowest))
+        RowCount = len(Delta)
+        if not Delta.empty:
+            #Every date of the delta needs its row in the Date dimension, however old or new
+            if Delta['Date'].notna().any():
+                Result = ExtendDateDimension(CallStack, ExecutionGUID, Delta['Date'].min(), Delta['Date'].max())
+                if(Result != Utilities.Result_Success): raise Exception('Error in ExtendDateDimension') #Log the error and don't continue
+
+            for Aggregate, Period in Utilities.Gold_Aggregates.items():
+                Watermark = Watermarks.get(Aggregate, 0)
+                Changes = Delta[Delta['BatchID'] > Watermark]
+                if Changes.empty: continue
+                Changes = AggregateDelta(Changes, Period)
+
+                #Add the changes to the aggregate as it is; a rebuild starts from nothing
+                FullPath_Gold_Aggregate = os.path.join(Utilities.FullPath_Gold_Facts, f'{Aggregate}.txt')
+                if not Rebuild and Utilities.TableExists(FullPath_Gold_Aggregate): Changes = MergeAggregate(Utilities.ReadTable(FullPath_Gold_Aggregate), Changes, Period)
+                Utilities.WriteTable(FullPath_Gold_Aggregate, Changes)
+                Watermarks[Aggregate] = int(Delta['BatchID'].max())
+
+                LogStep(Begin, CallStack, ExecutionGUID, Parameters, Action = 'Rebuild' if Rebuild else 'Merge', ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = len(Changes), Severity = Utilities.Severity_Info, Target = FullPath_Gold_Aggregate)
+            WriteWatermarks(Watermarks)
+
+        #Log the step
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = RowCount, Severity = Utilities.Severity_Info)
+
+    except Exception as e:
+        Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return Result
+
+def WriteWatermarks(Watermarks):
+    #Don't log this function
+    #Write the watermark of every Gold table; within the run, so that it's written only along with the tables it describes
+    DateTimeUpdated = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+    Utilities.WriteTextFile(Utilities.FullPath_Watermark, pd.DataFrame([{'BatchID': BatchID, 'DateTimeUpdated': DateTimeUpdated, 'Table': Table} for Table, BatchID in sorted(Watermarks.items())], columns = Utilities.FileDefinition_Watermark), Append = False)
+
+#****************************************************************************************
+#ENTRY
+#****************************************************************************************
+if __name__ == '__main__':
+    Main()
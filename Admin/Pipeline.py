@@ -0,0 +1,185 @@
+""""
+DESCRIPTION
+    Run the pipeline, or answer quick questions about it, from one command line: python -m Pipeline <command>
+    The lightweight commands (header, pending, status) never import pandas, so that they answer in a fraction of the time a load takes to start
+
+PARAMETERS
+    bronze [--source <Source>] [--workers N] [--report] [--top N] [--cprofile] [--tracemalloc]
+        - Run LoadFileToBronze for every /<Root>/Bronze/Inbound/<Source>/ folder, or just the given one
+    silver [--source <Source>] [--report] [--top N] [--cprofile] [--tracemalloc]
+        - Run LoadBronzeToSilver for every configured source, or just the given one
+    gold [--rebuild] [--report] [--top N] [--cprofile] [--tracemalloc]
+        - Run LoadSilverToGold: add the Silver rows appended since the last run to the Gold aggregates, or with --rebuild, build them again from every Silver row
+    --report
+        - Optional
+        - After the run, write its performance report (the slowest call-stack paths and the throughput of each source) to /<Root>/Admin/Performance/ as JSON and text, and print the text
+    --top N
+        - Optional
+        - Number of the slowest call-stack paths in the performance report (default Utilities.PerformanceTopN)
+    --cprofile
+        - Optional
+        - Profile every function call with cProfile, and add the slowest functions to the performance report (implies --report)
+    --tracemalloc
+        - Optional
+        - Trace memory allocations, so that the performance report has the peak memory of each step (implies --report); slows the run down considerably
+    watch [--debounce S] [--poll-interval S] [--queue N] [--polling]
+        - Run continuously, pushing each file through Bronze and Silver as soon as it lands in /<Root>/Bronze/Inbound/<Source>/ (see Watch.py); Ctrl+C stops it
+    header <FullPath> [--source <Source>]
+        - Validate the column header of a file against the configuration of its source, as LoadFileToBronze would
+        - If --source isn't used, the name of the folder holding the file is used
+    pending
+        - List every file waiting in /<Root>/Bronze/Inbound/<Source>/ and /<Root>/Silver/Inbound/<Source>/
+    status [--runs N]
+        - Show how the last N runs (default 1) ended
+"""
+
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import time
+StartTime = time.perf_counter() #Measure startup from before anything else is imported
+import argparse
+import csv
+import os
+import sys
+import Utilities
+
+#****************************************************************************************
+#GLOBAL VARIABLES
+#   Set these variables to either empty or hard-coded values
+#   These variables can change value by any function
+#****************************************************************************************
+CurrentScriptFile = os.path.realpath(__file__)
+LightweightBudgetMilliseconds = 100 #The lightweight commands should finish within this long of the script starting; if one doesn't, say so
+LogTailBytes = 1024 * 1024 #How much of the end of the log file to read at a time when looking for the last runs
+
+#****************************************************************************************
+#FUNCTIONS
+#****************************************************************************************
+def CheckBudget(Command):
+    #Report a lightweight command that took longer than its budget, and whether pandas was imported along the way, which is the usual reason
+    ElapsedMilliseconds = (time.perf_counter() - StartTime) * 1000
+    if(ElapsedMilliseconds > LightweightBudgetMilliseconds):
+        Reason = ' (pandas was imported)' if 'pandas' in sys.modules else ''
+        print(f'Warning: {Command} took {ElapsedMilliseconds:.0f} ms, over its budget of {LightweightBudgetMilliseconds} ms{Reason}', file = sys.stderr)
+    return ElapsedMilliseconds
+
+def Main(Arguments = None):
+    Parser = argparse.ArgumentParser(prog = 'python -m Pipeline', description = 'Run the pipeline or answer quick questions about it')
+    Commands = Parser.add_subparsers(dest = 'Command', required = True)
+    Profiling = argparse.ArgumentParser(add_help = False) #The options shared by the commands that run a load
+    Profiling.add_argument('--report', action = 'store_true')
+    Profiling.add_argument('--top', default = None, type = int)
+    Profiling.add_argument('--cprofile', action = 'store_true')
+    Profiling.add_argument('--tracemalloc', action = 'store_true')
+    Bronze = Commands.add_parser('bronze', help = 'Load inbound files into the Bronze layer', parents = [Profiling])
+    Bronze.add_argument('--source', default = '')
+    Bronze.add_argument('--workers', default = 1, type = int)
+    Commands.add_parser('silver', help = 'Transform staged files into the Silver layer', parents = [Profiling]).add_argument('--source', default = '')
+    Commands.add_parser('gold', help = 'Bring the Gold aggregates up to date', parents = [Profiling]).add_argument('--rebuild', action = 'store_true')
+    Watch = Commands.add_parser('watch', help = 'Load each inbound file through Bronze and Silver as soon as it lands')
+    Watch.add_argument('--debounce', default = None, type = float)
+    Watch.add_argument('--poll-interval', default = None, type = float)
+    Watch.add_argument('--queue', default = None, type = int)
+    Watch.add_argument('--polling', action = 'store_true')
+    Header = Commands.add_parser('header', help = 'Validate the column header of a file')
+    Header.add_argument('FullPath')
+    Header.add_argument('--source', default = '')
+    Commands.add_parser('pending', help = 'List files waiting to be loaded')
+    Commands.add_parser('status', help = 'Show how the last runs ended').add_argument('--runs', default = 1, type = int)
+    Arguments = Parser.parse_args(Arguments)
+
+    #The loaders are only imported by the commands that run them
+    if(Arguments.Command in ('bronze', 'silver', 'gold')):
+        Utilities.StartProfiling(Arguments.cprofile, Arguments.tracemalloc)
+        try:
+            if(Arguments.Command == 'bronze'):
+                import LoadFileToBronze
+                return LoadFileToBronze.Main(Arguments.source, Workers = Arguments.workers)
+            if(Arguments.Command == 'gold'):
+                import LoadSilverToGold
+                return LoadSilverToGold.Main(Arguments.rebuild)
+            import LoadBronzeToSilver
+            return LoadBronzeToSilver.Main(Arguments.source)
+        finally:
+            Utilities.StopProfiling()
+            if(Arguments.report or Arguments.cprofile or Arguments.tracemalloc): WriteReport(Arguments.top)
+    if(Arguments.Command == 'watch'):
+        import Watch
+        return Watch.Main(Arguments.debounce, Arguments.poll_interval, Arguments.queue, Arguments.polling)
+
+    #Everything else only needs the folder layout; the log entries of a lightweight command are not written to the log
+    LogEntries = []
+    LogEntries, Result = Utilities.SetGlobalVariables(CurrentScriptFile, 'Main', LogEntries, '')
+    if(Result != Utilities.Result_Success): raise SystemExit(Result)
+    if(Arguments.Command == 'header'): IsValid = ValidateHeader(Arguments.FullPath, Arguments.source, LogEntries)
+    elif(Arguments.Command == 'pending'): IsValid = ShowPendingFiles()
+    else: IsValid = ShowLastRuns(Arguments.runs)
+    CheckBudget(Arguments.Command)
+    if not IsValid: raise SystemExit(1)
+
+def RetrieveLastRuns(Runs):
+    #A run is an entry without a parent; read the log file backwards a block at a time until enough runs are found, so that the cost doesn't depend on the size of the log
+    if(Utilities.LogBackend == 'SQLite'):
+        LogDatabase = Utilities.ConnectLogDatabase()
+        try: return [dict(zip(Utilities.FileDefinition_Log, Row)) for Row in LogDatabase.execute("SELECT * FROM Log WHERE ParentExecutionGUID IS NULL OR ParentExecutionGUID = '' ORDER BY Begin DESC LIMIT ?", (Runs,))]
+        finally: LogDatabase.close()
+
+    if not os.path.exists(Utilities.FullPath_LogFile): return []
+    Size = os.path.getsize(Utilities.FullPath_LogFile)
+    TailBytes = LogTailBytes
+    while True:
+        with open(Utilities.FullPath_LogFile, 'rb') as f:
+            f.seek(max(Size - TailBytes, 0))
+            Lines = f.read().decode('utf-8', errors = 'replace').splitlines()
+        if(TailBytes < Size): Lines = Lines[1:] #The first line is probably only part of an entry
+        Entries = [Entry for Entry in csv.DictReader(Lines, fieldnames = Utilities.FileDefinition_Log, delimiter = Utilities.DelimiterDefault) if Entry['ExecutionGUID'] != 'ExecutionGUID']
+        LastRuns = sorted([Entry for Entry in Entries if Entry['ParentExecutionGUID'] in ('', None)], key = lambda Entry: Entry['Begin'], reverse = True)[:Runs]
+        if(len(LastRuns) >= Runs) or (TailBytes >= Size): return LastRuns
+        TailBytes *= 2
+
+def ShowLastRuns(Runs):
+    Writer = csv.writer(sys.stdout, delimiter = Utilities.DelimiterDefault, lineterminator = '\n')
+    Writer.writerow(['Begin', 'End', 'Caller', 'Severity', 'Result', 'ExecutionGUID'])
+    LastRuns = RetrieveLastRuns(Runs)
+    Writer.writerows([Run['Begin'], Run['End'], os.path.basename(Run['Caller'] or ''), Run['Severity'], Run['Result'], Run['ExecutionGUID']] for Run in LastRuns)
+    return all(Run['Severity'] != Utilities.Severity_Error for Run in LastRuns)
+
+def ShowPendingFiles():
+    Writer = csv.writer(sys.stdout, delimiter = Utilities.DelimiterDefault, lineterminator = '\n')
+    Writer.writerow(['Layer', 'Source', 'File', 'Size'])
+    for Layer, Inbound in [('Bronze', Utilities.FullPath_Bronze_Inbound), ('Silver', Utilities.FullPath_Silver_Inbound)]:
+        with os.scandir(Inbound) as Sources:
+            for Source in sorted((Entry for Entry in Sources if Entry.is_dir()), key = lambda Entry: Entry.name):
+                with os.scandir(Source.path) as Files:
+                    Writer.writerows([Layer, Source.name, File.name, File.stat().st_size] for File in sorted(Files, key = lambda Entry: Entry.name) if File.is_file())
+    return True
+
+def WriteReport(TopN):
+    #Write the performance report of the run and print it, unless the run didn't get as far as setting up the folder layout
+    if(Utilities.FullPath_Admin == ''): return
+    Report = Utilities.BuildPerformanceReport(TopN)
+    FullPath = Utilities.WritePerformanceReport(Report)
+    print(Utilities.FormatPerformanceReport(Report), end = '')
+    print(f'Performance report written to {FullPath} and {os.path.splitext(FullPath)[0]}.txt')
+
+def ValidateHeader(FullPath, Source, LogEntries):
+    #Compiled configurations are loaded from disk without parsing the configuration files (or importing pandas) unless a configuration file changed
+    LogEntries, Result = Utilities.CompileConfigurations('Main', LogEntries, '')
+    if(Result != Utilities.Result_Success): raise SystemExit(Result)
+    if(Source == ''): Source = os.path.basename(os.path.dirname(os.path.realpath(FullPath)))
+    Configuration = Utilities.Configurations_Compiled.get(Source)
+    if(Configuration is None): raise SystemExit(f'No configuration records were found for source "{Source}" in file {Utilities.FullPath_Configurations_File}')
+
+    LogEntries, Result, ColumnHeader, IsEmpty = Utilities.RetrieveColumnHeader('Main', Configuration.Delimiter, FullPath, LogEntries, '', Configuration.TextQualifier)
+    if(Result != Utilities.Result_Success): raise SystemExit(Result)
+    LogEntries, Result, Issue = Utilities.ValidateColumnHeader(ColumnHeader, 'Main', list(Configuration.ColumnHeader), LogEntries, '')
+    if(Issue == '') and (IsEmpty): Issue = 'Empty'
+    print(f'{FullPath}: {"Valid" if Issue == "" else Issue} (source {Source})')
+    return Issue == ''
+
+#****************************************************************************************
+#ENTRY
+#****************************************************************************************
+if __name__ == '__main__':
+    Main()
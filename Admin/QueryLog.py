@@ -0,0 +1,118 @@
+""""
+DESCRIPTION
+    Answer common questions about past runs from the indexed log database (/<Root>/Admin/Log.db)
+    Log entries are written to the log database instead of /<Root>/Admin/Log.txt when Utilities.LogBackend is set to SQLite
+
+PARAMETERS
+    tree <ExecutionGUID>
+        - Every log entry of the run (or any step) with the given ExecutionGUID, and of everything it called, in the order they began
+    errors [--runs N]
+        - Every error logged by the last N runs (default 1)
+    file <File>
+        - Every log entry for the given file (full path, as logged), in the order they began
+    import [--log-file <FullPath>]
+        - Load an existing log file (default /<Root>/Admin/Log.txt) into the log database, so that it can be queried too
+    --database <FullPath>
+        - Optional
+        - The log database to use; if not used, /<Root>/Admin/Log.db is used
+"""
+
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import argparse
+import csv
+import os
+import sys
+import Utilities
+
+#****************************************************************************************
+#GLOBAL VARIABLES
+#   Set these variables to either empty or hard-coded values
+#   These variables can change value by any function
+#****************************************************************************************
+CurrentScriptFile = os.path.realpath(__file__)
+FullPath_LogDatabase = os.path.join(os.path.dirname(CurrentScriptFile), 'Log.db')
+FullPath_LogFile = os.path.join(os.path.dirname(CurrentScriptFile), 'Log.txt')
+ImportBatchSize = 10000 #Number of rows inserted at a time when importing a log file
+
+#****************************************************************************************
+#FUNCTIONS
+#****************************************************************************************
+def ImportLogFile(LogDatabase, FullPath):
+    #Stream the log file into the log database in batches, so that a log file of any size can be imported
+    RowCount = 0
+    Insert = f'INSERT INTO Log VALUES ({", ".join("?" * len(Utilities.FileDefinition_Log))})'
+    with open(FullPath, 'r', newline = '') as f:
+        Reader = csv.reader(f, delimiter = Utilities.DelimiterDefault)
+        next(Reader, None) #Skip the column header
+        Batch = []
+        for Row in Reader:
+            if(len(Row) != len(Utilities.FileDefinition_Log)): continue #Skip anything that isn't a complete log entry
+            Batch.append([Value if Value != '' else None for Value in Row])
+            if(len(Batch) >= ImportBatchSize):
+                with LogDatabase: LogDatabase.executemany(Insert, Batch)
+                RowCount += len(Batch)
+                Batch = []
+        with LogDatabase: LogDatabase.executemany(Insert, Batch)
+        RowCount += len(Batch)
+    return RowCount
+
+def Main(Arguments = None):
+    Parser = argparse.ArgumentParser(description = 'Query the indexed log database')
+    Parser.add_argument('--database', default = FullPath_LogDatabase)
+    Commands = Parser.add_subparsers(dest = 'Command', required = True)
+    Commands.add_parser('tree').add_argument('ExecutionGUID')
+    Commands.add_parser('errors').add_argument('--runs', default = 1, type = int)
+    Commands.add_parser('file').add_argument('File')
+    Commands.add_parser('import').add_argument('--log-file', default = FullPath_LogFile)
+    Arguments = Parser.parse_args(Arguments)
+
+    LogDatabase = Utilities.ConnectLogDatabase(Arguments.database)
+    try:
+        if(Arguments.Command == 'import'):
+            print(f'Imported {ImportLogFile(LogDatabase, Arguments.log_file)} log entries from {Arguments.log_file}')
+            return
+        if(Arguments.Command == 'tree'): Columns, Rows = RetrieveCallTree(LogDatabase, Arguments.ExecutionGUID)
+        elif(Arguments.Command == 'errors'): Columns, Rows = RetrieveErrors(LogDatabase, Arguments.runs)
+        else: Columns, Rows = RetrieveFileHistory(LogDatabase, Arguments.File)
+        Writer = csv.writer(sys.stdout, delimiter = Utilities.DelimiterDefault, lineterminator = '\n')
+        Writer.writerow(Columns)
+        Writer.writerows(Rows)
+    finally:
+        LogDatabase.close()
+
+def RetrieveCallTree(LogDatabase, ExecutionGUID):
+    #Follow ParentExecutionGUID down from the given ExecutionGUID; both columns are indexed, so each level is an index lookup rather than a scan of the log
+    Cursor = LogDatabase.execute(
+        'WITH RECURSIVE Tree(ExecutionGUID, Depth) AS ('
+        '    SELECT ?, 0'
+        '    UNION'
+        '    SELECT Log.ExecutionGUID, Tree.Depth + 1 FROM Log JOIN Tree ON Log.ParentExecutionGUID = Tree.ExecutionGUID'
+        ') '
+        'SELECT DISTINCT Tree.Depth, Log.* FROM Log JOIN Tree ON Log.ExecutionGUID = Tree.ExecutionGUID ORDER BY Log.Begin'
+        , (ExecutionGUID,)
+    )
+    return [Column[0] for Column in Cursor.description], Cursor.fetchall()
+
+def RetrieveErrors(LogDatabase, Runs):
+    #A run is an entry without a parent; take the most recent ones, then every error anywhere in their call trees
+    Columns = []
+    Rows = []
+    RunExecutionGUIDs = LogDatabase.execute("SELECT DISTINCT ExecutionGUID, Begin FROM Log WHERE ParentExecutionGUID IS NULL OR ParentExecutionGUID = '' ORDER BY Begin DESC LIMIT ?", (Runs,)).fetchall()
+    for RunExecutionGUID, _ in RunExecutionGUIDs:
+        Columns, Tree = RetrieveCallTree(LogDatabase, RunExecutionGUID)
+        SeverityIndex = Columns.index('Severity')
+        Rows.extend(Row for Row in Tree if Row[SeverityIndex] == Utilities.Severity_Error)
+    if(len(Columns) == 0): Columns = ['Depth'] + Utilities.FileDefinition_Log
+    return Columns, Rows
+
+def RetrieveFileHistory(LogDatabase, File):
+    Cursor = LogDatabase.execute('SELECT * FROM Log WHERE File = ? ORDER BY Begin', (File,))
+    return [Column[0] for Column in Cursor.description], Cursor.fetchall()
+
+#****************************************************************************************
+#ENTRY
+#****************************************************************************************
+if __name__ == '__main__':
+    Main()
@@ -1,549 +1,2051 @@
-#****************************************************************************************
-#REFERENCES
-#****************************************************************************************
-import csv
-import os
-import pandas as pd
-import uuid
-from datetime import datetime
-from pathlib import Path
-
-#****************************************************************************************
-#GLOBAL VARIABLES
-#   Set these variables to either empty or hard-coded values
-#   These variables can change value by any function
-#****************************************************************************************
-CallingObject = ''
-ColumnConfigurationFilename = ''
-Configurations_Column_All = pd.DataFrame()
-Configurations_File_All = pd.DataFrame()
-CurrentScriptFile = os.path.realpath(__file__)
-DelimiterDefault = r'|'
-ExpectedDelimiter = ''
-FileDefinition_Configuration_Column = [
-    'ColumnName_Bronze'
-    , 'ColumnName_File'
-    , 'ColumnName_Silver'
-    , 'ColumnName_Gold'
-    , 'ConfigurationColumnOrder'
-    , 'ConfigurationFileID'
-    , 'Datatype'
-    , 'Transformation_FileToBronze'
-]
-FileDefinition_Configuration_File = [
-    'Account'
-    , 'ConfigurationFileID'
-    , 'DefaultCategory'
-    , 'Delimiter'
-    , 'Source'
-    , 'TextQualifier'
-]
-FileDefinition_Log = [
-    'ExecutionGUID'
-    , 'ParentExecutionGUID'
-    , 'Begin'
-    , 'End'
-    , 'Severity'
-    , 'Caller'
-    , 'CallStack'
-    , 'Action'
-    , 'RowCount'
-    , 'Source'
-    , 'Target'
-    , 'Result'
-    , 'File'
-    , 'Parameters'
-]
-FullPath_Admin = ''
-FullPath_Bronze = ''
-FullPath_Bronze_Archive = ''
-FullPath_Bronze_Error = ''
-FullPath_Bronze_Inbound = ''
-FullPath_Configurations_File = ''
-FullPath_Configurations_Column = ''
-FullPath_Gold = ''
-FullPath_Gold_Dimensions = ''
-FullPath_Gold_Error = ''
-FullPath_Gold_Facts = ''
-FullPath_Gold_Inbound = ''
-FullPath_LogFile = ''
-FullPath_Root = ''
-FullPath_Silver = ''
-FullPath_Silver_Dimension = ''
-FullPath_Silver_Error = ''
-FullPath_Silver_Facts = ''
-FullPath_Silver_Inbound = ''
-IsValid_LogFile = False
-Result_Success = r'Success'
-Severity_Error = r'Error'
-Severity_Info = r'Info'
-Silver_Dimension_Definition_Account = [
-    'AccountGUID'
-    , 'DateTimeInserted'
-    , 'Name'
-]
-Silver_Dimension_Definition_AccountType = [
-    'AccountTypeGUID'
-    , 'DateTimeInserted'
-    , 'Name'
-]
-Silver_Dimension_Definition_Brand = [
-    'BrandGUID'
-    , 'DateTimeInserted'
-    , 'Name'
-]
-Silver_Dimension_Definition_Category = [
-    'CategoryGUID'
-    , 'DateTimeInserted'
-    , 'Name'
-    , 'ParentCategoryGUID'
-]
-Silver_Dimension_Definition_PriceType = [
-    'DateTimeInserted'
-    , 'Name'
-    , 'PriceTypeGUID'
-]
-Silver_Dimension_Definition_ProductService = [
-    'DateTimeInserted'
-    , 'Name'
-    , 'ProductServiceGUID'
-]
-Silver_Dimension_Definition_Seller = [
-    'DateTimeInserted'
-    , 'Name'
-    , 'SellerGUID'
-]
-Silver_Dimension_Definition_UnitOfMeasurement = [
-    'Abbreviation'
-    , 'DateTimeInserted'
-    , 'Name'
-    , 'UnitOfMeasurementGUID'
-]
-Silver_Dimensions = [
-    'Account'
-    , 'AccountType'
-    , 'Brand'
-    , 'Category'
-    , 'PriceType'
-    , 'ProductService'
-    , 'Seller'
-    , 'UnitOfMeasurement'
-]
-
-#****************************************************************************************
-#FUNCTIONS
-#****************************************************************************************
-def BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, LogError, Parameters = ''):
-    ErrorMessage = f'Error in {CurrentScriptFile} > {CurrentFunction}() on line {str(e.__traceback__.tb_lineno)}: {str(e)}'
-    if not LogError: ErrorMessage = f'Error in {CurrentScriptFile} > {CurrentFunction}() on line {str(e.__traceback__.tb_lineno)}\r\nError: {str(e)}\r\nParameters: {Parameters}'
-    return ErrorMessage
-
-def BuildFolderPath(CallStack, Folder, SubFolder, LogEntries, ParentExecutionGUID):
-    Begin = datetime.now()
-    CurrentFunction = 'BuildFolderPath'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Parameters = {
-        'Folder': Folder
-        , 'ParentExecutionGUID': ParentExecutionGUID
-        , 'SubFolder': SubFolder
-    }
-    Result = Result_Success
-    try:
-        if Folder != '' and not os.path.exists(Folder):
-            os.makedirs(Folder, exist_ok = True)
-            LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = f'Created {Folder}', Severity = Severity_Info)
-        FullPath = os.path.join(Folder, SubFolder)
-        if FullPath != '' and not os.path.exists(FullPath):
-            os.makedirs(FullPath, exist_ok = True)
-            LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = f'Created {FullPath}', Severity = Severity_Info)
-
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return LogEntries, Result, FullPath
-
-def LogStep(Begin, Caller, CallStack, ExecutionGUID, LogEntries, Parameters, **VariedParameters): #The explicit parameters are required; anything passed into **VariedParameters is optional; different parameters may be passed into **VariedParameters
-    #Don't log this function
-    CurrentFunction = 'LogStep'
-    try:
-        Begin = Begin.strftime('%Y-%m-%d %H:%M:%S.%f') #Format the value as YYYY-MM-DD HH:MM:SS.ms
-        End = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f') #Format the value as YYYY-MM-DD HH:MM:SS.ms
-        if(ExecutionGUID == ''): ExecutionGUID = str(uuid.uuid4()) #If no ExecutionGUID is passed in, generate a new GUID
-
-        LogEntry = {
-            'ExecutionGUID': ExecutionGUID
-            , 'ParentExecutionGUID': VariedParameters.get('ParentExecutionGUID')
-            , 'Begin': Begin
-            , 'End': End
-            , 'Severity': VariedParameters.get('Severity')
-            , 'Caller': Caller
-            , 'CallStack': CallStack
-            , 'Action': VariedParameters.get('Action')
-            , 'RowCount': VariedParameters.get('RowCount')
-            , 'Source': VariedParameters.get('Source')
-            , 'Target': VariedParameters.get('Target')
-            , 'Result': VariedParameters.get('Result')
-            , 'File': VariedParameters.get('File')
-            , 'Parameters': Parameters
-        }
-        LogEntries.append(LogEntry) #Add the log entry to the collection of log entries for the current run
-
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, False, Parameters) #Build the error message
-        print(Result) #Report the error
-
-    finally:
-        return LogEntries
-
-def MoveFile(CallStack, FullPath_SourceFile, FullPath_TargetFile, LogEntries, ParentExecutionGUID):
-    Begin = datetime.now()
-    CurrentFunction = 'MoveFile'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Parameters = {
-        'FullPath_SourceFile': FullPath_SourceFile
-        , 'FullPath_TargetFile': FullPath_TargetFile
-        , 'ParentExecutionGUID': ParentExecutionGUID
-    }
-    Result = Result_Success
-    try:
-        #Validate the filenames & folder paths
-        if(FullPath_SourceFile == ''): raise Exception('FullPath_SourceFile cannot be empty')
-        if(FullPath_TargetFile == ''): raise Exception('FullPath_TargetFile cannot be empty')
-
-        #Split the full paths into folder paths and filenames
-        FolderPath_Source = os.path.dirname(FullPath_SourceFile)
-        FolderPath_Target = os.path.dirname(FullPath_TargetFile)
-        Filename_Source = os.path.basename(FullPath_SourceFile)
-        Filename_Target = os.path.basename(FullPath_TargetFile)
-
-        #Create the folders if they don't exist
-        if(FolderPath_Source != '') and not os.path.exists(FolderPath_Source): os.makedirs(FolderPath_Source, exist_ok = True)
-        if(FolderPath_Target != '') and not os.path.exists(FolderPath_Target): os.makedirs(FolderPath_Target, exist_ok = True)
-
-        #Build the full paths to the source and target files
-        FullPath_SourceFile = os.path.join(FolderPath_Source, Filename_Source)
-        FullPath_TargetFile = os.path.join(FolderPath_Target, Filename_Target)
-
-        #Move the file
-        os.rename(FullPath_SourceFile, FullPath_TargetFile)
-
-        #Log the step
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
-
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return LogEntries, Result
-
-def RetrieveOrCreateFile(CallStack, FileDefinition, FullPath, LogEntries, ParentExecutionGUID):
-    Begin = datetime.now()
-    CurrentFunction = 'RetrieveOrCreateFile'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Parameters = {
-        'ParentExecutionGUID': ParentExecutionGUID
-    }
-    Result = Result_Success
-    try:
-        #Validate the FullPath parameter
-        if(FullPath == ''): raise Exception('FullPath cannot be empty')
-
-        #Validate the folder path; create it if it doesn't exist
-        if(FullPath != '') and not os.path.exists(FullPath): os.makedirs(FullPath, exist_ok = True)
-
-        #Validate the file existence; create it if it's not found
-        File = pd.DataFrame() #Initialize to an empty DataFrame
-        if(FullPath != '') and os.path.exists(FullPath): File = pd.read_csv(FullPath, delimiter = DelimiterDefault, quoting = csv.QUOTE_NONE)
-        if len(File) == 0:
-            #Create an empty file
-            os.makedirs(os.path.dirname(FullPath), exist_ok = True)
-            with open(FullPath, 'w') as f: f.write(DelimiterDefault.join(FileDefinition) + '\n')
-            with open(FullPath, 'w') as f: f.write(FileDefinition) #Add the correct column headers
-            Result = 'Log file was not found and therefore created: ' + FullPath #Return the warning but continue and don't fail
-            File = pd.read_csv(FullPath, delimiter = DelimiterDefault)
-        else:
-            #Validate the actual column headers
-            ActualColumnsAsList = File.columns.tolist()
-            LogEntries, Result, Issue = ValidateColumnHeader(ActualColumnsAsList, CallStack, FileDefinition, LogEntries, ParentExecutionGUID)
-            if(Result != Result_Success): raise Exception('Error in ValidateColumnHeader') #Log the error and don't continue
-
-        #Log the step
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
-
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return LogEntries, Result, File
-
-def RetrieveConfigurations_Column(CallStack, LogEntries, ParentExecutionGUID):
-    #Variable(s) defined outside of this function, but set within this function
-    global Configurations_Column_All
-
-    #Get all column level configurations for the specified ConfigurationFileID
-    Begin = datetime.now()
-    CurrentFunction = 'RetrieveConfigurations_Column'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Parameters = {
-        'ParentExecutionGUID': ParentExecutionGUID
-    }
-    Result = Result_Success
-    try:
-        ConfigurationFile = pd.DataFrame() #Initialize to an empty DataFrame
-        LogEntries, Result, ConfigurationFile = RetrieveOrCreateFile(CallStack, FileDefinition_Configuration_Column, FullPath_Configurations_Column, LogEntries, ParentExecutionGUID)
-        if(Result == Result_Success): Configurations_Column_All = ConfigurationFile
-
-        #Log the step
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath_Configurations_Column, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
-
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return LogEntries, Result
-
-def RetrieveConfigurations_File(CallStack, LogEntries, ParentExecutionGUID):
-    #Variable(s) defined outside of this function, but set within this function
-    global Configurations_File_All
-
-    #Get all file level configurations for the current source
-    Begin = datetime.now()
-    CurrentFunction = 'RetrieveConfigurations_File'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Parameters = {
-        'FullPath_Configurations_File': FullPath_Configurations_File
-        , 'ParentExecutionGUID': ParentExecutionGUID
-    }
-    Result = Result_Success
-    try:
-        ConfigurationFile = pd.DataFrame() #Initialize to an empty DataFrame
-        LogEntries, Result, ConfigurationFile = RetrieveOrCreateFile(CallStack, FileDefinition_Configuration_File, FullPath_Configurations_File, LogEntries, ParentExecutionGUID)
-        if(Result == Result_Success): Configurations_File_All = ConfigurationFile
-
-        #Log the step
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath_Configurations_File, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
-        
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return LogEntries, Result
-
-def SetGlobalVariables(Caller, CallStack, LogEntries, ParentExecutionGUID):
-    #Set the global variables
-    global CallingObject
-    global DelimiterDefault
-    global ExpectedDelimiter
-    global FullPath_Admin
-    global FullPath_Bronze
-    global FullPath_Bronze_Archive
-    global FullPath_Bronze_Error
-    global FullPath_Bronze_Inbound
-    global FullPath_Configurations_Column
-    global FullPath_Configurations_File
-    global FullPath_Gold
-    global FullPath_Gold_Dimensions
-    global FullPath_Gold_Error
-    global FullPath_Gold_Facts
-    global FullPath_Gold_Inbound
-    global FullPath_LogFile
-    global FullPath_Root
-    global FullPath_Silver
-    global FullPath_Silver_Dimension
-    global FullPath_Silver_Error
-    global FullPath_Silver_Facts
-    global FullPath_Silver_Inbound
-
-    Begin = datetime.now()
-    CurrentFunction = 'SetGlobalVariables'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Parameters = {
-        'ParentExecutionGUID': ParentExecutionGUID
-    }
-    Result = Result_Success
-    try:
-        CallingObject = Caller
-        DelimiterDefault = r'|'
-
-        #Set & validate folder paths
-        LogEntries, Result, FullPath_Root =             BuildFolderPath(CallStack, str(Path(__file__).parent.parent), '', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Admin =            BuildFolderPath(CallStack, FullPath_Root, 'Admin', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Bronze =           BuildFolderPath(CallStack, FullPath_Root, 'Bronze', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Bronze_Archive =   BuildFolderPath(CallStack, FullPath_Bronze, 'Archive', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Bronze_Error =     BuildFolderPath(CallStack, FullPath_Bronze, 'Error', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Bronze_Inbound =   BuildFolderPath(CallStack, FullPath_Bronze, 'Inbound', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Gold =             BuildFolderPath(CallStack, FullPath_Root, 'Gold', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Gold_Dimensions =  BuildFolderPath(CallStack, FullPath_Gold, 'Dimensions', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Gold_Error =       BuildFolderPath(CallStack, FullPath_Gold, 'Error', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Gold_Facts =       BuildFolderPath(CallStack, FullPath_Gold, 'Facts', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Gold_Inbound =     BuildFolderPath(CallStack, FullPath_Gold, 'Inbound', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Silver =           BuildFolderPath(CallStack, FullPath_Root, 'Silver', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Silver_Dimension = BuildFolderPath(CallStack, FullPath_Silver, 'Dimension', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Silver_Error =     BuildFolderPath(CallStack, FullPath_Silver, 'Error', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Silver_Facts =     BuildFolderPath(CallStack, FullPath_Silver, 'Facts', LogEntries, ParentExecutionGUID)
-        LogEntries, Result, FullPath_Silver_Inbound =   BuildFolderPath(CallStack, FullPath_Silver, 'Inbound', LogEntries, ParentExecutionGUID)
-
-        FullPath_Configurations_Column = os.path.join(FullPath_Admin, 'ConfigurationColumn.txt')
-        FullPath_Configurations_File = os.path.join(FullPath_Admin, 'ConfigurationFile.txt')
-        FullPath_LogFile = os.path.join(FullPath_Admin, 'Log.txt')
-
-        #Log the step
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
-
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return LogEntries, Result
-
-def ValidateColumnHeader(ActualColumnsAsList, CallStack, ExpectedColumnsAsList, LogEntries, ParentExecutionGUID):
-    Begin = datetime.now()
-    CurrentFunction = 'ValidateColumnHeader'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Issue = ''
-    Parameters = {
-        'ActualColumnsAsList': ActualColumnsAsList
-        , 'ExpectedColumnsAsList': ExpectedColumnsAsList
-        , 'ParentExecutionGUID': ParentExecutionGUID
-    }
-    Result = Result_Success
-    try:
-        #Determine extra columns in actual
-        ExtraColumns = [item for item in ActualColumnsAsList if item not in ExpectedColumnsAsList]
-
-        #Determine columns missing from actual
-        MissingColumns = [item for item in ExpectedColumnsAsList if item not in ActualColumnsAsList]
-        
-        #Report extra & missing columns
-        if(len(ExtraColumns) > 0):
-            Issue = 'ExtraColumns'
-            Result = 'Extra column(s) found: ' + str(ExtraColumns)
-            LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error & continue
-        if(len(MissingColumns) > 0):
-            if Issue != '': Issue = Issue + '.'
-            Issue += 'MissingColumns'
-            if(len(Result) > 0): Result += '; '
-            Result += 'Column(s) missing: ' + str(MissingColumns)
-            LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error & continue
-        if(len(ExtraColumns) + len(MissingColumns) == 0):
-            #Log the step
-            LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
-        
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return LogEntries, Result, Issue
-
-def ValidateLogFile(CallStack, LogEntries, ParentExecutionGUID):
-    #Variable(s) defined outside of this function, but set within this function
-    global IsValid_LogFile
-
-    Begin = datetime.now()
-    CurrentFunction = 'ValidateLogFile'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Issue = ''
-    Parameters = {
-        'ParentExecutionGUID': ParentExecutionGUID
-    }
-    Result = Result_Success
-    try:
-        IsValid_LogFile = False
-        LogFile = pd.DataFrame() #Initialize to an empty DataFrame
-        LogEntries, Result, LogFile = RetrieveOrCreateFile(CallStack, FileDefinition_Log, FullPath_LogFile, LogEntries, ParentExecutionGUID)
-        if(Result == Result_Success): IsValid_LogFile = True
-
-        #Log the step
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath_LogFile, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
-
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return LogEntries, Result
-
-def ValidateSilverDimension(CallStack, Dimension, LogEntries, ParentExecutionGUID):
-    #Variable(s) defined outside of this function, but set within this function
-
-    Begin = datetime.now()
-    CurrentFunction = 'ValidateSilverDimension'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
-    Parameters = {
-        'Dimension': Dimension
-        , 'ParentExecutionGUID': ParentExecutionGUID
-    }
-    Result = Result_Success
-    try:
-
-        #Build the full path to the Silver Dimension file
-        FullPath_Silver_Dimension = os.path.join(FullPath_Silver_Dimension, Dimension, '.txt')
-
-        #Validate the column headers
-        SilverDimension = pd.DataFrame() #Initialize to an empty DataFrame
-        LogEntries, Result, SilverDimension = RetrieveOrCreateFile(CallStack, FileDefinition_Log, FullPath_LogFile, LogEntries, ParentExecutionGUID)
-
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
-        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
-        print(Result) #Report the error
-
-    finally:
-        #Return the result
-        return LogEntries, Result, FullPath_Silver_Dimension, SilverDimension
-
-def WriteToLogFile(CallStack, LogEntries, ParentExecutionGUID):
-    #Variable(s) defined outside of this function, but set within this function
-    global FullPath_LogFile
-
-    #Don't log the results of this function
-    Begin = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f') #Format the value as YYYY-MM-DD HH:MM:SS.ms
-    CurrentFunction = 'WriteToLogFile'
-    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
-    Parameters = {
-        'DelimiterDefault': DelimiterDefault
-        , 'FullPath_Root': FullPath_Root
-        , 'ParentExecutionGUID': ParentExecutionGUID
-    }
-    try:
-        #Set the full path to the log file to /<Root>/Admin/Log.txt
-        FullPath_LogFile = os.path.join(FullPath_Root, 'Admin', 'Log.txt')
-        EntriesToLog = pd.DataFrame(LogEntries)
-        EntriesToLog = EntriesToLog.sort_values(by = 'Begin') #Explicitly order the entries by when they occurred, otherwise they'll be ordered by when they were logged, which means the first function called would be logged last
-        EntriesToLog.to_csv(FullPath_LogFile, sep = DelimiterDefault, header = False, index = False, mode = 'a') #Write the log entries to the log file
-    except Exception as e:
-        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, False, Parameters) #Build the error message
-        print(Result) #Report the error
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import ast
+import atexit
+import csv
+import functools
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+from collections import OrderedDict
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+#****************************************************************************************
+#GLOBAL VARIABLES
+#   Set these variables to either empty or hard-coded values
+#   These variables can change value by any function
+#****************************************************************************************
+BatchIDDatatype = 'int32' #The type of the BatchID column of every row; a row's batch is the file it came from, and the rest of its lineage is in the manifest (see JoinLineage)
+CallingObject = ''
+ChunkSizeDefault = 100000 #Number of rows read at a time from a staged file when its file level configuration doesn't specify a ChunkSize
+ColumnConfigurationFilename = ''
+Configurations_Column_All = None #A DataFrame once RetrieveConfigurations_Column has run
+Configurations_Compiled = {} #The compiled configuration of every source, keyed by Source; built by CompileConfigurations
+Configurations_Compiled_FileID = {} #The same compiled configurations, keyed by ConfigurationFileID
+Configurations_Compiled_Version = 5 #Change this whenever SourceConfiguration or ColumnConfiguration change, so that configurations compiled by an earlier version are compiled again
+Configurations_File_All = None #A DataFrame once RetrieveConfigurations_File has run
+CurrentScriptFile = os.path.realpath(__file__)
+DatatypeCategoryShareMax = 0.5 #A Text column is stored as a categorical when its distinct values are at most this share of its rows (and it has at least DatatypeCategoryRowsMin rows)
+DatatypeCategoryRowsMin = 100
+DatatypeDateFormatDefault = r'ISO8601' #How a Date or DateTime column is parsed when its Datatype doesn't give a format (Date:%m/%d/%Y); ISO8601 reads 2024-01-05 and 2024-01-05 13:45:00, and never guesses a day or month first order from the values
+DatatypeFamilies = { #Every Datatype of the column level configurations that ApplyDatatypes converts, by how it's converted; a column of any other Datatype stays text
+    'Currency': 'Decimal'
+    , 'Date': 'Date'
+    , 'DateTime': 'Date'
+    , 'Decimal': 'Decimal'
+    , 'Float': 'Decimal'
+    , 'Int': 'Integer'
+    , 'Integer': 'Integer'
+    , 'Money': 'Decimal'
+    , 'Number': 'Decimal'
+    , 'String': 'Text'
+    , 'Text': 'Text'
+}
+DateDimensionYearsBack = 5 #The Gold Date dimension covers at least 1 January this many years ago through 31 December of the current year, and any later or earlier date of a Silver fact row
+DelimiterDefault = r'|'
+DerivedKeyDimensions = {} #Whether every member of each Silver dimension has its derived key (see BuildSurrogateKeys), keyed by the full path of the file; worked out once per read of the dimension by RetrieveSurrogateKeys
+DimensionCache = OrderedDict() #Silver dimensions already read during the current run, keyed by the full path of the file, least recently used first
+DimensionCacheMaxBytes = 512 * 1024 * 1024 #Once the dimensions in DimensionCache use more memory than this, the least recently used ones are dropped
+ExpectedDelimiter = ''
+ExpressionCache = {} #Every formula already compiled by CompileExpression, keyed by the formula, so that each one is parsed and validated only once per process
+ExpressionFunctions = { #The only functions an Expression rule can call; each works on whole columns (Series) at once, never row by row
+    'Abs': lambda Value: abs(Value)
+    , 'Coalesce': lambda *Values: functools.reduce(lambda Result, Value: Result.where(Result.notna(), Value) if isinstance(Result, pd.Series) else (Value if pd.isna(Result) else Result), Values)
+    , 'Concat': lambda *Values: functools.reduce(lambda Result, Value: Result + Value, [ConvertExpressionToText(Value) for Value in Values])
+    , 'Contains': lambda Value, Text: ConvertExpressionToText(Value).str.contains(Text, regex = False)
+    , 'Date': lambda Value, Format = None: pd.to_datetime(Value, format = Format, errors = 'coerce')
+    , 'Day': lambda Value: pd.to_datetime(Value, errors = 'coerce').dt.day
+    , 'If': lambda Condition, Then, Else: pd.Series(np.where(Condition, Then, Else), index = Condition.index) if isinstance(Condition, pd.Series) else (Then if Condition else Else)
+    , 'IsIn': lambda Value, Values: Value.isin(Values) if isinstance(Value, pd.Series) else Value in Values
+    , 'IsNull': lambda Value: pd.isna(Value)
+    , 'Left': lambda Value, Length: ConvertExpressionToText(Value).str[:Length]
+    , 'Length': lambda Value: ConvertExpressionToText(Value).str.len()
+    , 'Lower': lambda Value: ConvertExpressionToText(Value).str.lower()
+    , 'Month': lambda Value: pd.to_datetime(Value, errors = 'coerce').dt.month
+    , 'Number': lambda Value: pd.to_numeric(Value, errors = 'coerce')
+    , 'Replace': lambda Value, Old, New: ConvertExpressionToText(Value).str.replace(Old, New, regex = False)
+    , 'Right': lambda Value, Length: ConvertExpressionToText(Value).str[-Length:]
+    , 'Round': lambda Value, Digits = 0: np.round(Value, Digits)
+    , 'Strip': lambda Value: ConvertExpressionToText(Value).str.strip()
+    , 'Text': lambda Value: ConvertExpressionToText(Value)
+    , 'Upper': lambda Value: ConvertExpressionToText(Value).str.upper()
+    , 'Year': lambda Value: pd.to_datetime(Value, errors = 'coerce').dt.year
+}
+ExpressionColumnFunctions = {'Contains', 'Day', 'Left', 'Length', 'Lower', 'Month', 'Replace', 'Right', 'Strip', 'Upper', 'Year'} #The Expression functions whose first argument has to be a column (they use .str or .dt); a single value given to one is repeated for every row, see BroadcastExpressionArgument
+ExpressionNodes = { #The only parts of Python allowed in an Expression rule, besides those ExpressionCompiler rewrites (and, or, not, in, not in, x if Condition else y), column references and names
+    'Add', 'BinOp', 'BitAnd', 'BitOr', 'Call', 'Compare', 'Constant', 'Div', 'Eq', 'Expression', 'FloorDiv', 'Gt', 'GtE', 'Invert', 'keyword', 'List', 'Load', 'Lt', 'LtE', 'Mod', 'Mult', 'NotEq', 'Pow', 'Sub', 'Tuple', 'UAdd', 'UnaryOp', 'USub'
+}
+FactPartitions = None #The partition manifest of the Silver Transaction fact, keyed by (Source, Partition), once RetrieveFactPartitions has run; kept up to date by AppendToSilverFact
+FactPartitionsChanged = set() #The (Source, Partition) of every partition appended to since the partition manifest was last written; CommitRun writes the manifest once per run, if any
+FiscalYearStartMonth = 1 #The month the fiscal year starts in; a fiscal year is named after the calendar year it ends in
+FingerprintPartitions = OrderedDict() #Row fingerprints of the partitions already read during the current run, keyed by the full path of the partition file, least recently used first
+FingerprintPartitionsMax = 36 #Once more partitions than this are held in FingerprintPartitions, the least recently used ones are dropped; at one partition per month, this covers 3 years of overlapping exports
+FileDefinition_Configuration_BrandCategoryProductServiceSeller = [ #The bridge from a source value of an account to the Brand, Category, ProductService and Seller it stands for
+    'AccountGUID'
+    , 'BrandGUID'
+    , 'CategoryGUID'
+    , 'DateTimeInserted'
+    , 'ProductServiceGUID'
+    , 'SellerGUID'
+    , 'SourceValue'
+]
+FileDefinition_Configuration_Column = [
+    'ColumnName_Bronze'
+    , 'ColumnName_File'
+    , 'ColumnName_Silver'
+    , 'ColumnName_Gold'
+    , 'ConfigurationColumnOrder'
+    , 'ConfigurationFileID'
+    , 'Datatype'
+    , 'IsNaturalKey'
+    , 'Transformation_BronzeToSilver' #For an Expression rule, the formula that calculates the column (see CompileExpression)
+    , 'Transformation_BronzeToSilver_Type' #Direct, Expression, Lookup or Map (the column whose values are mapped through BrandCategoryProductServiceSeller); a blank type with a formula is an Expression
+    , 'Transformation_FileToBronze'
+]
+FileDefinition_Configuration_Holiday = [ #The local holiday table of the Gold Date dimension: one row per holiday
+    'Date'
+    , 'Name'
+]
+FileDefinition_Configuration_File = [
+    'Account'
+    , 'ChunkSize'
+    , 'ConfigurationFileID'
+    , 'DefaultCategory'
+    , 'Delimiter'
+    , 'Source'
+    , 'TextQualifier'
+]
+FileDefinition_Manifest = [
+    'BatchID'
+    , 'ContentHash'
+    , 'DateTimeInserted'
+    , 'ExecutionGUID'
+    , 'FileName'
+    , 'Size'
+    , 'Source'
+]
+FileDefinition_Configuration_ToMap = [ #Source values not mapped yet; once Brand, Category, ProductService and Seller are filled in by name, the next run moves the row to BrandCategoryProductServiceSeller
+    'AccountGUID'
+    , 'Brand'
+    , 'Category'
+    , 'DateTimeInserted'
+    , 'ProductService'
+    , 'Seller'
+    , 'SourceValue'
+]
+FileDefinition_FactPartition = [ #One partition of the Silver Transaction fact: its rows, their dates and their BatchIDs, so that a reader can tell whether to open it without opening it
+    'BatchIDMax'
+    , 'BatchIDMin'
+    , 'DateMax'
+    , 'DateMin'
+    , 'Partition'
+    , 'RowCount'
+    , 'Source'
+]
+FileDefinition_Journal = [ #One file operation of a run's commit: Replace a target with the complete new file already written next to it, or Move a file
+    'Action'
+    , 'Source'
+    , 'Target'
+]
+FileDefinition_Watermark = [ #How far each Gold table has been brought up to date: the highest BatchID of the Silver rows already applied to it
+    'BatchID'
+    , 'DateTimeUpdated'
+    , 'Table'
+]
+FileDefinition_Log = [
+    'ExecutionGUID'
+    , 'ParentExecutionGUID'
+    , 'Begin'
+    , 'End'
+    , 'Severity'
+    , 'Caller'
+    , 'CallStack'
+    , 'Action'
+    , 'RowCount'
+    , 'Source'
+    , 'Target'
+    , 'Result'
+    , 'File'
+    , 'Parameters'
+]
+FolderLayout = { #Every folder of the medallion layout relative to /<Root>/, keyed by the global variable that holds its full path
+    'FullPath_Admin': 'Admin'
+    , 'FullPath_Bronze': 'Bronze'
+    , 'FullPath_Bronze_Archive': os.path.join('Bronze', 'Archive')
+    , 'FullPath_Bronze_Error': os.path.join('Bronze', 'Error')
+    , 'FullPath_Bronze_Inbound': os.path.join('Bronze', 'Inbound')
+    , 'FullPath_Gold': 'Gold'
+    , 'FullPath_Gold_Dimensions': os.path.join('Gold', 'Dimensions')
+    , 'FullPath_Gold_Error': os.path.join('Gold', 'Error')
+    , 'FullPath_Gold_Facts': os.path.join('Gold', 'Facts')
+    , 'FullPath_Gold_Inbound': os.path.join('Gold', 'Inbound')
+    , 'FullPath_Silver': 'Silver'
+    , 'FullPath_Silver_Dimension': os.path.join('Silver', 'Dimension')
+    , 'FullPath_Silver_Error': os.path.join('Silver', 'Error')
+    , 'FullPath_Silver_Facts': os.path.join('Silver', 'Facts')
+    , 'FullPath_Silver_Fingerprint': os.path.join('Silver', 'Fingerprint')
+    , 'FullPath_Silver_Inbound': os.path.join('Silver', 'Inbound')
+}
+FullPath_Admin = ''
+FullPath_Bronze = ''
+FullPath_Bronze_Archive = ''
+FullPath_Bronze_Error = ''
+FullPath_Bronze_Inbound = ''
+FullPath_Configurations_BrandCategoryProductServiceSeller = ''
+FullPath_Configurations_Compiled = ''
+FullPath_Configurations_File = ''
+FullPath_Configurations_Holiday = ''
+FullPath_Configurations_Column = ''
+FullPath_Configurations_ToMap = ''
+FullPath_Gold = ''
+FullPath_Gold_Dimensions = ''
+FullPath_Gold_Dimension_Date = ''
+FullPath_Gold_Error = ''
+FullPath_Gold_Facts = ''
+FullPath_Gold_Inbound = ''
+FullPath_Journal_Committed = '' #The journal of a commit that has to be finished; while it exists, every file operation in it is replayed on the next BeginRun
+FullPath_Journal_Prepared = '' #The journal of a commit that never reached its commit point; while it exists, every staged file in it is deleted on the next BeginRun
+FullPath_LogDatabase = ''
+FullPath_LogFile = ''
+FullPath_Manifest = ''
+FullPath_Root = ''
+FullPath_Silver = ''
+FullPath_Silver_Dimension = ''
+FullPath_Silver_Error = ''
+FullPath_Silver_Facts = ''
+FullPath_Silver_Fact_Transaction = '' #The folder of the Silver Transaction fact: one table per source and month of transaction date, in /<Source>/<YYYY-MM>, and the partition manifest, Partitions.txt
+FullPath_Silver_Fact_Transaction_Partitions = ''
+FullPath_Silver_Fingerprint = ''
+FullPath_Silver_Inbound = ''
+FullPath_Watermark = ''
+Gold_Aggregate_Grain = ['AccountID', 'CategoryID', 'SellerID'] #Along with its period, the grain of every Gold aggregate; the keys are the Silver keys as ConvertSurrogateKeyToID IDs
+Gold_Aggregate_Measures = ['Amount', 'TransactionCount'] #Both add up, so the rows of a Silver delta can be added to an aggregate without going back to the Silver rows already in it
+Gold_Aggregates = { #Each Gold aggregate of the Silver Transaction fact, and the period of its grain
+    'SpendByDay': 'Date'
+    , 'SpendByMonth': 'Month'
+}
+Gold_Dimension_Definition_Date = [
+    'Date'
+    , 'DateKey' #YYYYMMDD
+    , 'DayName'
+    , 'DayOfMonth'
+    , 'DayOfWeek' #1 (Monday) to 7 (Sunday)
+    , 'DayOfYear'
+    , 'FiscalMonth'
+    , 'FiscalQuarter'
+    , 'FiscalYear'
+    , 'HolidayName'
+    , 'ISOWeek'
+    , 'ISOYear'
+    , 'IsHoliday'
+    , 'IsWeekend'
+    , 'Month'
+    , 'MonthKey' #YYYYMM
+    , 'MonthName'
+    , 'Quarter'
+    , 'QuarterKey' #YYYYQ
+    , 'Year'
+]
+IsValid_LogFile = False
+LogBackend = r'Text' #Where log entries are written: Text (/<Root>/Admin/Log.txt) or SQLite (/<Root>/Admin/Log.db, indexed for fast queries with QueryLog.py)
+LogBufferCapacity = 1000 #Number of log entries held in memory before they're written to the log file
+LogFileMaxBytes = 100 * 1024 * 1024 #Once the log file is larger than this, it's renamed with a timestamp and a new one is started
+LogFlushIntervalSeconds = 5 #Log entries are also written to the log file at least this often, so that a crash loses at most this many seconds of entries
+LogRecord = namedtuple('LogRecord', FileDefinition_Log) #One log entry; a tuple with named fields takes a fraction of the memory of a dict
+ColumnConfiguration = namedtuple('ColumnConfiguration', FileDefinition_Configuration_Column) #One row of the column level configurations
+SourceConfiguration = namedtuple('SourceConfiguration', [
+    'Account'
+    , 'ChunkSize' #Number of rows transformed at a time; already defaulted to ChunkSizeDefault if not configured
+    , 'ColumnHeader' #The expected column header of the source's files, as a tuple
+    , 'Columns' #The column level configurations of the source, as a tuple of ColumnConfiguration
+    , 'ConfigurationFileID'
+    , 'Datatypes' #The Datatype of each column, keyed by ColumnName_File
+    , 'DefaultCategory'
+    , 'Delimiter' #Already defaulted to DelimiterDefault if not configured
+    , 'Expressions' #The Expression rules of the source, in configuration order, as a tuple of (ColumnName_Bronze, formula); each formula has already been validated by CompileExpression
+    , 'FactColumns' #The columns that go to the Silver Transaction fact, as a tuple of (ColumnName_Silver, column of the Bronze data); the keys of each row are added by BuildSilverFact
+    , 'MappingColumn' #The column whose values are resolved to a Brand, Category, ProductService and Seller through BrandCategoryProductServiceSeller (Transformation_BronzeToSilver_Type Map), if any
+    , 'NaturalKeyColumns' #The columns that together identify a row; every column if none is flagged IsNaturalKey
+    , 'NaturalKeyDateColumn' #The natural key column holding the transaction date, if any
+    , 'NaturalKeyDateFormat' #The format NaturalKeyDateColumn is parsed with (see SplitDatatype)
+    , 'Source'
+    , 'TextQualifier' #Already defaulted to " if not configured
+])
+Manifest = {} #Every file already ingested into Silver, keyed by (Source, Size, ContentHash)
+ManifestBatchIDLast = 0 #The highest BatchID given to a file so far, whether or not the file finished loading
+ManifestSizes = set() #Every (Source, Size) in Manifest, so that only files with the same size as an already ingested file need to be hashed
+MappingColumns = ['BrandGUID', 'CategoryGUID', 'ProductServiceGUID', 'SellerGUID'] #What a source value resolves to
+MappingDimensions = ['Brand', 'Category', 'ProductService', 'Seller']
+MappingKeyColumns = ['AccountGUID', 'SourceValue']
+Mappings = None #The BrandCategoryProductServiceSeller file, one row per key, once RetrieveMappings has run
+MappingsIndex = None #The hashed key of each row of Mappings, in the same order, so that a whole chunk is resolved with one hash table lookup
+MappingsPending = [] #Mappings added during the run, not yet written to the file; written once by FlushMappings
+MappingsValues = {} #Each of MappingColumns as an array with a trailing missing value, so that the position -1 of a key not found resolves to missing
+NaturalKeyFlags = ('1', '1.0', 'TRUE', 'Y', 'YES') #The values of IsNaturalKey that flag a column; a column of 1s and blanks is read as 1.0 and NaN
+NaturalKeyIndexes = {} #Hashed natural keys of each Silver dimension (or other file appended to by natural key), keyed by the full path of the file; built once per run and added to on every append
+PerformanceTopN = 10 #Number of the slowest call-stack paths (and, with cProfile on, functions) shown in the performance report
+Profiler = None #A cProfile.Profile while StartProfiling(cProfile = True) is in effect
+Result_Success = r'Success'
+RunTransaction = None #The writes and file moves of the open run, staged until CommitRun makes them all at once; None when no run is open (see BeginRun)
+RunTransactionLock = threading.Lock() #Bronze stages file moves from several workers at once
+RootFolder = '' #The root of the medallion layout; if empty, the folder holding /Admin/ (set it to run against another copy of the layout, as Benchmark.py does)
+Severity_Error = r'Error'
+Severity_Info = r'Info'
+Severity_Warning = r'Warning' #Something was wrong with some of the data, but the step went on without it
+StepMetrics = {} #Calls, wall time, CPU time, rows in & out and peak memory of every step of the current run, keyed by (CallStack, Source); see LogStep and MeasureStep
+StepMetricsLock = threading.Lock()
+StepMetricsThread = threading.local() #Per thread, the peak traced memory of each MeasureStep in progress, outermost first
+StorageFormat = r'Text' #How Silver and Gold tables are stored: Text (pipe-delimited), Parquet or Feather; configuration files and the log file are always Text
+StorageFormats = {
+    'Feather': '.feather'
+    , 'Parquet': '.parquet'
+    , 'Text': '.txt'
+}
+Silver_Dimension_Definition_Account = [
+    'AccountGUID'
+    , 'DateTimeInserted'
+    , 'Name'
+]
+Silver_Dimension_Definition_AccountType = [
+    'AccountTypeGUID'
+    , 'DateTimeInserted'
+    , 'Name'
+]
+Silver_Dimension_Definition_Brand = [
+    'BrandGUID'
+    , 'DateTimeInserted'
+    , 'Name'
+]
+Silver_Dimension_Definition_Category = [
+    'CategoryGUID'
+    , 'DateTimeInserted'
+    , 'Name'
+    , 'ParentCategoryGUID'
+]
+Silver_Dimension_Definition_PriceType = [
+    'DateTimeInserted'
+    , 'Name'
+    , 'PriceTypeGUID'
+]
+Silver_Dimension_Definition_ProductService = [
+    'DateTimeInserted'
+    , 'Name'
+    , 'ProductServiceGUID'
+]
+Silver_Dimension_Definition_Seller = [
+    'DateTimeInserted'
+    , 'Name'
+    , 'SellerGUID'
+]
+Silver_Dimension_Definition_UnitOfMeasurement = [
+    'Abbreviation'
+    , 'DateTimeInserted'
+    , 'Name'
+    , 'UnitOfMeasurementGUID'
+]
+Silver_Dimensions = [
+    'Account'
+    , 'AccountType'
+    , 'Brand'
+    , 'Category'
+    , 'PriceType'
+    , 'ProductService'
+    , 'Seller'
+    , 'UnitOfMeasurement'
+]
+Silver_Fact_Definition_Transaction = [
+    'AccountGUID'
+    , 'Amount'
+    , 'BatchID'
+    , 'BrandGUID'
+    , 'CategoryGUID'
+    , 'Date'
+    , 'ProductServiceGUID'
+    , 'SellerGUID'
+]
+SurrogateKeyMode = r'Derived' #How the key of a new Silver dimension member is made: Derived (a UUIDv5 of the dimension and the member's natural key, so that any row can work out the key of its member without a lookup) or Random (a UUIDv4, which rows have to look up by Name)
+SurrogateKeyNamespace = uuid.UUID('f1a7b8e5-a350-44bb-82ed-8b6d6b8f4d95') #The namespace of every derived key; never change it, or every derived key changes with it
+ToMap = None #The ToMap file, once RetrieveMappings has run, without the rows it moved to Mappings
+ToMapChanged = False #Whether rows were moved from ToMap to Mappings during the run, so that FlushMappings has to write ToMap again rather than just append to it
+ToMapIndex = None #The hashed key of every source value in ToMap or ToMapPending, so that each is added only once
+ToMapPending = [] #Source values found during the run that aren't mapped yet, not yet written to the file; written once by FlushMappings
+
+#****************************************************************************************
+#CLASSES
+#****************************************************************************************
+class LazyModule:
+    #Stands in for a module that is slow to import; the module is only imported the first time anything in it is used, so that code paths that never use it never pay for importing it
+    def __init__(self, Name):
+        self.Module = None
+        self.Name = Name
+
+    def __getattr__(self, Attribute):
+        if(self.Module is None): self.Module = importlib.import_module(self.Name)
+        return getattr(self.Module, Attribute)
+
+pd = LazyModule('pandas') #Importing pandas takes about half a second, which lightweight commands (see Pipeline.py) shouldn't pay for
+cProfile = LazyModule('cProfile') #Only needed when profiling is switched on
+np = LazyModule('numpy')
+pstats = LazyModule('pstats')
+
+class LogSink:
+    #Collects log entries like a list does, but writes them to the log file in batches as the run goes instead of holding every entry of the run in memory until the end
+    #Can be shared by several threads
+    def __init__(self, Capacity = None, FlushIntervalSeconds = None):
+        self.Buffer = []
+        self.Capacity = Capacity if Capacity is not None else LogBufferCapacity
+        self.FlushIntervalSeconds = FlushIntervalSeconds if FlushIntervalSeconds is not None else LogFlushIntervalSeconds
+        self.Lock = threading.RLock()
+        self.Stopped = threading.Event()
+        self.Thread = None
+
+    def __iter__(self):
+        with self.Lock: return iter(list(self.Buffer))
+
+    def __len__(self):
+        return len(self.Buffer)
+
+    def append(self, Entry):
+        with self.Lock:
+            self.Buffer.append(Entry)
+            if(self.Thread is None): self.Start()
+            if(len(self.Buffer) >= self.Capacity): self.Flush()
+
+    def extend(self, Entries):
+        for Entry in Entries: self.append(Entry)
+
+    def Close(self):
+        #Stop the background flush and write whatever is left
+        self.Stopped.set()
+        self.Flush()
+
+    def Flush(self):
+        #Write the buffered entries to the log file, ordered by when they began
+        #The order only holds within a batch: a step is logged when it ends, so a long step (e.g. Main) lands in a later batch than the steps it called; anything reading the log must order it by Begin itself
+        with self.Lock:
+            if(len(self.Buffer) == 0): return
+            if not IsValid_LogFile or (FullPath_LogFile == ''):
+                del self.Buffer[:-self.Capacity] #Keep only the newest entries until the log file has been validated, so that a log file that never validates can't fill the memory
+                return
+            Entries = sorted(self.Buffer, key = lambda Entry: Entry.Begin) #Explicitly order the entries by when they occurred, otherwise they'll be ordered by when they were logged, which means the first function called would be logged last
+            if(LogBackend == 'SQLite'):
+                LogDatabase = ConnectLogDatabase()
+                with LogDatabase: LogDatabase.executemany(f'INSERT INTO Log VALUES ({", ".join("?" * len(FileDefinition_Log))})', [[str(Value) if isinstance(Value, dict) else Value for Value in Entry] for Entry in Entries])
+                LogDatabase.close()
+            else:
+                RotateLogFile()
+                with open(FullPath_LogFile, 'a', newline = '') as f: csv.writer(f, delimiter = DelimiterDefault, lineterminator = os.linesep).writerows(Entries)
+            self.Buffer = []
+
+    def FlushPeriodically(self):
+        while not self.Stopped.wait(self.FlushIntervalSeconds):
+            try: self.Flush()
+            except Exception as e: print(BuildErrorMessage('FlushPeriodically', CurrentScriptFile, e, False)) #Report the error, but keep the entries and try again next time
+
+    def Start(self):
+        #Start writing in the background on the first entry, and make sure nothing is lost if the script ends without writing the log file
+        self.Thread = threading.Thread(target = self.FlushPeriodically, daemon = True)
+        self.Thread.start()
+        atexit.register(self.Close)
+
+class ExpressionCompiler(ast.NodeTransformer):
+    #Validates a formula against the whitelist (ExpressionNodes, ExpressionFunctions, row['Column'] and IngestDatetime, and nothing else: no attributes, no other names), and rewrites the parts of Python that only work on single values into ones that work on whole columns:
+    #and/or/not become &/|/~, a < b < c becomes (a < b) & (b < c), x in [...] becomes IsIn(x, [...]), and a if Condition else b becomes If(Condition, a, b)
+    def __init__(self):
+        self.Columns = set() #Every column the formula reads
+
+    def generic_visit(self, Node):
+        if(type(Node).__name__ not in ExpressionNodes): raise ValueError(f'{type(Node).__name__} is not allowed in an expression')
+        return super().generic_visit(Node)
+
+    def visit_BoolOp(self, Node):
+        Values = [self.visit(Value) for Value in Node.values]
+        Operator = ast.BitAnd() if isinstance(Node.op, ast.And) else ast.BitOr()
+        Combined = Values[0]
+        for Value in Values[1:]: Combined = ast.BinOp(left = Combined, op = Operator, right = Value)
+        return Combined
+
+    def visit_Call(self, Node):
+        if not isinstance(Node.func, ast.Name) or (Node.func.id not in ExpressionFunctions): raise ValueError(f'Only these functions can be called in an expression: {", ".join(sorted(ExpressionFunctions))}')
+        if any(isinstance(Argument, ast.Starred) for Argument in Node.args): raise ValueError('* is not allowed in an expression')
+        return self.generic_visit(Node)
+
+    def visit_Compare(self, Node):
+        Left = self.visit(Node.left)
+        Comparisons = []
+        for Operator, Right in zip(Node.ops, Node.comparators):
+            Right = self.visit(Right)
+            if isinstance(Operator, (ast.In, ast.NotIn)):
+                Comparison = ast.Call(func = ast.Name(id = 'IsIn', ctx = ast.Load()), args = [Left, Right], keywords = [])
+                if isinstance(Operator, ast.NotIn): Comparison = ast.UnaryOp(op = ast.Invert(), operand = Comparison)
+            else:
+                if(type(Operator).__name__ not in ExpressionNodes): raise ValueError(f'{type(Operator).__name__} is not allowed in an expression')
+                Comparison = ast.Compare(left = Left, ops = [Operator], comparators = [Right])
+            Comparisons.append(Comparison)
+            Left = Right
+        Combined = Comparisons[0]
+        for Comparison in Comparisons[1:]: Combined = ast.BinOp(left = Combined, op = ast.BitAnd(), right = Comparison)
+        return Combined
+
+    def visit_IfExp(self, Node):
+        return ast.Call(func = ast.Name(id = 'If', ctx = ast.Load()), args = [self.visit(Node.test), self.visit(Node.body), self.visit(Node.orelse)], keywords = [])
+
+    def visit_Name(self, Node):
+        if(Node.id not in ExpressionFunctions) and (Node.id not in ('IngestDatetime', 'row')): raise ValueError(f'Unknown name "{Node.id}"; refer to a column as row[\'Column\']')
+        return Node
+
+    def visit_Subscript(self, Node):
+        if not (isinstance(Node.value, ast.Name) and (Node.value.id == 'row') and isinstance(Node.slice, ast.Constant) and isinstance(Node.slice.value, str)): raise ValueError("Only a column, as row['Column'], can be subscripted in an expression")
+        self.Columns.add(Node.slice.value)
+        return Node
+
+    def visit_UnaryOp(self, Node):
+        if isinstance(Node.op, ast.Not): return ast.UnaryOp(op = ast.Invert(), operand = self.visit(Node.operand))
+        return self.generic_visit(Node)
+
+class MeasureStep:
+    #Measures one step of the hot path into StepMetrics: wall time, CPU time of the thread, rows in & out, and the peak traced memory if StartProfiling(TraceMemory = True) is in effect
+    #Set RowsOut (or RowsIn) on it before the block ends, e.g. with MeasureStep(CallStack, Source, RowsIn = len(Data)) as Step: ...; Step.RowsOut = len(Data)
+    def __init__(self, CallStack, Source = '', RowsIn = 0):
+        self.CallStack = CallStack
+        self.RowsIn = RowsIn
+        self.RowsOut = 0
+        self.Source = Source
+
+    def __enter__(self):
+        if tracemalloc.is_tracing():
+            Peaks = StepMetricsThread.__dict__.setdefault('Peaks', [])
+            if(len(Peaks) > 0): Peaks[-1] = max(Peaks[-1], tracemalloc.get_traced_memory()[1]) #Keep the peak of the enclosing step so far, since the peak is about to be reset
+            Peaks.append(0)
+            tracemalloc.reset_peak()
+        self.CPUBegin = time.thread_time()
+        self.WallBegin = time.perf_counter()
+        return self
+
+    def __exit__(self, *ExceptionInfo):
+        Seconds = time.perf_counter() - self.WallBegin
+        CPUSeconds = time.thread_time() - self.CPUBegin
+        PeakMemoryBytes = None
+        Peaks = getattr(StepMetricsThread, 'Peaks', [])
+        if tracemalloc.is_tracing() and (len(Peaks) > 0):
+            PeakMemoryBytes = max(Peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if(len(Peaks) > 0): Peaks[-1] = max(Peaks[-1], PeakMemoryBytes) #The enclosing step peaked at least as high
+            tracemalloc.reset_peak()
+        RecordStepMetrics(self.CallStack, self.Source, Seconds, CPUSeconds, self.RowsIn, self.RowsOut, PeakMemoryBytes)
+        return False #Don't swallow an exception raised by the step
+
+#****************************************************************************************
+#FUNCTIONS
+#****************************************************************************************
+def AddToManifest(FullPath, Source, ExecutionGUID, ContentHash = '', BatchID = None):
+    #Don't log this function
+    #Record a file as ingested, both in memory and in the manifest file, so that an identical file is skipped from now on
+    #The manifest is also the batch table of the Silver rows: each row carries only the BatchID of its file, and JoinLineage joins the rest back on demand
+    if(ContentHash == ''): ContentHash = HashFile(FullPath)
+    if(BatchID is None): BatchID = AllocateBatchID()
+    Entry = {
+        'BatchID': BatchID
+        , 'ContentHash': ContentHash
+        , 'DateTimeInserted': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+        , 'ExecutionGUID': ExecutionGUID
+        , 'FileName': os.path.basename(FullPath)
+        , 'Size': os.path.getsize(FullPath)
+        , 'Source': Source
+    }
+    WriteTextFile(FullPath_Manifest, pd.DataFrame([Entry], columns = FileDefinition_Manifest)) #Within an open run, written only when the run commits, along with the file's rows
+    Manifest[(Source, Entry['Size'], ContentHash)] = Entry
+    ManifestSizes.add((Source, Entry['Size']))
+
+def AllocateBatchID():
+    #Don't log this function
+    #Give a file the next BatchID before any of its rows are loaded; a file that then fails leaves a gap within the run, and since none of its rows are committed (see RollbackToSavepoint), its BatchID is free for a later run
+    global ManifestBatchIDLast
+    ManifestBatchIDLast += 1
+    return ManifestBatchIDLast
+
+def AppendToCachedFile(FullPath, Data):
+    #Don't log this function
+    #Keep the cached copy of a file in step with rows the pipeline just appended to it, so that the file doesn't need to be read again
+    if(FullPath not in DimensionCache) or (Data.empty): return
+    CachedFile = DimensionCache[FullPath]
+    if not set(CachedFile['Data'].columns).issubset(Data.columns):
+        DimensionCache.pop(FullPath) #The appended rows don't line up with the cached columns, so let the next retrieval read the file again
+        return
+    CachedFile['Data'] = pd.concat([CachedFile['Data'], Data[CachedFile['Data'].columns]], ignore_index = True)
+    CachedFile['Bytes'] = int(CachedFile['Data'].memory_usage(deep = True).sum())
+    FileStatus = os.stat(BuildTablePath(FullPath))
+    CachedFile['ModifiedTime'] = FileStatus.st_mtime_ns #The file was just changed by the pipeline itself, which the cached copy already reflects
+    CachedFile['Size'] = FileStatus.st_size
+    EvictCachedFiles()
+
+def AppendToNaturalKeyIndex(FullPath, Data, NaturalKeyColumns):
+    #Don't log this function
+    #Add the natural keys of rows just appended to a file to that file's index, so that the index doesn't need to be rebuilt from the file
+    if(FullPath not in NaturalKeyIndexes) or (Data.empty): return
+    NewKeys = HashNaturalKey(Data, NaturalKeyColumns)
+    NewKeys = NewKeys[NaturalKeyIndexes[FullPath].get_indexer(NewKeys) < 0].drop_duplicates() #Keep the index unique so that it can be searched by its hash table
+    NaturalKeyIndexes[FullPath] = NaturalKeyIndexes[FullPath].append(NewKeys)
+
+def AppendToSilverFact(Data, Source):
+    #Don't log this function
+    #Append Silver Transaction fact rows (see BuildSilverFact) of a source to the partitions of their months, and bring the partition manifest up to date with them in memory; within an open run, the manifest is written once, by CommitRun
+    Partitions = pd.to_datetime(Data['Date'], errors = 'coerce')
+    for Partition, PartitionData in Data.groupby(Partitions.dt.strftime('%Y-%m').fillna('Undated'), sort = False):
+        FullPath = BuildFactPartitionPath(Source, Partition)
+        os.makedirs(os.path.dirname(FullPath), exist_ok = True)
+        WriteTable(FullPath, PartitionData, Append = True)
+
+        #A partition's dates and BatchIDs only ever widen, so the new rows are folded into what the manifest already has
+        Dates = Partitions[PartitionData.index]
+        Entry = RetrieveFactPartitions().setdefault((Source, Partition), {'BatchIDMax': None, 'BatchIDMin': None, 'DateMax': None, 'DateMin': None, 'Partition': Partition, 'RowCount': 0, 'Source': Source})
+        for Column, Value, Function in [('BatchIDMax', PartitionData['BatchID'].max(), max), ('BatchIDMin', PartitionData['BatchID'].min(), min), ('DateMax', Dates.max(), max), ('DateMin', Dates.min(), min)]:
+            if pd.notna(Value): Entry[Column] = Value if Entry[Column] is None else Function(Entry[Column], Value)
+        Entry['RowCount'] += len(PartitionData)
+        FactPartitionsChanged.add((Source, Partition))
+    if(RunTransaction is None): WriteFactPartitions()
+
+def ApplyDatatypes(Data, Datatypes):
+    #Don't log this function
+    #Convert each column read as text to the compact type of its configured Datatype (SourceConfiguration.Datatypes), a whole column at a time:
+    #Date to datetime64 in the format of its Datatype (see SplitDatatype), Decimal to float64, Integer to the smallest integer type that holds every value (ignoring currency symbols, thousands separators and spaces), and Text with few distinct values to a categorical
+    #A value that can't be converted becomes missing rather than failing the file; return the data along with how many values of each column were made missing that way, for the caller to log
+    Coerced = {}
+    for Column, Datatype in Datatypes.items():
+        if(Column not in Data.columns): continue
+        Name, Format = SplitDatatype(Datatype)
+        Family = DatatypeFamilies.get(Name)
+        Values = Data[Column]
+        if(Family == 'Date'): Data[Column] = pd.to_datetime(Values, format = Format, errors = 'coerce') #The same format for every chunk of every file, rather than one pandas guesses from the first value of each chunk
+        elif(Family in ('Decimal', 'Integer')):
+            if not pd.api.types.is_numeric_dtype(Values): Values = Values.str.replace(r'[\s,$£€]', '', regex = True)
+            Data[Column] = pd.to_numeric(Values, errors = 'coerce', downcast = 'integer' if Family == 'Integer' else None) #Decimals stay float64, as float32 would round amounts; integers are only downcast when every value fits
+        elif(Family == 'Text') and (len(Values) >= DatatypeCategoryRowsMin) and (Values.nunique() <= len(Values) * DatatypeCategoryShareMax): Data[Column] = Values.astype('category')
+        if(Family in ('Date', 'Decimal', 'Integer')):
+            Count = int((Values.notna() & Data[Column].isna()).sum())
+            if(Count > 0): Coerced[Column] = Count
+    return Data, Coerced
+
+def ApplyExpressions(Data, Expressions, IngestDatetime = ''):
+    #Don't log this function
+    #Calculate the columns of the Expression rules of a source (SourceConfiguration.Expressions) over all of Data at once, in configuration order, so that a rule can use a column calculated by an earlier one
+    if(IngestDatetime == ''): IngestDatetime = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+    for Column, Formula in Expressions: Data[Column] = EvaluateExpression(Formula, Data, IngestDatetime)
+    return Data
+
+def ApplyJournal(Operations):
+    #Don't log this function
+    #Replace each target with its new file, and move each file, skipping whatever a crashed attempt had already done, so that a journal can be applied any number of times
+    for Action, Source, Target in Operations:
+        if not os.path.exists(Source): continue #Already done
+        if(Action == 'Move'): os.makedirs(os.path.dirname(Target), exist_ok = True)
+        os.replace(Source, Target)
+
+def BeginRun(CallStack, LogEntries, ParentExecutionGUID):
+    #Variable(s) defined outside of this function, but set within this function
+    global FactPartitions
+    global RunTransaction
+
+    #Finish or undo whatever commit a crashed run left behind, then open a run: from now on, appends to tables and Text files and file moves are staged until CommitRun
+    Begin = datetime.now()
+    CurrentFunction = 'BeginRun'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        Action, Operations = RecoverRun()
+        RunTransaction = {'Moves': [], 'Writes': OrderedDict()}
+        FactPartitions = None #Read the partition manifest as committed, rather than as a run that didn't commit left it in memory
+        FactPartitionsChanged.clear()
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, Action = Action, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = Operations, Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def BroadcastExpressionArgument(Function, Index):
+    #Don't log this function
+    #Let an Expression function that works on a column be given a single value instead, such as a constant or IngestDatetime, by repeating the value for every row of the data (Index)
+    return lambda Value, *Arguments: Function(Value if isinstance(Value, pd.Series) else pd.Series(Value, index = Index), *Arguments)
+
+def BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, LogError, Parameters = ''):
+    ErrorMessage = f'Error in {CurrentScriptFile} > {CurrentFunction}() on line {str(e.__traceback__.tb_lineno)}: {str(e)}'
+    if not LogError: ErrorMessage = f'Error in {CurrentScriptFile} > {CurrentFunction}() on line {str(e.__traceback__.tb_lineno)}\r\nError: {str(e)}\r\nParameters: {Parameters}'
+    return ErrorMessage
+
+def BuildFactPartitionPath(Source, Partition):
+    #Don't log this function
+    #The Silver Transaction fact is kept in /<Root>/Silver/Facts/Transaction/<Source>/<Partition>.txt, one partition per source and month of transaction date
+    return os.path.join(FullPath_Silver_Fact_Transaction, Source, f'{Partition}.txt')
+
+def BuildFingerprintPath(Account, Partition):
+    #Don't log this function
+    #Row fingerprints are kept in /<Root>/Silver/Fingerprint/<Account>/<Partition>.txt, one partition per month of transaction date
+    return os.path.join(FullPath_Silver_Fingerprint, Account, f'{Partition}.txt')
+
+def BuildPerformanceReport(TopN = None):
+    #Don't log this function
+    #Summarize the run so far from StepMetrics: the TopN slowest call-stack paths, the throughput of each source, the peak memory of the process, and the hottest functions if cProfile is on
+    if(TopN is None): TopN = PerformanceTopN
+    with StepMetricsLock: Steps = [dict(CallStack = CallStack, Source = Source, **Metrics) for (CallStack, Source), Metrics in StepMetrics.items()]
+    for Step in Steps: Step['RowsPerSecond'] = round(max(Step['RowsIn'], Step['RowsOut']) / Step['Seconds'], 1) if (Step['Seconds'] > 0) and (max(Step['RowsIn'], Step['RowsOut']) > 0) else None
+
+    #The throughput of a source is measured over the files it processed, i.e. every ProcessInboundFile step of the source
+    Sources = {}
+    for Step in Steps:
+        if(Step['Source'] == '') or not Step['CallStack'].endswith('ProcessInboundFile'): continue
+        Source = Sources.setdefault(Step['Source'], {'Files': 0, 'Rows': 0, 'Seconds': 0.0})
+        Source['Files'] += Step['Calls']
+        Source['Rows'] += Step['RowsOut']
+        Source['Seconds'] += Step['Seconds']
+    for Source in Sources.values():
+        Source['FilesPerSecond'] = round(Source['Files'] / Source['Seconds'], 3) if Source['Seconds'] > 0 else None
+        Source['RowsPerSecond'] = round(Source['Rows'] / Source['Seconds'], 1) if (Source['Seconds'] > 0) and (Source['Rows'] > 0) else None
+
+    Report = {
+        'Caller': CallingObject
+        , 'DateTimeCreated': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+        , 'PeakRSSBytes': RetrievePeakRSS()
+        , 'Sources': Sources
+        , 'Steps': sorted(Steps, key = lambda Step: Step['Seconds'], reverse = True)[:TopN]
+    }
+    if(Profiler is not None):
+        #The functions that took the longest including everything they called; only the main thread is profiled
+        Statistics = pstats.Stats(Profiler).stats
+        Report['Functions'] = [
+            {'Function': f'{os.path.basename(FileName)}:{LineNumber}({FunctionName})', 'Calls': Calls, 'Seconds': round(TotalSeconds, 6), 'CumulativeSeconds': round(CumulativeSeconds, 6)}
+            for (FileName, LineNumber, FunctionName), (_, Calls, TotalSeconds, CumulativeSeconds, _) in sorted(Statistics.items(), key = lambda Item: Item[1][3], reverse = True)[:TopN]
+        ]
+    return Report
+
+def BuildSourceConfiguration(FileConfiguration, ColumnConfigurations):
+    #Don't log this function
+    #Compile the file level configuration of a source (a dict) and its column level configurations (a DataFrame) into a single SourceConfiguration, with every value already typed and defaulted
+    def Clean(Value, Default = ''):
+        return Default if pd.isnull(Value) or str(Value) == '' else Value
+
+    Columns = tuple(ColumnConfiguration(**{Field: Clean(Row.get(Field)) for Field in ColumnConfiguration._fields}) for Row in ColumnConfigurations.to_dict('records'))
+    NaturalKey = [Column for Column in Columns if str(Column.IsNaturalKey).strip().upper() in NaturalKeyFlags]
+    if(len(NaturalKey) == 0): NaturalKey = list(Columns) #If no column is flagged, the entire row is the natural key
+    NaturalKeyDateColumns = [Column for Column in NaturalKey if SplitDatatype(Column.Datatype)[0] == 'Date']
+    Expressions = tuple((Column.ColumnName_Bronze or Column.ColumnName_File, str(Column.Transformation_BronzeToSilver).strip()) for Column in Columns if (str(Column.Transformation_BronzeToSilver).strip() != '') and (Column.Transformation_BronzeToSilver_Type in ('', 'Expression')))
+    for _, Formula in Expressions: CompileExpression(Formula) #Fail now, when the configurations are compiled, rather than part way through a file
+    MappingColumns_Source = [Column.ColumnName_File or Column.ColumnName_Bronze for Column in Columns if Column.Transformation_BronzeToSilver_Type == 'Map'] #A calculated column has only a ColumnName_Bronze
+    return SourceConfiguration(
+        Account = str(Clean(FileConfiguration.get('Account')))
+        , ChunkSize = int(Clean(FileConfiguration.get('ChunkSize'), ChunkSizeDefault))
+        , ColumnHeader = tuple(Column.ColumnName_File for Column in Columns if Column.ColumnName_File != '')
+        , Columns = Columns
+        , ConfigurationFileID = int(FileConfiguration['ConfigurationFileID'])
+        , Datatypes = {Column.ColumnName_File: Column.Datatype for Column in Columns if Column.ColumnName_File != ''}
+        , DefaultCategory = str(Clean(FileConfiguration.get('DefaultCategory')))
+        , Delimiter = Clean(FileConfiguration.get('Delimiter'), DelimiterDefault)
+        , Expressions = Expressions
+        , FactColumns = tuple((Column.ColumnName_Silver, Column.ColumnName_File or Column.ColumnName_Bronze) for Column in Columns if Column.ColumnName_Silver in Silver_Fact_Definition_Transaction)
+        , MappingColumn = MappingColumns_Source[0] if len(MappingColumns_Source) > 0 else ''
+        , NaturalKeyColumns = [Column.ColumnName_File for Column in NaturalKey if Column.ColumnName_File != '']
+        , NaturalKeyDateColumn = NaturalKeyDateColumns[0].ColumnName_File if len(NaturalKeyDateColumns) > 0 else ''
+        , NaturalKeyDateFormat = SplitDatatype(NaturalKeyDateColumns[0].Datatype)[1] if len(NaturalKeyDateColumns) > 0 else DatatypeDateFormatDefault
+        , Source = str(FileConfiguration['Source'])
+        , TextQualifier = Clean(FileConfiguration.get('TextQualifier'), '"')
+    )
+
+def BuildFolderLayout(CallStack, LogEntries, ParentExecutionGUID):
+    #Set the full path of every folder in FolderLayout, creating any that don't exist
+    #Instead of checking each folder on its own, list the root and each layer folder once (a single scandir each) and create only what's missing, with one log entry for the whole layout
+    Begin = datetime.now()
+    CurrentFunction = 'BuildFolderLayout'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    Created = []
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'FullPath_Root': FullPath_Root
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        #Find the folders that already exist
+        Existing = set()
+        for Parent in sorted({os.path.dirname(Folder) for Folder in FolderLayout.values()}):
+            try:
+                with os.scandir(os.path.join(FullPath_Root, Parent)) as Entries: Existing.update(os.path.join(Parent, Entry.name) for Entry in Entries if Entry.is_dir())
+            except FileNotFoundError:
+                pass #The parent is missing too, so it and its subfolders are created below
+
+        #Create whatever is missing and set the global variable of every folder
+        for Variable, Folder in FolderLayout.items():
+            if(Folder not in Existing):
+                os.makedirs(os.path.join(FullPath_Root, Folder), exist_ok = True)
+                Created.append(Folder)
+            globals()[Variable] = os.path.join(FullPath_Root, Folder)
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = f'Created {", ".join(Created)}' if len(Created) > 0 else Result, RowCount = len(Created), Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def BuildSurrogateKeys(Dimension, Data, NaturalKeyColumns):
+    #Don't log this function
+    #The key of the dimension member each row of Data names: a UUIDv5 of the dimension and the row's natural key (as text, joined by DelimiterDefault) when SurrogateKeyMode is Derived, so the same member gets the same key on every run and no dimension has to be read to find it
+    #Each distinct natural key is hashed only once, however many rows share it; when SurrogateKeyMode is Random, every row gets a new UUIDv4, which is only right for members being added
+    if(SurrogateKeyMode == 'Random'): return pd.Series([str(uuid.uuid4()) for _ in range(len(Data))], index = Data.index, dtype = object)
+    NaturalKeys = Data[NaturalKeyColumns].astype(str)
+    NaturalKeys = NaturalKeys.iloc[:, 0] if len(NaturalKeyColumns) == 1 else NaturalKeys.agg(DelimiterDefault.join, axis = 1)
+    Codes, Uniques = pd.factorize(NaturalKeys, use_na_sentinel = False) #A missing natural key is a key of its own, not position -1
+    Keys = np.array([FormatUUID5(SurrogateKeyNamespace.bytes + f'{Dimension}{DelimiterDefault}{NaturalKey}'.encode()) for NaturalKey in Uniques], dtype = object)
+    return pd.Series(Keys[Codes] if len(Keys) > 0 else [], index = Data.index, dtype = object)
+
+def BuildSilverFact(Data, AccountGUID, FactColumns):
+    #Don't log this function
+    #The Silver Transaction fact rows of a transformed chunk: the configured fact columns of each row (SourceConfiguration.FactColumns), along with its account, its file (BatchID) and its Brand, Category, ProductService and Seller, where known
+    Columns = {SilverColumn: Data[Column] for SilverColumn, Column in FactColumns if Column in Data.columns}
+    Columns.update({Column: Data[Column] for Column in ['BatchID'] + MappingColumns if Column in Data.columns})
+    Fact = pd.DataFrame(Columns, index = Data.index).reindex(columns = Silver_Fact_Definition_Transaction)
+    Fact['AccountGUID'] = AccountGUID
+    return Fact
+
+def BuildTablePath(FullPath):
+    #Don't log this function
+    #Tables are always referred to by their .txt name; swap the extension for the one of the current StorageFormat
+    return os.path.splitext(FullPath)[0] + StorageFormats[StorageFormat]
+
+def BuildFolderPath(CallStack, Folder, SubFolder, LogEntries, ParentExecutionGUID):
+    Begin = datetime.now()
+    CurrentFunction = 'BuildFolderPath'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'Folder': Folder
+        , 'ParentExecutionGUID': ParentExecutionGUID
+        , 'SubFolder': SubFolder
+    }
+    Result = Result_Success
+    try:
+        if Folder != '' and not os.path.exists(Folder):
+            os.makedirs(Folder, exist_ok = True)
+            LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = f'Created {Folder}', Severity = Severity_Info)
+        FullPath = os.path.join(Folder, SubFolder)
+        if FullPath != '' and not os.path.exists(FullPath):
+            os.makedirs(FullPath, exist_ok = True)
+            LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = f'Created {FullPath}', Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result, FullPath
+
+def CommitRun(CallStack, LogEntries, ParentExecutionGUID):
+    #Variable(s) defined outside of this function, but set within this function
+    global RunTransaction
+
+    #Make every write and file move staged during the run at once: journal the whole batch, write each target's complete new file next to it, then replace the targets and move the files
+    #Until the journal is renamed from Prepared to Committed (the commit point), nothing the run did is visible and a crash undoes it; after that, a crash is finished by the next BeginRun
+    Begin = datetime.now()
+    CurrentFunction = 'CommitRun'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Operations = []
+    Parameters = {
+        'FullPath_Journal_Committed': FullPath_Journal_Committed
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        if(RunTransaction is None): raise Exception('No run is open; call BeginRun first')
+        WriteFactPartitions() #Once per run, with every partition the run appended to
+        with RunTransactionLock:
+            Transaction = RunTransaction
+            RunTransaction = None #Whatever happens from here on, the run is closed
+
+        Operations = [('Replace', FullPath + '.commit', FullPath) for FullPath in Transaction['Writes']] + [('Move', Source, Target) for Source, Target in Transaction['Moves']]
+        if(len(Operations) > 0):
+            WriteJournal(FullPath_Journal_Prepared, Operations)
+            for FullPath, Staged in Transaction['Writes'].items(): WriteStagedFile(FullPath, FullPath + '.commit', Staged)
+            os.replace(FullPath_Journal_Prepared, FullPath_Journal_Committed) #The commit point
+            ApplyJournal(Operations)
+            os.remove(FullPath_Journal_Committed)
+
+            #The cached copies of the tables just replaced already have the new rows (see AppendToCachedFile), so only their file status needs to catch up
+            for FullPath in Transaction['Writes']:
+                CachedFile = DimensionCache.get(os.path.splitext(FullPath)[0] + '.txt')
+                if(CachedFile is not None):
+                    FileStatus = os.stat(FullPath)
+                    CachedFile['ModifiedTime'] = FileStatus.st_mtime_ns
+                    CachedFile['Size'] = FileStatus.st_size
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = len(Operations), Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def CompileConfigurations(CallStack, LogEntries, ParentExecutionGUID):
+    #Variable(s) defined outside of this function, but set within this function
+    global Configurations_Compiled
+    global Configurations_Compiled_FileID
+
+    #Compile the file and column level configurations into one SourceConfiguration per source, so that everything about a source is a single dict lookup
+    #The compiled configurations are saved to disk along with the hashes of the configuration files; as long as neither file changes, they're loaded from there instead of parsing the files again
+    Begin = datetime.now()
+    CurrentFunction = 'CompileConfigurations'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'FullPath_Configurations_Compiled': FullPath_Configurations_Compiled
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        #Identify the current configuration files by their content, along with the version of the compiled structure
+        Key = [Configurations_Compiled_Version] + [HashFile(FullPath) if os.path.exists(FullPath) else '' for FullPath in [FullPath_Configurations_File, FullPath_Configurations_Column]]
+
+        #Use the configurations compiled by an earlier run if they were compiled from the same configuration files; anything unreadable is simply compiled again
+        Compiled = None
+        if os.path.exists(FullPath_Configurations_Compiled):
+            try:
+                with open(FullPath_Configurations_Compiled, 'rb') as f: Compiled = pickle.load(f)
+                if(Compiled['Key'] != Key): Compiled = None
+            except Exception:
+                Compiled = None
+
+        Action = 'Load'
+        if(Compiled is None):
+            Action = 'Compile'
+
+            #Get all file & column level configurations
+            LogEntries, Result = RetrieveConfigurations_File(CallStack, LogEntries, ExecutionGUID)
+            if(Result != Result_Success): raise Exception('Error in RetrieveConfigurations_File') #Log the error and don't continue
+            LogEntries, Result = RetrieveConfigurations_Column(CallStack, LogEntries, ExecutionGUID)
+            if(Result != Result_Success): raise Exception('Error in RetrieveConfigurations_Column') #Log the error and don't continue
+
+            #Compile one SourceConfiguration per source; as before, only the first file level configuration of a source is used
+            ColumnConfigurationsByFileID = {int(ConfigurationFileID): ColumnConfigurations for ConfigurationFileID, ColumnConfigurations in Configurations_Column_All.groupby('ConfigurationFileID')}
+            Compiled = {'Key': Key, 'Sources': {}}
+            for FileConfiguration in Configurations_File_All.drop_duplicates(subset = ['Source'], keep = 'first').to_dict('records'):
+                ColumnConfigurations = ColumnConfigurationsByFileID.get(int(FileConfiguration['ConfigurationFileID']), Configurations_Column_All.iloc[0:0])
+                Compiled['Sources'][str(FileConfiguration['Source'])] = BuildSourceConfiguration(FileConfiguration, ColumnConfigurations)
+
+            #Save the compiled configurations; write to a temporary file first so that a failed write never leaves a partial file behind
+            FullPath_Temporary = FullPath_Configurations_Compiled + '.tmp'
+            with open(FullPath_Temporary, 'wb') as f: pickle.dump(Compiled, f)
+            os.replace(FullPath_Temporary, FullPath_Configurations_Compiled)
+
+        Configurations_Compiled = Compiled['Sources']
+        Configurations_Compiled_FileID = {Configuration.ConfigurationFileID: Configuration for Configuration in Configurations_Compiled.values()}
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, Action = Action, File = FullPath_Configurations_Compiled, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = len(Configurations_Compiled), Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def CompileExpression(Formula):
+    #Don't log this function
+    #Parse and validate a formula (see ExpressionCompiler) only the first time it's seen; return its compiled code and the columns it reads, or raise a ValueError saying what isn't allowed
+    if(Formula not in ExpressionCache):
+        try: Tree = ast.parse(Formula.strip(), mode = 'eval')
+        except SyntaxError as e: raise ValueError(f'Expression "{Formula}" is not valid: {e.msg}')
+        Compiler = ExpressionCompiler()
+        try: Tree = ast.fix_missing_locations(Compiler.visit(Tree))
+        except ValueError as e: raise ValueError(f'Expression "{Formula}" is not valid: {e}')
+        ExpressionCache[Formula] = (compile(Tree, '<Expression>', 'eval'), frozenset(Compiler.Columns))
+    return ExpressionCache[Formula]
+
+def ConnectLogDatabase(FullPath = ''):
+    #Don't log this function
+    #Open the log database, creating its table and the indexes used to rebuild call trees and find errors and file histories if they don't exist yet
+    LogDatabase = sqlite3.connect(FullPath if FullPath != '' else FullPath_LogDatabase)
+    LogDatabase.execute(f'CREATE TABLE IF NOT EXISTS Log ({", ".join(Column + (" INTEGER" if Column == "RowCount" else " TEXT") for Column in FileDefinition_Log)})')
+    for Column in ['ExecutionGUID', 'ParentExecutionGUID', 'Begin', 'Severity', 'File']: LogDatabase.execute(f'CREATE INDEX IF NOT EXISTS Log_{Column} ON Log ({Column})')
+    return LogDatabase
+
+def CreateSavepoint():
+    #Don't log this function
+    #Record how far the open run has got, so that RollbackToSavepoint can undo everything staged after it (such as every chunk of a file that then fails) while the run still commits the rest; None when no run is open
+    with RunTransactionLock:
+        if(RunTransaction is None): return None
+        return {
+            'FactPartitions': None if FactPartitions is None else {Key: dict(Entry) for Key, Entry in FactPartitions.items()}
+            , 'FactPartitionsChanged': set(FactPartitionsChanged)
+            , 'Moves': len(RunTransaction['Moves'])
+            , 'ToMapIndex': ToMapIndex
+            , 'ToMapPending': len(ToMapPending)
+            , 'Writes': {FullPath: (Staged['Base'], Staged['Appends'], len(Staged['Appends'])) for FullPath, Staged in RunTransaction['Writes'].items()} #A replacement starts a new list of appends, and an append only adds to the end of it, so the list and its length say exactly what was staged
+        }
+
+def ConvertExpressionToText(Value):
+    #Don't log this function
+    #Text functions of Expression rules work on any column; a missing value becomes an empty string rather than "nan"
+    if isinstance(Value, pd.Series): return Value.astype(str).where(Value.notna(), '')
+    return '' if pd.isna(Value) else str(Value)
+
+def ConvertSurrogateKeyToID(Keys):
+    #Don't log this function
+    #A compact, signed 64-bit integer for each key (a Series of GUIDs), for the Gold star schema, so that Power BI relates tables on small integers rather than 36 character strings
+    #The same key always gets the same ID, so an ID never has to be stored to be found again; with 64 bits, two keys of one dimension sharing an ID is vanishingly unlikely
+    return pd.Series(pd.util.hash_pandas_object(Keys.astype(str), index = False).to_numpy().view('int64'), index = Keys.index)
+
+def EvaluateExpression(Formula, Data, IngestDatetime = ''):
+    #Don't log this function
+    #Evaluate a formula over every row of Data at once; row['Column'] is the whole column, so every operation is a vectorized one
+    Code, Columns = CompileExpression(Formula)
+    Missing = sorted(Columns.difference(Data.columns))
+    if(len(Missing) > 0): raise ValueError(f'Expression "{Formula}" reads column(s) that don\'t exist: {", ".join(Missing)}')
+    Functions = {Name: BroadcastExpressionArgument(Function, Data.index) if Name in ExpressionColumnFunctions else Function for Name, Function in ExpressionFunctions.items()}
+    return eval(Code, {'__builtins__': {}}, {**Functions, 'IngestDatetime': IngestDatetime, 'row': Data}) #The code has been validated against the whitelist, and has no access to builtins
+
+def EvictCachedFiles():
+    #Don't log this function
+    #Drop the least recently used files from the cache until it fits in DimensionCacheMaxBytes; always keep the most recently used file, even if it's larger than the limit on its own
+    while(len(DimensionCache) > 1) and (sum(CachedFile['Bytes'] for CachedFile in DimensionCache.values()) > DimensionCacheMaxBytes):
+        DimensionCache.popitem(last = False)
+
+def ExportTableToText(FullPath):
+    #Don't log this function
+    #Write a copy of a table stored in a binary format as a pipe-delimited .txt file next to it, for anything that can only read text
+    if(StorageFormat == 'Text'): return FullPath
+    FullPath_Text = os.path.splitext(FullPath)[0] + StorageFormats['Text']
+    ReadTable(FullPath).to_csv(FullPath_Text, sep = DelimiterDefault, index = False)
+    return FullPath_Text
+
+def FindInManifest(FullPath, Source):
+    #Don't log this function
+    #Return the hash of the file's content (if it had to be calculated) and the manifest entry of an identical file from the same source already ingested (or None)
+    #The file is only hashed if an already ingested file from the same source has exactly the same size; otherwise it can't be a repeat
+    Size = os.path.getsize(FullPath)
+    if((Source, Size) not in ManifestSizes): return '', None
+    ContentHash = HashFile(FullPath)
+    return ContentHash, Manifest.get((Source, Size, ContentHash))
+
+def FlushMappings():
+    #Don't log this function
+    #Write the mappings and ToMap rows buffered during the run, each file once, rather than once per file or chunk
+    global MappingsPending
+    global ToMap
+    global ToMapChanged
+    global ToMapPending
+    if(Mappings is None): return
+    if(len(MappingsPending) > 0): WriteTextFile(FullPath_Configurations_BrandCategoryProductServiceSeller, pd.concat(MappingsPending, ignore_index = True)[FileDefinition_Configuration_BrandCategoryProductServiceSeller])
+    if ToMapChanged or (len(ToMapPending) > 0):
+        ToMap = pd.concat([ToMap] + ToMapPending, ignore_index = True)
+        if ToMapChanged: WriteTextFile(FullPath_Configurations_ToMap, ToMap[FileDefinition_Configuration_ToMap], Append = False) #Rows moved to the mappings have to be taken out, so write the entire file
+        else: WriteTextFile(FullPath_Configurations_ToMap, pd.concat(ToMapPending, ignore_index = True)[FileDefinition_Configuration_ToMap])
+    MappingsPending = []
+    ToMapChanged = False
+    ToMapPending = []
+
+def FormatUUID5(NamespaceAndName):
+    #Don't log this function
+    #The same text as str(uuid.uuid5(Namespace, Name)), given the bytes of the namespace followed by those of the name, in a third of the time, as it skips building a UUID object
+    Digest = bytearray(hashlib.sha1(NamespaceAndName).digest()[:16])
+    Digest[6] = (Digest[6] & 0x0F) | 0x50 #Version 5
+    Digest[8] = (Digest[8] & 0x3F) | 0x80 #RFC 4122 variant
+    Hex = Digest.hex()
+    return f'{Hex[:8]}-{Hex[8:12]}-{Hex[12:16]}-{Hex[16:20]}-{Hex[20:]}'
+
+def FormatPerformanceReport(Report):
+    #Don't log this function
+    #The report built by BuildPerformanceReport, as text
+    def FormatBytes(Bytes):
+        return '' if Bytes is None else f'{Bytes / 1024 / 1024:,.1f} MB'
+
+    def FormatNumber(Number, Format = ',.0f'):
+        return '' if Number is None else format(Number, Format)
+
+    Lines = [f'Performance of {Report["Caller"]} at {Report["DateTimeCreated"]}; peak memory of the process {FormatBytes(Report["PeakRSSBytes"]) or "unknown"}', '', f'Slowest {len(Report["Steps"])} steps', f'{"Seconds":>10} {"CPU":>10} {"Calls":>7} {"Rows in":>11} {"Rows out":>11} {"Rows/s":>11} {"Peak memory":>12}  Source: Call stack']
+    Lines += [f'{Step["Seconds"]:>10.3f} {FormatNumber(Step["CPUSeconds"], ".3f"):>10} {Step["Calls"]:>7} {Step["RowsIn"]:>11,} {Step["RowsOut"]:>11,} {FormatNumber(Step["RowsPerSecond"]):>11} {FormatBytes(Step["PeakMemoryBytes"]):>12}  {Step["Source"] + ": " if Step["Source"] != "" else ""}{Step["CallStack"]}' for Step in Report['Steps']]
+    Lines += ['', 'Sources', f'{"Files":>7} {"Rows":>11} {"Seconds":>10} {"Files/s":>9} {"Rows/s":>11}  Source']
+    Lines += [f'{Source["Files"]:>7} {Source["Rows"]:>11,} {Source["Seconds"]:>10.3f} {FormatNumber(Source["FilesPerSecond"], ".2f"):>9} {FormatNumber(Source["RowsPerSecond"]):>11}  {Name}' for Name, Source in sorted(Report['Sources'].items())]
+    if('Functions' in Report):
+        Lines += ['', 'Slowest functions (cProfile, main thread)', f'{"Cumulative":>10} {"Own":>10} {"Calls":>9}  Function']
+        Lines += [f'{Function["CumulativeSeconds"]:>10.3f} {Function["Seconds"]:>10.3f} {Function["Calls"]:>9,}  {Function["Function"]}' for Function in Report['Functions']]
+    return os.linesep.join(Lines) + os.linesep
+
+def HashFile(FullPath):
+    #Don't log this function
+    #Hash the content of the file a block at a time, so that a file of any size can be hashed without loading it into memory
+    Hash = hashlib.sha256()
+    with open(FullPath, 'rb') as f:
+        for Block in iter(lambda: f.read(1024 * 1024), b''): Hash.update(Block)
+    return Hash.hexdigest()
+
+def HashNaturalKey(Data, NaturalKeyColumns):
+    #Don't log this function
+    #Reduce the natural key of each row to a single 64-bit hash; every column is compared as text so that a key read from a file matches the same key read from a different file
+    return pd.Index(pd.util.hash_pandas_object(Data[NaturalKeyColumns].astype(str), index = False).values)
+
+def ImportStorageEngine():
+    #Don't log this function
+    #pyarrow is only needed by the binary storage formats, so only require it when one of them is used
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise Exception(f'StorageFormat {StorageFormat} requires pyarrow; install it with "pip install pyarrow" or set StorageFormat to Text')
+    return pyarrow
+
+def JoinLineage(Data):
+    #Don't log this function
+    #Add the lineage of each row (Source, SourceFile, ExecutionGUID and DateTimeInserted of its file, from the manifest) by its BatchID, for when it's needed; rows keep only the BatchID
+    Batches = pd.DataFrame([Entry for Entry in Manifest.values()], columns = FileDefinition_Manifest).rename(columns = {'DateTimeInserted': 'BatchDateTimeInserted', 'FileName': 'SourceFile'})
+    Batches = Batches[['BatchID', 'BatchDateTimeInserted', 'ExecutionGUID', 'Source', 'SourceFile']].astype({'BatchID': BatchIDDatatype})
+    return Data.merge(Batches, on = 'BatchID', how = 'left', suffixes = ('', '_Batch'))
+
+def LogStep(Begin, Caller, CallStack, ExecutionGUID, LogEntries, Parameters, **VariedParameters): #The explicit parameters are required; anything passed into **VariedParameters is optional; different parameters may be passed into **VariedParameters
+    #Don't log this function
+    CurrentFunction = 'LogStep'
+    try:
+        Seconds = (datetime.now() - Begin).total_seconds()
+        Begin = Begin.strftime('%Y-%m-%d %H:%M:%S.%f') #Format the value as YYYY-MM-DD HH:MM:SS.ms
+        End = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f') #Format the value as YYYY-MM-DD HH:MM:SS.ms
+        if(ExecutionGUID == ''): ExecutionGUID = str(uuid.uuid4()) #If no ExecutionGUID is passed in, generate a new GUID
+
+        LogEntry = LogRecord(
+            ExecutionGUID = ExecutionGUID
+            , ParentExecutionGUID = VariedParameters.get('ParentExecutionGUID')
+            , Begin = Begin
+            , End = End
+            , Severity = VariedParameters.get('Severity')
+            , Caller = Caller
+            , CallStack = CallStack
+            , Action = VariedParameters.get('Action')
+            , RowCount = VariedParameters.get('RowCount')
+            , Source = VariedParameters.get('Source')
+            , Target = VariedParameters.get('Target')
+            , Result = VariedParameters.get('Result')
+            , File = VariedParameters.get('File')
+            , Parameters = Parameters
+        )
+        LogEntries.append(LogEntry) #Add the log entry to the collection of log entries for the current run; a LogSink writes it out once its buffer is full
+
+        #Add the step to the performance metrics of the run; an entry with an Action is kept apart from the function's own entry
+        Action = VariedParameters.get('Action')
+        RecordStepMetrics(CallStack if Action is None else f'{CallStack} [{Action}]', Parameters.get('Source', '') if isinstance(Parameters, dict) else '', Seconds, RowsOut = VariedParameters.get('RowCount') or 0)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, False, Parameters) #Build the error message
+        print(Result) #Report the error
+
+    finally:
+        return LogEntries
+
+def MeasureChunks(Chunks, CallStack, Source = ''):
+    #Don't log this function
+    #Yield the chunks of a file as they're read, measuring the reading of each one (see MeasureStep)
+    Chunks = iter(Chunks)
+    while True:
+        with MeasureStep(CallStack, Source) as Step:
+            Chunk = next(Chunks, None)
+            if(Chunk is not None): Step.RowsOut = len(Chunk)
+        if(Chunk is None): return
+        yield Chunk
+
+def MoveFile(CallStack, FullPath_SourceFile, FullPath_TargetFile, LogEntries, ParentExecutionGUID):
+    Begin = datetime.now()
+    CurrentFunction = 'MoveFile'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'FullPath_SourceFile': FullPath_SourceFile
+        , 'FullPath_TargetFile': FullPath_TargetFile
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        #Validate the filenames & folder paths
+        if(FullPath_SourceFile == ''): raise Exception('FullPath_SourceFile cannot be empty')
+        if(FullPath_TargetFile == ''): raise Exception('FullPath_TargetFile cannot be empty')
+
+        #Split the full paths into folder paths and filenames
+        FolderPath_Source = os.path.dirname(FullPath_SourceFile)
+        FolderPath_Target = os.path.dirname(FullPath_TargetFile)
+        Filename_Source = os.path.basename(FullPath_SourceFile)
+        Filename_Target = os.path.basename(FullPath_TargetFile)
+
+        #Create the folders if they don't exist
+        if(FolderPath_Source != '') and not os.path.exists(FolderPath_Source): os.makedirs(FolderPath_Source, exist_ok = True)
+        if(FolderPath_Target != '') and not os.path.exists(FolderPath_Target): os.makedirs(FolderPath_Target, exist_ok = True)
+
+        #Build the full paths to the source and target files
+        FullPath_SourceFile = os.path.join(FolderPath_Source, Filename_Source)
+        FullPath_TargetFile = os.path.join(FolderPath_Target, Filename_Target)
+
+        #Move the file, or within an open run, stage the move so that CommitRun makes it along with every other move and write of the run
+        if not os.path.exists(FullPath_SourceFile): raise Exception(f'{FullPath_SourceFile} was not found')
+        if not StageMove(FullPath_SourceFile, FullPath_TargetFile): os.rename(FullPath_SourceFile, FullPath_TargetFile)
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def RecordRowFingerprints(Account, Fingerprints):
+    #Don't log this function
+    #Append the fingerprints returned by RemoveDuplicateRows to their partitions once their rows have been loaded, so that the rows are treated as duplicates from now on
+    for Partition, PartitionFingerprints in Fingerprints.groupby('Partition'):
+        FullPath = BuildFingerprintPath(Account, Partition)
+        os.makedirs(os.path.dirname(FullPath), exist_ok = True)
+        WriteTable(FullPath, PartitionFingerprints[['RowHash']], Append = True)
+        if(FullPath in FingerprintPartitions): FingerprintPartitions[FullPath] = FingerprintPartitions[FullPath].append(pd.Index(PartitionFingerprints['RowHash']))
+
+def RecordStepMetrics(CallStack, Source, Seconds, CPUSeconds = None, RowsIn = 0, RowsOut = 0, PeakMemoryBytes = None):
+    #Don't log this function
+    #Add one call of a step to StepMetrics; CPU time and peak memory are only known for steps measured by MeasureStep
+    with StepMetricsLock:
+        Metrics = StepMetrics.setdefault((CallStack, str(Source)), {'Calls': 0, 'Seconds': 0.0, 'CPUSeconds': None, 'RowsIn': 0, 'RowsOut': 0, 'PeakMemoryBytes': None})
+        Metrics['Calls'] += 1
+        Metrics['Seconds'] += Seconds
+        Metrics['RowsIn'] += RowsIn
+        Metrics['RowsOut'] += RowsOut
+        if(CPUSeconds is not None): Metrics['CPUSeconds'] = (Metrics['CPUSeconds'] or 0.0) + CPUSeconds
+        if(PeakMemoryBytes is not None): Metrics['PeakMemoryBytes'] = max(Metrics['PeakMemoryBytes'] or 0, PeakMemoryBytes)
+
+def RemoveDuplicateRows(Data, Account, NaturalKeyColumns, DateColumn = '', DateFormat = DatatypeDateFormatDefault):
+    #Don't log this function
+    #Return only the rows of Data that haven't already been loaded for the account, from this or any other file, along with their fingerprints (to be passed to RecordRowFingerprints once the rows are loaded)
+    #A row's fingerprint is the hash of its natural key; fingerprints are partitioned by the month of DateColumn (parsed with DateFormat), so only the partitions covering the dates in Data are read and checked
+    if(DateColumn != ''): Partitions = pd.to_datetime(Data[DateColumn], format = DateFormat, errors = 'coerce').dt.strftime('%Y-%m').fillna('Undated')
+    else: Partitions = pd.Series('All', index = Data.index)
+    Fingerprints = pd.DataFrame({'Partition': Partitions, 'RowHash': HashNaturalKey(Data, NaturalKeyColumns).values}, index = Data.index)
+    IsNew = ~Fingerprints.duplicated() #Keep only the first of any rows that share a fingerprint within Data
+    for Partition in Fingerprints['Partition'].unique():
+        InPartition = (Fingerprints['Partition'] == Partition).values
+        IsNew[InPartition] &= RetrieveFingerprintPartition(Account, Partition).get_indexer(Fingerprints['RowHash'].values[InPartition]) < 0
+    return Data[IsNew], Fingerprints[IsNew]
+
+def RemoveExistingNaturalKeys(Data, DataNaturalKeyColumns, FullPath, Existing, ExistingNaturalKeyColumns):
+    #Don't log this function
+    #Return only the rows of Data whose natural key isn't already in the file at FullPath (an anti-join); the index of the file is built from Existing the first time and reused after that, so the cost depends on the number of rows in Data, not the size of the file
+    if(FullPath not in NaturalKeyIndexes): NaturalKeyIndexes[FullPath] = HashNaturalKey(Existing, ExistingNaturalKeyColumns).drop_duplicates()
+    if(Data.empty): return Data
+    DataKeys = HashNaturalKey(Data, DataNaturalKeyColumns)
+    IsNew = (NaturalKeyIndexes[FullPath].get_indexer(DataKeys) < 0) & ~DataKeys.duplicated() #Also keep only the first of any rows that share a natural key within Data
+    return Data[IsNew]
+
+def ResolveMappings(Data, AccountGUID, SourceColumn):
+    #Don't log this function
+    #Add the BrandGUID, CategoryGUID, ProductServiceGUID and SellerGUID of every row of Data by (AccountGUID, the value of SourceColumn), with one lookup in MappingsIndex for the whole chunk rather than a merge per dimension
+    #A source value that isn't mapped leaves the four columns missing, and is buffered for ToMap unless it's already there
+    global ToMapIndex
+    Keys = HashNaturalKey(pd.DataFrame({'AccountGUID': AccountGUID, 'SourceValue': Data[SourceColumn].astype(str).to_numpy()}), MappingKeyColumns)
+    Positions = MappingsIndex.get_indexer(Keys)
+    for Column in MappingColumns: Data[Column] = MappingsValues[Column][Positions]
+
+    IsUnmapped = Positions < 0
+    if IsUnmapped.any():
+        UnmappedKeys = Keys[IsUnmapped]
+        IsNew = (ToMapIndex.get_indexer(UnmappedKeys) < 0) & ~UnmappedKeys.duplicated()
+        if IsNew.any():
+            New = pd.DataFrame({'AccountGUID': AccountGUID, 'DateTimeInserted': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f'), 'SourceValue': Data.loc[IsUnmapped, SourceColumn].astype(str).to_numpy()[IsNew]}, columns = FileDefinition_Configuration_ToMap)
+            ToMapPending.append(New)
+            ToMapIndex = ToMapIndex.append(UnmappedKeys[IsNew])
+    return Data
+
+def RetrieveCachedFile(FullPath):
+    #Don't log this function
+    #Read the file only if it isn't cached or it has changed on disk (by modified time or size) since it was cached; otherwise return the cached copy
+    FileStatus = os.stat(BuildTablePath(FullPath))
+    CachedFile = DimensionCache.get(FullPath)
+    if(CachedFile is not None) and (CachedFile['ModifiedTime'] == FileStatus.st_mtime_ns) and (CachedFile['Size'] == FileStatus.st_size):
+        DimensionCache.move_to_end(FullPath) #Mark as most recently used
+        return CachedFile['Data']
+
+    Data = ReadTable(FullPath)
+    DimensionCache[FullPath] = {
+        'Bytes': int(Data.memory_usage(deep = True).sum())
+        , 'Data': Data
+        , 'ModifiedTime': FileStatus.st_mtime_ns
+        , 'Size': FileStatus.st_size
+    }
+    DimensionCache.move_to_end(FullPath)
+    NaturalKeyIndexes.pop(FullPath, None) #The file changed outside of the pipeline, so its natural key index has to be rebuilt too
+    DerivedKeyDimensions.pop(FullPath, None) #And its keys checked again
+    EvictCachedFiles()
+    return Data
+
+def RetrieveColumnHeader(CallStack, Delimiter, FullPath, LogEntries, ParentExecutionGUID, TextQualifier = '"'):
+    #Read only the first record of the file (the column header) instead of the entire file, so that validating a file costs the same regardless of its size
+    Begin = datetime.now()
+    CurrentFunction = 'RetrieveColumnHeader'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ColumnHeader = []
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    IsEmpty = True
+    Parameters = {
+        'Delimiter': Delimiter
+        , 'FullPath': FullPath
+        , 'ParentExecutionGUID': ParentExecutionGUID
+        , 'TextQualifier': TextQualifier
+    }
+    Result = Result_Success
+    try:
+        #Validate the parameters
+        if(FullPath == ''): raise Exception('FullPath cannot be empty')
+        if not isinstance(Delimiter, str) or (Delimiter == ''): Delimiter = DelimiterDefault #Fall back to the default delimiter if none is configured
+        if not isinstance(TextQualifier, str) or (TextQualifier == ''): TextQualifier = '"' #Fall back to the standard text qualifier if none is configured
+
+        #A file with no bytes has neither a column header nor any rows
+        if(os.path.getsize(FullPath) > 0):
+            with open(FullPath, 'r', newline = '', encoding = 'utf-8-sig') as f: #utf-8-sig drops the byte order mark some exports start with
+                Reader = csv.reader(f, delimiter = Delimiter, quotechar = TextQualifier)
+                ColumnHeader = next(Reader, []) #The first record is the column header; a qualified header may span more than one line, so let the reader find the end of it
+                ColumnHeader = [Column.strip() for Column in ColumnHeader]
+
+                #The file is empty unless at least one non-blank record follows the column header; stop at the first one found
+                for Row in Reader:
+                    if any(Value.strip() != '' for Value in Row):
+                        IsEmpty = False
+                        break
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result, ColumnHeader, IsEmpty
+
+def ReadSilverFact(Columns = None, DateFirst = None, DateLast = None, BatchIDAbove = None, Sources = None):
+    #Don't log this function
+    #Read the rows of the Silver Transaction fact from DateFirst through DateLast, with a BatchID above BatchIDAbove, of the given Sources; each limit is optional
+    #Only the partitions that the partition manifest says can hold such rows are opened, and only Columns of them are read; a date limit leaves out rows without a date
+    Partitions = pd.DataFrame(list(RetrieveFactPartitions().values()), columns = FileDefinition_FactPartition)
+    IsRead = pd.Series(True, index = Partitions.index)
+    if(Sources is not None): IsRead &= Partitions['Source'].isin(Sources)
+    if(BatchIDAbove is not None): IsRead &= pd.to_numeric(Partitions['BatchIDMax']) > BatchIDAbove
+    if(DateFirst is not None): IsRead &= pd.to_datetime(Partitions['DateMax']) >= pd.Timestamp(DateFirst)
+    if(DateLast is not None): IsRead &= pd.to_datetime(Partitions['DateMin']) <= pd.Timestamp(DateLast)
+
+    ColumnsRead = None if Columns is None else list(dict.fromkeys(Columns + ['BatchID', 'Date'])) #The limits are checked row by row too, as a partition can hold rows on either side of them
+    Parts = [ReadTable(BuildFactPartitionPath(Source, Partition), ColumnsRead) for Source, Partition in Partitions.loc[IsRead, ['Source', 'Partition']].itertuples(index = False)]
+    if(len(Parts) == 0): return pd.DataFrame(columns = Columns or Silver_Fact_Definition_Transaction)
+    Data = pd.concat(Parts, ignore_index = True)
+    IsKept = pd.Series(True, index = Data.index)
+    if(BatchIDAbove is not None): IsKept &= pd.to_numeric(Data['BatchID']) > BatchIDAbove
+    if(DateFirst is not None) or (DateLast is not None):
+        Dates = pd.to_datetime(Data['Date'], errors = 'coerce')
+        if(DateFirst is not None): IsKept &= Dates >= pd.Timestamp(DateFirst)
+        if(DateLast is not None): IsKept &= Dates <= pd.Timestamp(DateLast)
+    Data = Data[IsKept]
+    return Data if Columns is None else Data[Columns]
+
+def ReadTable(FullPath, Columns = None):
+    #Don't log this function
+    #Read a Silver or Gold table in the current StorageFormat, along with any rows staged for it in the open run, so that the run sees its own writes; Columns limits the read to just those columns
+    FullPath = BuildTablePath(FullPath)
+    Staged = RunTransaction['Writes'].get(FullPath) if RunTransaction is not None else None
+    if(Staged is None): return ReadTableFile(FullPath, Columns)
+    Data = [Staged['Base'] if Staged['Base'] is not None else ReadTableFile(FullPath, Columns) if os.path.exists(FullPath) else None] + Staged['Appends']
+    return pd.concat([Part if Columns is None else Part[Columns] for Part in Data if Part is not None], ignore_index = True)
+
+def ReadJournal(FullPath):
+    #Don't log this function
+    with open(FullPath, newline = '') as f: return [tuple(Operation) for Operation in csv.reader(f, delimiter = DelimiterDefault)][1:]
+
+def ReadTableFile(FullPath, Columns = None):
+    #Don't log this function
+    #Read a table file as it is on disk, in the format of its extension; the binary formats are memory-mapped rather than copied into memory up front
+    Extension = os.path.splitext(FullPath)[1]
+    if(Extension == StorageFormats['Text']): return pd.read_csv(FullPath, delimiter = DelimiterDefault, usecols = Columns)
+    pyarrow = ImportStorageEngine()
+    if(Extension == StorageFormats['Feather']): Table = pyarrow.feather.read_table(FullPath, columns = Columns, memory_map = True)
+    else: Table = pyarrow.parquet.read_table(FullPath, columns = Columns, memory_map = True)
+    return Table.to_pandas()
+
+def RecoverRun():
+    #Don't log this function (BeginRun logs it)
+    #Finish a commit that reached its commit point (replay its journal), or undo one that didn't (delete the files it staged); returns what was done, and to how many files
+    if os.path.exists(FullPath_Journal_Committed):
+        Operations = ReadJournal(FullPath_Journal_Committed)
+        ApplyJournal(Operations)
+        os.remove(FullPath_Journal_Committed)
+        return 'Replay', len(Operations)
+    if os.path.exists(FullPath_Journal_Prepared):
+        Operations = ReadJournal(FullPath_Journal_Prepared)
+        for Action, Source, _ in Operations:
+            if(Action == 'Replace') and os.path.exists(Source): os.remove(Source)
+        os.remove(FullPath_Journal_Prepared)
+        return 'Rollback', len(Operations)
+    return '', 0
+
+def RetrievePeakRSS():
+    #Don't log this function
+    #The most memory the process has held at once, in bytes; None where the resource module isn't available (Windows)
+    try: import resource
+    except ImportError: return None
+    PeakRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return PeakRSS if sys.platform == 'darwin' else PeakRSS * 1024 #Kilobytes on Linux, bytes on macOS
+
+def RetrieveFactPartitions():
+    #Don't log this function
+    #The partition manifest of the Silver Transaction fact, read only the first time it's needed in a run
+    global FactPartitions
+    if(FactPartitions is None):
+        FactPartitions = {}
+        if os.path.exists(FullPath_Silver_Fact_Transaction_Partitions):
+            Partitions = pd.read_csv(FullPath_Silver_Fact_Transaction_Partitions, delimiter = DelimiterDefault, dtype = {'Partition': str, 'Source': str}, parse_dates = ['DateMax', 'DateMin'])
+            FactPartitions = {(Entry['Source'], Entry['Partition']): {Column: (None if pd.isna(Value) else Value) for Column, Value in Entry.items()} for Entry in Partitions.to_dict('records')}
+    return FactPartitions
+
+def RetrieveFingerprintPartition(Account, Partition):
+    #Don't log this function
+    #Read a partition of row fingerprints only if it isn't already held in memory; hold at most FingerprintPartitionsMax partitions, so that memory depends on the range of dates being checked, not on all of history
+    FullPath = BuildFingerprintPath(Account, Partition)
+    if(FullPath in FingerprintPartitions):
+        FingerprintPartitions.move_to_end(FullPath) #Mark as most recently used
+        return FingerprintPartitions[FullPath]
+
+    if TableExists(FullPath): Fingerprints = pd.Index(ReadTable(FullPath)['RowHash'].astype('uint64')).drop_duplicates() #Keep the index unique so that it can be searched by its hash table
+    else: Fingerprints = pd.Index([], dtype = 'uint64')
+    FingerprintPartitions[FullPath] = Fingerprints
+    while(len(FingerprintPartitions) > FingerprintPartitionsMax): FingerprintPartitions.popitem(last = False)
+    return Fingerprints
+
+def RetrieveMappings(CallStack, LogEntries, ParentExecutionGUID):
+    #Variable(s) defined outside of this function, but set within this function
+    global Mappings
+    global MappingsIndex
+    global MappingsPending
+    global MappingsValues
+    global ToMap
+    global ToMapChanged
+    global ToMapIndex
+    global ToMapPending
+
+    #Load the BrandCategoryProductServiceSeller bridge and ToMap into memory, and move every ToMap row that has been filled in to the bridge; do this only once per process execution
+    Begin = datetime.now()
+    CurrentFunction = 'RetrieveMappings'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'FullPath_Configurations_BrandCategoryProductServiceSeller': FullPath_Configurations_BrandCategoryProductServiceSeller
+        , 'FullPath_Configurations_ToMap': FullPath_Configurations_ToMap
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    RowCount = 0
+    try:
+        Files = {}
+        for FullPath, FileDefinition in [(FullPath_Configurations_BrandCategoryProductServiceSeller, FileDefinition_Configuration_BrandCategoryProductServiceSeller), (FullPath_Configurations_ToMap, FileDefinition_Configuration_ToMap)]:
+            #Create the file with just its column header if it doesn't exist
+            if not os.path.exists(FullPath):
+                with open(FullPath, 'w', newline = '') as f: f.write(DelimiterDefault.join(FileDefinition) + os.linesep)
+            Files[FullPath] = pd.read_csv(FullPath, delimiter = DelimiterDefault, dtype = str) #Keys are compared as text
+            LogEntries, Result, _ = ValidateColumnHeader(Files[FullPath].columns.tolist(), CallStack, FileDefinition, LogEntries, ParentExecutionGUID)
+            if(Result != Result_Success): raise Exception('Error in ValidateColumnHeader') #Log the error and don't continue
+        Mappings = Files[FullPath_Configurations_BrandCategoryProductServiceSeller]
+        ToMap = Files[FullPath_Configurations_ToMap]
+        MappingsPending = []
+        ToMapChanged = False
+        ToMapPending = []
+
+        #A ToMap row with every name filled in is resolved to the GUIDs of those names, with one hashed lookup per dimension, and moved to the bridge
+        IsNamed = ToMap[MappingDimensions].notna().all(axis = 1)
+        if IsNamed.any():
+            Named = ToMap[IsNamed].copy()
+            for Dimension in MappingDimensions:
+                LogEntries, Result, _, SilverDimension = ValidateSilverDimension(CallStack, Dimension, LogEntries, ExecutionGUID)
+                if(Result != Result_Success): raise Exception('Error in ValidateSilverDimension') #Log the error and don't continue
+                GUIDs = pd.Series(SilverDimension[f'{Dimension}GUID'].astype(str).to_numpy(), index = SilverDimension['Name'].astype(str).to_numpy())
+                Named[f'{Dimension}GUID'] = Named[Dimension].map(GUIDs[~GUIDs.index.duplicated()])
+            Named = Named.dropna(subset = MappingColumns) #A name that isn't in its dimension yet stays in ToMap
+            if not Named.empty:
+                Named['DateTimeInserted'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+                Named = Named[FileDefinition_Configuration_BrandCategoryProductServiceSeller]
+                Mappings = pd.concat([Mappings, Named], ignore_index = True)
+                MappingsPending.append(Named)
+                ToMap = ToMap.drop(Named.index).reset_index(drop = True)
+                ToMapChanged = True
+
+        #Index the bridge by its key; the first mapping of a key wins
+        MappingsIndex = HashNaturalKey(Mappings, MappingKeyColumns)
+        Mappings = Mappings[~MappingsIndex.duplicated()].reset_index(drop = True)
+        MappingsIndex = MappingsIndex[~MappingsIndex.duplicated()]
+        MappingsValues = {Column: np.append(Mappings[Column].to_numpy(dtype = object), None) for Column in MappingColumns}
+        ToMapIndex = HashNaturalKey(ToMap, MappingKeyColumns).drop_duplicates()
+        RowCount = len(Mappings)
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath_Configurations_BrandCategoryProductServiceSeller, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = RowCount, Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def RetrieveManifest(CallStack, LogEntries, ParentExecutionGUID):
+    #Variable(s) defined outside of this function, but set within this function
+    global Manifest
+    global ManifestBatchIDLast
+    global ManifestSizes
+
+    #Load every file already ingested; do this only once per process execution
+    Begin = datetime.now()
+    CurrentFunction = 'RetrieveManifest'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'FullPath_Manifest': FullPath_Manifest
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        #Create the manifest file with just its column header if it doesn't exist
+        if not os.path.exists(FullPath_Manifest):
+            with open(FullPath_Manifest, 'w', newline = '') as f: f.write(DelimiterDefault.join(FileDefinition_Manifest) + os.linesep)
+
+        ManifestFile = pd.read_csv(FullPath_Manifest, delimiter = DelimiterDefault, dtype = {'ContentHash': str, 'Size': 'int64', 'Source': str})
+
+        #A manifest written before files had a BatchID gets one per file, in the order the files were ingested, and is written again
+        if('BatchID' not in ManifestFile.columns):
+            ManifestFile.insert(0, 'BatchID', range(1, len(ManifestFile) + 1))
+            ManifestFile.to_csv(FullPath_Manifest, sep = DelimiterDefault, index = False, lineterminator = os.linesep)
+
+        LogEntries, Result, _ = ValidateColumnHeader(ManifestFile.columns.tolist(), CallStack, FileDefinition_Manifest, LogEntries, ParentExecutionGUID)
+        if(Result != Result_Success): raise Exception('Error in ValidateColumnHeader') #Log the error and don't continue
+        Manifest = {(Entry['Source'], Entry['Size'], Entry['ContentHash']): Entry for Entry in ManifestFile.to_dict('records')}
+        ManifestSizes = {(Source, Size) for Source, Size, _ in Manifest}
+        ManifestBatchIDLast = int(ManifestFile['BatchID'].max()) if not ManifestFile.empty else 0
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath_Manifest, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = len(Manifest), Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def RetrieveOrCreateFile(CallStack, FileDefinition, FullPath, LogEntries, ParentExecutionGUID):
+    Begin = datetime.now()
+    CurrentFunction = 'RetrieveOrCreateFile'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        #Validate the FullPath parameter
+        if(FullPath == ''): raise Exception('FullPath cannot be empty')
+
+        #Validate the file existence; create it with just its column header if it's not found
+        File = pd.DataFrame() #Initialize to an empty DataFrame
+        Created = not os.path.exists(FullPath)
+        if(Created):
+            os.makedirs(os.path.dirname(FullPath), exist_ok = True) #Create the folder of the file, not a folder named after the file
+            with open(FullPath, 'w', newline = '') as f: f.write(DelimiterDefault.join(FileDefinition) + os.linesep)
+
+        #Validate the actual column headers; a file with a column header but no rows is valid, so it's kept as it is
+        File = pd.read_csv(FullPath, delimiter = DelimiterDefault, quoting = csv.QUOTE_NONE)
+        LogEntries, Result, Issue = ValidateColumnHeader(File.columns.tolist(), CallStack, FileDefinition, LogEntries, ParentExecutionGUID)
+        if(Result != Result_Success): raise Exception('Error in ValidateColumnHeader') #Log the error and don't continue
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath, ParentExecutionGUID = ParentExecutionGUID, Result = f'Created {FullPath}' if Created else Result, Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result, File
+
+def RetrieveSurrogateKeys(Dimension, FullPath, Members, Names):
+    #Don't log this function
+    #The key of the member of the dimension each row of Names (a Name column, missing where a row names no member) names; Members is every member of the dimension, including any just appended
+    #When SurrogateKeyMode is Derived and every member has its derived key, the key is worked out from the name itself, with no join; a dimension with members added with random keys (before SurrogateKeyMode was Derived, or while it was Random) is looked up by Name instead, so that no row points at a key the dimension doesn't have
+    if(SurrogateKeyMode == 'Derived'):
+        if(FullPath not in DerivedKeyDimensions): DerivedKeyDimensions[FullPath] = bool((BuildSurrogateKeys(Dimension, Members, ['Name']) == Members[f'{Dimension}GUID'].astype(str)).all())
+        if DerivedKeyDimensions[FullPath]: return BuildSurrogateKeys(Dimension, Names, ['Name']).where(Names['Name'].notna())
+    return Names['Name'].map(Members.set_index(Members['Name'].astype(str))[f'{Dimension}GUID'].groupby(level = 0).first())
+
+def RetrieveConfigurations_Column(CallStack, LogEntries, ParentExecutionGUID):
+    #Variable(s) defined outside of this function, but set within this function
+    global Configurations_Column_All
+
+    #Get all column level configurations for the specified ConfigurationFileID
+    Begin = datetime.now()
+    CurrentFunction = 'RetrieveConfigurations_Column'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        ConfigurationFile = pd.DataFrame() #Initialize to an empty DataFrame
+        LogEntries, Result, ConfigurationFile = RetrieveOrCreateFile(CallStack, FileDefinition_Configuration_Column, FullPath_Configurations_Column, LogEntries, ParentExecutionGUID)
+        if(Result == Result_Success): Configurations_Column_All = ConfigurationFile
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath_Configurations_Column, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def RetrieveConfigurations_File(CallStack, LogEntries, ParentExecutionGUID):
+    #Variable(s) defined outside of this function, but set within this function
+    global Configurations_File_All
+
+    #Get all file level configurations for the current source
+    Begin = datetime.now()
+    CurrentFunction = 'RetrieveConfigurations_File'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'FullPath_Configurations_File': FullPath_Configurations_File
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        ConfigurationFile = pd.DataFrame() #Initialize to an empty DataFrame
+        LogEntries, Result, ConfigurationFile = RetrieveOrCreateFile(CallStack, FileDefinition_Configuration_File, FullPath_Configurations_File, LogEntries, ParentExecutionGUID)
+        if(Result == Result_Success): Configurations_File_All = ConfigurationFile
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath_Configurations_File, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
+        
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def RollbackToSavepoint(Savepoint):
+    #Don't log this function
+    #Undo everything staged in the open run since CreateSavepoint, along with what was kept in memory about it: the cached copies, natural key indexes and fingerprints of the files it wrote to are read again the next time they're needed
+    global FactPartitions
+    global ToMapIndex
+    if(Savepoint is None): return
+    with RunTransactionLock:
+        del RunTransaction['Moves'][Savepoint['Moves']:]
+        for FullPath, Staged in list(RunTransaction['Writes'].items()):
+            Base, Appends, AppendCount = Savepoint['Writes'].get(FullPath, (None, None, 0))
+            if(Staged['Base'] is Base) and (Staged['Appends'] is Appends) and (len(Appends) == AppendCount): continue #Not written to since the savepoint
+            if(Appends is None): RunTransaction['Writes'].pop(FullPath)
+            else: RunTransaction['Writes'][FullPath] = {'Appends': Appends[:AppendCount], 'Base': Base}
+            FullPath_Text = os.path.splitext(FullPath)[0] + '.txt' #The caches refer to tables by their .txt name
+            for Cache in [DerivedKeyDimensions, DimensionCache, FingerprintPartitions, NaturalKeyIndexes]: Cache.pop(FullPath_Text, None)
+    FactPartitions = Savepoint['FactPartitions']
+    FactPartitionsChanged.clear()
+    FactPartitionsChanged.update(Savepoint['FactPartitionsChanged'])
+    ToMapIndex = Savepoint['ToMapIndex']
+    del ToMapPending[Savepoint['ToMapPending']:]
+
+def RotateLogFile():
+    #Don't log this function
+    #Once the log file reaches LogFileMaxBytes, rename it with a timestamp and start a new one with just the column header
+    if not os.path.exists(FullPath_LogFile) or (os.path.getsize(FullPath_LogFile) < LogFileMaxBytes): return
+    FullPath_LogFile_Rotated = os.path.splitext(FullPath_LogFile)[0] + '.' + datetime.now().strftime('%Y%m%d%H%M%S%f') + '.txt'
+    os.rename(FullPath_LogFile, FullPath_LogFile_Rotated)
+    with open(FullPath_LogFile, 'w', newline = '') as f: f.write(DelimiterDefault.join(FileDefinition_Log) + os.linesep)
+
+def SetGlobalVariables(Caller, CallStack, LogEntries, ParentExecutionGUID):
+    #Set the global variables
+    global CallingObject
+    global DelimiterDefault
+    global ExpectedDelimiter
+    global FullPath_Configurations_BrandCategoryProductServiceSeller
+    global FullPath_Configurations_Column
+    global FullPath_Configurations_Compiled
+    global FullPath_Configurations_File
+    global FullPath_Configurations_Holiday
+    global FullPath_Configurations_ToMap
+    global FullPath_Journal_Committed
+    global FullPath_Journal_Prepared
+    global FullPath_LogDatabase
+    global FullPath_LogFile
+    global FullPath_Gold_Dimension_Date
+    global FullPath_Manifest
+    global FullPath_Silver_Fact_Transaction
+    global FullPath_Silver_Fact_Transaction_Partitions
+    global FullPath_Watermark
+    global FullPath_Root
+
+    Begin = datetime.now()
+    CurrentFunction = 'SetGlobalVariables'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Parameters = {
+        'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        CallingObject = Caller
+        DelimiterDefault = r'|'
+
+        #Set & validate folder paths
+        FullPath_Root = os.path.join(RootFolder if RootFolder != '' else str(Path(__file__).parent.parent), '')
+        LogEntries, Result = BuildFolderLayout(CallStack, LogEntries, ParentExecutionGUID)
+        if(Result != Result_Success): raise Exception('Error in BuildFolderLayout') #Log the error and don't continue
+
+        FullPath_Configurations_BrandCategoryProductServiceSeller = os.path.join(FullPath_Admin, 'ConfigurationBrandCategoryProductServiceSeller.txt')
+        FullPath_Configurations_Column = os.path.join(FullPath_Admin, 'ConfigurationColumn.txt')
+        FullPath_Configurations_Compiled = os.path.join(FullPath_Admin, 'ConfigurationCompiled.pickle')
+        FullPath_Configurations_File = os.path.join(FullPath_Admin, 'ConfigurationFile.txt')
+        FullPath_Configurations_Holiday = os.path.join(FullPath_Admin, 'ConfigurationHoliday.txt')
+        FullPath_Configurations_ToMap = os.path.join(FullPath_Admin, 'ConfigurationToMap.txt')
+        FullPath_Journal_Committed = os.path.join(FullPath_Admin, 'Journal.Committed.txt')
+        FullPath_Journal_Prepared = os.path.join(FullPath_Admin, 'Journal.Prepared.txt')
+        FullPath_LogDatabase = os.path.join(FullPath_Admin, 'Log.db')
+        FullPath_LogFile = os.path.join(FullPath_Admin, 'Log.txt')
+        FullPath_Gold_Dimension_Date = os.path.join(FullPath_Gold_Dimensions, 'Date.txt')
+        FullPath_Manifest = os.path.join(FullPath_Admin, 'Manifest.txt')
+        FullPath_Silver_Fact_Transaction = os.path.join(FullPath_Silver_Facts, 'Transaction')
+        FullPath_Silver_Fact_Transaction_Partitions = os.path.join(FullPath_Silver_Fact_Transaction, 'Partitions.txt')
+        FullPath_Watermark = os.path.join(FullPath_Admin, 'Watermark.txt')
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def SplitDatatype(Datatype):
+    #Don't log this function
+    #Split a Datatype of the column level configurations into its name (see DatatypeFamilies) and, for a Date or DateTime, the format its values are parsed with, given after a colon (Date:%d/%m/%Y); DatatypeDateFormatDefault if none is given
+    Name, _, Format = str(Datatype).partition(':')
+    Name = Name.strip()
+    if(DatatypeFamilies.get(Name) != 'Date'): return Name, ''
+    return Name, Format.strip() or DatatypeDateFormatDefault
+
+def StageMove(FullPath_SourceFile, FullPath_TargetFile):
+    #Don't log this function
+    #Within an open run, stage a file move for CommitRun and return True; otherwise return False, so that the caller moves the file itself
+    with RunTransactionLock:
+        if(RunTransaction is None): return False
+        RunTransaction['Moves'].append((FullPath_SourceFile, FullPath_TargetFile))
+    return True
+
+def StageWrite(FullPath, Data, Append = True):
+    #Don't log this function
+    #Within an open run, stage a write of Data to the file at FullPath (as it is on disk), either replacing the file or appending to it, and return True; otherwise return False, so that the caller writes the file itself
+    with RunTransactionLock:
+        if(RunTransaction is None): return False
+        Staged = RunTransaction['Writes'].setdefault(FullPath, {'Appends': [], 'Base': None})
+        if Append: Staged['Appends'].append(Data)
+        else: Staged.update({'Appends': [], 'Base': Data}) #A replacement makes any earlier staged appends moot
+    return True
+
+def StartProfiling(Profile = False, TraceMemory = False):
+    #Don't log this function
+    #Switch on the optional, more expensive measurements: cProfile of every function call (main thread only), and tracemalloc for the peak memory of each MeasureStep
+    global Profiler
+    if Profile:
+        Profiler = cProfile.Profile()
+        Profiler.enable()
+    if TraceMemory and not tracemalloc.is_tracing(): tracemalloc.start()
+
+def StopProfiling():
+    #Don't log this function
+    #Stop profiling, but keep the profile so that BuildPerformanceReport can still include it
+    if(Profiler is not None): Profiler.disable()
+    if tracemalloc.is_tracing(): tracemalloc.stop()
+
+def TableExists(FullPath):
+    #Don't log this function
+    #Whether a table exists in the current StorageFormat, either on disk or only as rows staged in the open run
+    FullPath = BuildTablePath(FullPath)
+    return os.path.exists(FullPath) or ((RunTransaction is not None) and (FullPath in RunTransaction['Writes']))
+
+def ValidateColumnHeader(ActualColumnsAsList, CallStack, ExpectedColumnsAsList, LogEntries, ParentExecutionGUID):
+    Begin = datetime.now()
+    CurrentFunction = 'ValidateColumnHeader'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Issue = ''
+    Parameters = {
+        'ActualColumnsAsList': ActualColumnsAsList
+        , 'ExpectedColumnsAsList': ExpectedColumnsAsList
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        #Determine extra columns in actual
+        ExtraColumns = [item for item in ActualColumnsAsList if item not in ExpectedColumnsAsList]
+
+        #Determine columns missing from actual
+        MissingColumns = [item for item in ExpectedColumnsAsList if item not in ActualColumnsAsList]
+        
+        #Report extra & missing columns
+        if(len(ExtraColumns) > 0):
+            Issue = 'ExtraColumns'
+            Result = 'Extra column(s) found: ' + str(ExtraColumns)
+            LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error & continue
+        if(len(MissingColumns) > 0):
+            if Issue != '': Issue = Issue + '.'
+            Issue += 'MissingColumns'
+            if(len(Result) > 0): Result += '; '
+            Result += 'Column(s) missing: ' + str(MissingColumns)
+            LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error & continue
+        if(len(ExtraColumns) + len(MissingColumns) == 0):
+            #Log the step
+            LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
+        
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result, Issue
+
+def ValidateLogFile(CallStack, LogEntries, ParentExecutionGUID):
+    #Variable(s) defined outside of this function, but set within this function
+    global IsValid_LogFile
+
+    Begin = datetime.now()
+    CurrentFunction = 'ValidateLogFile'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    Issue = ''
+    Parameters = {
+        'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    try:
+        IsValid_LogFile = False
+        if(LogBackend == 'SQLite'): ConnectLogDatabase().close() #The log database creates its own table and indexes if they don't exist
+        elif not os.path.exists(FullPath_LogFile) or (os.path.getsize(FullPath_LogFile) == 0):
+            #Start the log file with just its column header
+            with open(FullPath_LogFile, 'w', newline = '') as f: f.write(DelimiterDefault.join(FileDefinition_Log) + os.linesep)
+        else:
+            #Read only the first line of the log file, however large it is; the column header is all that needs validating
+            with open(FullPath_LogFile, 'r', newline = '', encoding = 'utf-8-sig') as f: ColumnHeader = next(csv.reader(f, delimiter = DelimiterDefault), [])
+            LogEntries, Result, Issue = ValidateColumnHeader([Column.strip() for Column in ColumnHeader], CallStack, FileDefinition_Log, LogEntries, ParentExecutionGUID)
+        if(Result == Result_Success): IsValid_LogFile = True
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath_LogFile, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result
+
+def ValidateSilverDimension(CallStack, Dimension, LogEntries, ParentExecutionGUID):
+    Begin = datetime.now()
+    CurrentFunction = 'ValidateSilverDimension'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    FullPath_Silver_Dimension_Current = ''
+    Parameters = {
+        'Dimension': Dimension
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    Result = Result_Success
+    SilverDimension = pd.DataFrame() #Initialize to an empty DataFrame
+    try:
+        #Build the full path to the Silver Dimension file
+        FullPath_Silver_Dimension_Current = os.path.join(FullPath_Silver_Dimension, f'{Dimension}.txt')
+        FileDefinition = globals()[f'Silver_Dimension_Definition_{Dimension}']
+
+        #Create the table with just its column header if it doesn't exist
+        if not os.path.exists(BuildTablePath(FullPath_Silver_Dimension_Current)): WriteTable(FullPath_Silver_Dimension_Current, pd.DataFrame(columns = FileDefinition), Staged = False) #At once, even within an open run, as the table is read from disk next
+
+        #Get the Silver Dimension; it's read from disk only the first time in a run, or if it has changed since
+        SilverDimension = RetrieveCachedFile(FullPath_Silver_Dimension_Current)
+
+        #Validate the column headers
+        LogEntries, ValidationResult, _ = ValidateColumnHeader(SilverDimension.columns.tolist(), CallStack, FileDefinition, LogEntries, ParentExecutionGUID)
+        if(ValidationResult != Result_Success): raise Exception('Error in ValidateColumnHeader') #Log the error and don't continue
+
+        #Log the step
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, File = FullPath_Silver_Dimension_Current, ParentExecutionGUID = ParentExecutionGUID, Result = Result, RowCount = len(SilverDimension), Severity = Severity_Info)
+
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallingObject, CallStack, ExecutionGUID, LogEntries, Parameters, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return LogEntries, Result, FullPath_Silver_Dimension_Current, SilverDimension
+
+def WriteToLogFile(CallStack, LogEntries, ParentExecutionGUID):
+    #Variable(s) defined outside of this function, but set within this function
+    global FullPath_LogFile
+
+    #Don't log the results of this function
+    Begin = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f') #Format the value as YYYY-MM-DD HH:MM:SS.ms
+    CurrentFunction = 'WriteToLogFile'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    Parameters = {
+        'DelimiterDefault': DelimiterDefault
+        , 'FullPath_Root': FullPath_Root
+        , 'ParentExecutionGUID': ParentExecutionGUID
+    }
+    try:
+        #Set the full path to the log file to /<Root>/Admin/Log.txt
+        FullPath_LogFile = os.path.join(FullPath_Root, 'Admin', 'Log.txt')
+
+        #Write whatever hasn't been written yet; entries from a plain list are written through a LogSink so they are handled the same way
+        if not isinstance(LogEntries, LogSink):
+            Entries = LogEntries
+            LogEntries = LogSink()
+            LogEntries.Buffer = [Entry if isinstance(Entry, LogRecord) else LogRecord(**Entry) for Entry in Entries]
+        LogEntries.Flush()
+    except Exception as e:
+        Result = BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, False, Parameters) #Build the error message
+        print(Result) #Report the error
+
+def WritePerformanceReport(Report, FullPath = ''):
+    #Don't log this function
+    #Write the report built by BuildPerformanceReport as both JSON and text, by default to /<Root>/Admin/Performance/<Caller>.<Timestamp>; return the full path of the JSON file
+    if(FullPath == ''): FullPath = os.path.join(FullPath_Admin, 'Performance', f'{os.path.splitext(os.path.basename(Report["Caller"]))[0]}.{datetime.now().strftime("%Y%m%d%H%M%S%f")}')
+    elif FullPath.lower().endswith(('.json', '.txt')): FullPath = os.path.splitext(FullPath)[0]
+    os.makedirs(os.path.dirname(FullPath), exist_ok = True)
+    with open(f'{FullPath}.json', 'w') as f: json.dump(Report, f, indent = 2)
+    with open(f'{FullPath}.txt', 'w', newline = '') as f: f.write(FormatPerformanceReport(Report))
+    return f'{FullPath}.json'
+
+def WriteBinaryTable(FullPath, Data, FullPath_Target):
+    #Don't log this function
+    #Write a table to FullPath in the binary format of the extension of FullPath_Target (Feather or Parquet); FullPath is a temporary file that is put in place of FullPath_Target later, so its own extension says nothing about the format
+    pyarrow = ImportStorageEngine()
+    Table = pyarrow.Table.from_pandas(Data, preserve_index = False)
+    if(os.path.splitext(FullPath_Target)[1] == StorageFormats['Feather']): pyarrow.feather.write_feather(Table, FullPath, compression = 'zstd')
+    else: pyarrow.parquet.write_table(Table, FullPath, compression = 'zstd')
+
+def WriteFactPartitions():
+    #Don't log this function
+    #Write the partition manifest of the Silver Transaction fact if any partition was appended to since it was last written; within an open run, the write is staged and made by CommitRun
+    if(len(FactPartitionsChanged) == 0): return
+    Partitions = pd.DataFrame(list(FactPartitions.values()), columns = FileDefinition_FactPartition)
+    for Column in ['DateMax', 'DateMin']: Partitions[Column] = pd.to_datetime(Partitions[Column]).dt.strftime('%Y-%m-%d')
+    WriteTextFile(FullPath_Silver_Fact_Transaction_Partitions, Partitions, Append = False)
+    FactPartitionsChanged.clear()
+
+def WriteJournal(FullPath, Operations):
+    #Don't log this function
+    #Write a commit's journal and make sure it's on disk before anything it lists is touched
+    with open(FullPath, 'w', newline = '') as f:
+        Writer = csv.writer(f, delimiter = DelimiterDefault, lineterminator = os.linesep)
+        Writer.writerow(FileDefinition_Journal)
+        Writer.writerows(Operations)
+        f.flush()
+        os.fsync(f.fileno())
+
+def WriteStagedFile(FullPath, FullPath_Temporary, Staged):
+    #Don't log this function
+    #Write the complete new version of a file (its replacement, or what's on disk, followed by every staged append) to FullPath_Temporary, for CommitRun to put in place
+    Appends = pd.concat(Staged['Appends'], ignore_index = True) if len(Staged['Appends']) > 0 else None
+    if(os.path.splitext(FullPath)[1] == StorageFormats['Text']):
+        if(Staged['Base'] is not None): Staged['Base'].to_csv(FullPath_Temporary, sep = DelimiterDefault, index = False, lineterminator = os.linesep)
+        elif os.path.exists(FullPath): shutil.copyfile(FullPath, FullPath_Temporary) #Copy the bytes rather than parsing and writing the file again
+        if(Appends is not None): Appends.to_csv(FullPath_Temporary, sep = DelimiterDefault, header = not os.path.exists(FullPath_Temporary), index = False, mode = 'a', lineterminator = os.linesep)
+    else:
+        Base = Staged['Base'] if Staged['Base'] is not None else ReadTableFile(FullPath) if os.path.exists(FullPath) else None
+        WriteBinaryTable(FullPath_Temporary, pd.concat([Part for Part in [Base, Appends] if Part is not None], ignore_index = True), FullPath)
+    with open(FullPath_Temporary, 'ab') as f: os.fsync(f.fileno()) #On disk before the commit point
+
+def WriteTable(FullPath, Data, Append = False, Staged = True):
+    #Don't log this function
+    #Write a Silver or Gold table in the current StorageFormat, either replacing it or appending Data to it; within an open run, the write is staged and made by CommitRun, unless Staged is False
+    FullPath = BuildTablePath(FullPath)
+    if(Staged) and StageWrite(FullPath, Data, Append): return
+    if(StorageFormat == 'Text'):
+        Append = Append and os.path.exists(FullPath) #Appending to a table that doesn't exist yet needs the column header too
+        Data.to_csv(FullPath, sep = DelimiterDefault, header = not Append, index = False, mode = 'a' if Append else 'w')
+        return
+    if(Append) and os.path.exists(FullPath): Data = pd.concat([ReadTableFile(FullPath), Data], ignore_index = True) #The binary formats can't be appended to, so rewrite the table with the new rows added
+    FullPath_Temporary = FullPath + '.tmp'
+    WriteBinaryTable(FullPath_Temporary, Data, FullPath)
+    os.replace(FullPath_Temporary, FullPath) #Only replace the table once the new file is complete
+
+def WriteTextFile(FullPath, Data, Append = True):
+    #Don't log this function
+    #Write a Text file that isn't a table (a configuration file or the manifest), Data already in the order of its columns, either appending to it or replacing it; within an open run, the write is staged and made by CommitRun
+    if StageWrite(FullPath, Data, Append): return
+    if Append:
+        Data.to_csv(FullPath, sep = DelimiterDefault, header = False, index = False, mode = 'a', lineterminator = os.linesep)
+        return
+    FullPath_Temporary = FullPath + '.tmp' #Write to a temporary file first so that a failure never leaves only part of the file
+    Data.to_csv(FullPath_Temporary, sep = DelimiterDefault, index = False, lineterminator = os.linesep)
+    os.replace(FullPath_Temporary, FullPath)
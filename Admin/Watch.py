@@ -0,0 +1,299 @@
+""""
+DESCRIPTION
+    Run the pipeline continuously: watch /<Root>/Bronze/Inbound/<Source>/ and push each file through Bronze and Silver as soon as it has finished landing, instead of waiting for the next scheduled run
+    The folder layout, log file, compiled configurations, manifest and Silver dimension caches are set up once and kept warm between files; configurations are compiled again whenever a configuration file changes
+    Changes are picked up from the operating system (inotify, FSEvents or ReadDirectoryChangesW) if the watchdog package is installed, and by polling the inbound folders otherwise
+    A file is only processed once its size and modified time have stayed the same for DebounceSeconds, so that a file still being written or copied isn't read half-way
+    Files wait in a queue of at most QueueCapacity files for a single worker; while the queue is full, newly settled files wait where they are
+
+PARAMETERS
+    DebounceSeconds
+        - Optional
+        - How long a file must stay unchanged before it's processed (default DebounceSeconds)
+    PollIntervalSeconds
+        - Optional
+        - How often the inbound folders are scanned when polling, and how often files are checked for having settled (default PollIntervalSeconds)
+    QueueCapacity
+        - Optional
+        - The most files waiting to be processed at once (default QueueCapacity)
+    UsePolling
+        - Optional
+        - Poll even if watchdog is installed
+"""
+
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import os
+import queue
+import signal
+import threading
+import time
+import LoadBronzeToSilver
+import LoadFileToBronze
+import Utilities
+import uuid
+from datetime import datetime
+try:
+    from watchdog.observers import Observer #Optional; without it, the inbound folders are polled
+except ImportError:
+    Observer = None
+
+#****************************************************************************************
+#GLOBAL VARIABLES
+#   Set these variables to either empty or hard-coded values
+#   These variables can change value by any function
+#****************************************************************************************
+Candidates = {} #Files seen in an inbound folder but not yet queued, keyed by full path: ((Size, ModifiedTime), when that size & modified time were first seen)
+CandidatesLock = threading.Lock() #Candidates is added to by the watchdog thread too
+ConfigurationModifiedTimes = None #The modified times of the configuration files when they were last compiled
+CurrentScriptFile = os.path.realpath(__file__)
+DebounceSeconds = 2.0 #How long a file must stay unchanged before it's processed
+Failed = {} #Files that couldn't be processed and were left where they were, keyed by full path: (Size, ModifiedTime); they're tried again only once they change
+LogEntries = Utilities.LogSink() #Writes the log entries of the watch to the log file in batches as it goes
+PollIntervalSeconds = 1.0 #How often the inbound folders are scanned when polling, and how often files are checked for having settled
+QueueCapacity = 100 #The most files waiting to be processed at once
+Queued = set() #Files in WorkQueue or being processed, so that they aren't queued twice
+Stopped = threading.Event() #Set to stop watching; the file being processed is finished first
+WorkQueue = None #A queue.Queue of (Source, full path) of settled files, created by Main
+
+#****************************************************************************************
+#CLASSES
+#****************************************************************************************
+class InboundEventHandler:
+    #Receives file system events from watchdog and notes every file created, changed or moved into an inbound folder; whether it has settled is decided by QueueSettledFiles, as when polling
+    def dispatch(self, Event):
+        if Event.is_directory: return
+        NoteCandidate(getattr(Event, 'dest_path', '') or Event.src_path)
+
+#****************************************************************************************
+#FUNCTIONS
+#****************************************************************************************
+def FindCandidates():
+    #Don't log this function
+    #Note every file in every /<Root>/Bronze/Inbound/<Source>/ folder, with one directory listing per folder
+    with os.scandir(Utilities.FullPath_Bronze_Inbound) as Sources:
+        for Source in Sources:
+            if not Source.is_dir(): continue
+            with os.scandir(Source.path) as Files:
+                for File in Files:
+                    if File.is_file(): NoteCandidate(File.path)
+
+def LogStep(Begin, CallStack, ExecutionGUID, Parameters, **VariedParameters): #The explicit parameters are required; anything passed into **VariedParameters is optional; different parameters may be passed into **VariedParameters
+    #Even though this local function calls another of the same name in a different script, keep this local function to be able to use "**VariedParameters"
+    #Variable(s) defined outside of this function, but set within this function
+    global LogEntries
+    #Add the step to the current set
+    LogEntries = Utilities.LogStep(Begin, CurrentScriptFile, CallStack, ExecutionGUID, LogEntries, Parameters, **VariedParameters)
+
+def Main(DebounceSeconds = None, PollIntervalSeconds = None, QueueCapacity = None, UsePolling = False):
+    #Variable(s) defined outside of this function, but set within this function
+    global LogEntries
+    global WorkQueue
+
+    #Local variables
+    Begin = datetime.now()
+    CurrentFunction = r'Main'
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    FileObserver = None
+    Parameters = {
+        'DebounceSeconds': DebounceSeconds
+        , 'PollIntervalSeconds': PollIntervalSeconds
+        , 'QueueCapacity': QueueCapacity
+        , 'UsePolling': UsePolling
+    }
+    Result = Utilities.Result_Success
+    Worker = None
+
+    #A setting passed in replaces its default for the whole watch, since the worker reads the global variables
+    for Setting, Value in [('DebounceSeconds', DebounceSeconds), ('PollIntervalSeconds', PollIntervalSeconds), ('QueueCapacity', QueueCapacity)]:
+        if(Value is not None): globals()[Setting] = Value
+        Parameters[Setting] = globals()[Setting]
+    DebounceSeconds, PollIntervalSeconds, QueueCapacity = Parameters['DebounceSeconds'], Parameters['PollIntervalSeconds'], Parameters['QueueCapacity']
+    Stopped.clear()
+
+    #Perform the actions that could cause the entire script to fail; if this block fails, report the failure, don't log the failure, and don't continue
+    try:
+        #Set global variables to be used downstream
+        LogEntries, Result = Utilities.SetGlobalVariables(CurrentScriptFile, CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in SetGlobalVariables') #Log the error and don't continue
+
+        #Validate the log file so that all subsequent steps & errors can be properly logged
+        LogEntries, Result = Utilities.ValidateLogFile(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception(Result) #Report the error and don't continue - can't log the error because log file is invalid
+
+        #Get the compiled configurations, the manifest and the mappings once; they're kept for as long as the watch runs
+        Result = RefreshConfigurations(CurrentFunction, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in RefreshConfigurations') #Log the error and don't continue
+        LogEntries, Result = Utilities.BeginRun(CurrentFunction, LogEntries, ExecutionGUID) #Finish or undo the commit of a run that crashed before the manifest is read; each file then opens a run of its own
+        if(Result != Utilities.Result_Success): raise Exception('Error in BeginRun') #Log the error and don't continue
+        LogEntries, Result = Utilities.RetrieveManifest(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveManifest') #Log the error and don't continue
+        LogEntries, Result = Utilities.RetrieveMappings(CurrentFunction, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in RetrieveMappings') #Log the error and don't continue
+
+    except Exception as e:
+        print(Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, False, Parameters)) #Report the error
+
+    if(Utilities.IsValid_LogFile) and (Result == Utilities.Result_Success):
+        try:
+            #Stop cleanly when asked to by the service manager, as on Ctrl+C
+            if(threading.current_thread() is threading.main_thread()): signal.signal(signal.SIGTERM, lambda *_: Stopped.set())
+
+            #Start the worker, then the watch; files already waiting are picked up by the first scan
+            WorkQueue = queue.Queue(maxsize = QueueCapacity)
+            Worker = threading.Thread(target = ProcessQueue, args = (CurrentFunction, ExecutionGUID), daemon = True)
+            Worker.start()
+            if(Observer is not None) and not UsePolling:
+                FileObserver = Observer()
+                FileObserver.schedule(InboundEventHandler(), Utilities.FullPath_Bronze_Inbound, recursive = True)
+                FileObserver.start()
+            Parameters['Watcher'] = 'Polling' if FileObserver is None else type(FileObserver).__name__
+            LogStep(Begin, CurrentFunction, ExecutionGUID, Parameters, Action = 'Start', ParentExecutionGUID = '', Result = Result, Severity = Utilities.Severity_Info)
+            print(f'Watching {Utilities.FullPath_Bronze_Inbound} ({Parameters["Watcher"]}); press Ctrl+C to stop')
+
+            FindCandidates()
+            NextScan = time.monotonic() + PollIntervalSeconds
+            while not Stopped.wait(min(PollIntervalSeconds, DebounceSeconds)):
+                if(FileObserver is None) and (time.monotonic() >= NextScan):
+                    FindCandidates()
+                    NextScan = time.monotonic() + PollIntervalSeconds
+                QueueSettledFiles()
+
+        except KeyboardInterrupt:
+            pass
+
+        except Exception as e:
+            Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+            LogStep(Begin, CurrentFunction, ExecutionGUID, Parameters, ParentExecutionGUID = '', Result = Result, Severity = Utilities.Severity_Error) #Log the error
+            print(Result) #Report the error
+
+        finally:
+            #Let the worker finish the file it's on, and leave anything still queued for the next watch or run
+            Stopped.set()
+            if(FileObserver is not None):
+                FileObserver.stop()
+                FileObserver.join()
+            if(Worker is not None): Worker.join()
+            LogStep(Begin, CurrentFunction, ExecutionGUID, Parameters, Action = 'Stop', ParentExecutionGUID = '', Result = Result, Severity = Utilities.Severity_Info)
+            Utilities.WriteToLogFile(CurrentFunction, LogEntries, ExecutionGUID)
+    return Result
+
+def NoteCandidate(FullPath):
+    #Don't log this function
+    #Only files directly in an inbound source folder are candidates, and only once: queued files and files that failed without changing since are left alone
+    if(os.path.dirname(os.path.dirname(FullPath)) != Utilities.FullPath_Bronze_Inbound.rstrip(os.sep)): return
+    with CandidatesLock:
+        if(FullPath not in Queued): Candidates.setdefault(FullPath, None)
+
+def ProcessFile(CallStack, FullPath, ParentExecutionGUID, Source):
+    #Push one file through Bronze and, if it was staged, through Silver; everything set up by Main is reused
+
+    #Variable(s) defined outside of this function, but set within this function
+    global LogEntries
+
+    #Local variables
+    Begin = datetime.now()
+    CurrentFunction = 'ProcessFile'
+    CallStack = f'{CallStack} > {CurrentFunction}' #Add the current function to the call stack
+    ExecutionGUID = str(uuid.uuid4()) #Generate a new GUID for logging the function
+    FileName = os.path.basename(FullPath)
+    Parameters = {
+        'FullPath': FullPath
+        , 'ParentExecutionGUID': ParentExecutionGUID
+        , 'Source': Source
+    }
+    Result = Utilities.Result_Success
+    try:
+        #Pick up any change to the configuration files since the last file
+        Result = RefreshConfigurations(CallStack, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in RefreshConfigurations') #Log the error and don't continue
+
+        #Bronze moves the file either to /<Root>/Silver/Inbound/<Source>/ or to /<Root>/Bronze/Error/<Source>/; a watch never ends the way a run does, so each layer of each file is its own run
+        LogEntries, Result = Utilities.BeginRun(CallStack, LogEntries, ExecutionGUID)
+        if(Result != Utilities.Result_Success): raise Exception('Error in BeginRun') #Log the error and don't continue
+        Context = LoadFileToBronze.ProcessInboundFolder(CallStack, os.path.dirname(FullPath), ExecutionGUID, Source, FileNames = [FileName])
+        LogEntries, CommitResult = Utilities.CommitRun(CallStack, LogEntries, ExecutionGUID) #Make the move even when the file failed, as it may be to the Error folder; Silver only sees the file once it has been moved
+        Result = Context['Result']
+        if(Result != Utilities.Result_Success): raise Exception('Error in LoadFileToBronze.ProcessInboundFolder') #Log the error and don't continue
+        if(CommitResult != Utilities.Result_Success): raise Exception('Error in CommitRun') #Log the error and don't continue
+
+        #Only a file that was staged for Silver goes on to Silver
+        if os.path.exists(os.path.join(Utilities.FullPath_Silver_Inbound, Source, FileName)):
+            LogEntries, Result = Utilities.BeginRun(CallStack, LogEntries, ExecutionGUID)
+            if(Result != Utilities.Result_Success): raise Exception('Error in BeginRun') #Log the error and don't continue
+            Result = LoadBronzeToSilver.ProcessInboundFolder(CallStack, ExecutionGUID, Source, FileNames = [FileName])
+            Utilities.FlushMappings() #Write the mappings and ToMap rows of each file once it's loaded
+            LogEntries, CommitResult = Utilities.CommitRun(CallStack, LogEntries, ExecutionGUID)
+            if(Result != Utilities.Result_Success): raise Exception('Error in LoadBronzeToSilver.ProcessInboundFolder') #Log the error and don't continue
+            if(CommitResult != Utilities.Result_Success): raise Exception('Error in CommitRun') #Log the error and don't continue
+
+        #Log the step
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, File = FullPath, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Info)
+
+    except Exception as e:
+        Result = Utilities.BuildErrorMessage(CurrentFunction, CurrentScriptFile, e, True) #Build the error message
+        LogStep(Begin, CallStack, ExecutionGUID, Parameters, File = FullPath, ParentExecutionGUID = ParentExecutionGUID, Result = Result, Severity = Utilities.Severity_Error) #Log the error
+        print(Result) #Report the error
+
+    finally:
+        #Return the result
+        return Result
+
+def ProcessQueue(CallStack, ParentExecutionGUID):
+    #Don't log this function
+    #The worker: process queued files one at a time until the watch stops; the loaders keep per-source state in global variables, so there's only ever one worker
+    while not Stopped.is_set():
+        try: Source, FullPath = WorkQueue.get(timeout = PollIntervalSeconds)
+        except queue.Empty: continue
+        try:
+            if os.path.exists(FullPath):
+                FileStatus = os.stat(FullPath)
+                ProcessFile(CallStack, FullPath, ParentExecutionGUID, Source)
+                if os.path.exists(FullPath): Failed[FullPath] = (FileStatus.st_size, FileStatus.st_mtime_ns) #Neither layer took the file, so don't try it again until it changes
+        finally:
+            with CandidatesLock: Queued.discard(FullPath)
+            WorkQueue.task_done()
+
+def QueueSettledFiles():
+    #Don't log this function
+    #Queue every candidate whose size and modified time haven't changed for DebounceSeconds; a candidate that can't be queued because the queue is full is tried again next time
+    Now = time.monotonic()
+    with CandidatesLock: Paths = list(Candidates)
+    for FullPath in Paths:
+        try: FileStatus = os.stat(FullPath)
+        except FileNotFoundError:
+            with CandidatesLock: Candidates.pop(FullPath, None)
+            continue
+        Signature = (FileStatus.st_size, FileStatus.st_mtime_ns)
+        if(Failed.get(FullPath) == Signature):
+            with CandidatesLock: Candidates.pop(FullPath, None)
+            continue
+        with CandidatesLock:
+            Seen = Candidates.get(FullPath)
+            if(Seen is None) or (Seen[0] != Signature):
+                Candidates[FullPath] = (Signature, Now) #New or still changing; start the wait again
+                continue
+            if(Now - Seen[1] < DebounceSeconds): continue
+            try: WorkQueue.put_nowait((os.path.basename(os.path.dirname(FullPath)), FullPath))
+            except queue.Full: return
+            Candidates.pop(FullPath)
+            Failed.pop(FullPath, None)
+            Queued.add(FullPath)
+
+def RefreshConfigurations(CallStack, ParentExecutionGUID):
+    #Don't log this function
+    #Compile the configurations again only if a configuration file was modified since they were last compiled; CompileConfigurations logs itself
+    global ConfigurationModifiedTimes
+    global LogEntries
+    ModifiedTimes = [os.stat(FullPath).st_mtime_ns if os.path.exists(FullPath) else None for FullPath in [Utilities.FullPath_Configurations_File, Utilities.FullPath_Configurations_Column]]
+    if(ModifiedTimes == ConfigurationModifiedTimes): return Utilities.Result_Success
+    LogEntries, Result = Utilities.CompileConfigurations(CallStack, LogEntries, ParentExecutionGUID)
+    if(Result == Utilities.Result_Success): ConfigurationModifiedTimes = ModifiedTimes
+    return Result
+
+#****************************************************************************************
+#ENTRY
+#****************************************************************************************
+if __name__ == '__main__':
+    Main()
@@ -0,0 +1,69 @@
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import os
+import subprocess
+import sys
+import pandas as pd
+import pytest
+
+#****************************************************************************************
+#GLOBAL VARIABLES
+#****************************************************************************************
+FullPath_Admin = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Admin')
+sys.path.insert(0, FullPath_Admin) #The pipeline's modules import each other by name from /Admin/
+
+import Utilities
+
+ColumnConfigurationDefaults = {Column: '' for Column in Utilities.FileDefinition_Configuration_Column}
+Columns_Checking = [ #A checking account export whose Merchant column looks up the Seller dimension
+    {'ColumnName_Bronze': 'Date', 'ColumnName_File': 'Date', 'ColumnName_Silver': 'Date', 'ConfigurationColumnOrder': 1, 'ConfigurationFileID': 1, 'Datatype': 'Date', 'IsNaturalKey': 'Y'}
+    , {'ColumnName_Bronze': 'Amount', 'ColumnName_File': 'Amount', 'ColumnName_Silver': 'Amount', 'ConfigurationColumnOrder': 2, 'ConfigurationFileID': 1, 'Datatype': 'Decimal', 'IsNaturalKey': 'Y'}
+    , {'ColumnName_Bronze': 'Merchant', 'ColumnName_File': 'Merchant', 'ColumnName_Silver': 'SellerGUID', 'ConfigurationColumnOrder': 3, 'ConfigurationFileID': 1, 'Datatype': 'Text', 'IsNaturalKey': 'Y', 'Transformation_BronzeToSilver_Type': 'Lookup'}
+]
+Files_Checking = [{'Account': 'Checking', 'ChunkSize': 2, 'ConfigurationFileID': 1, 'Delimiter': ',', 'Source': 'BankA'}]
+
+#****************************************************************************************
+#FUNCTIONS
+#****************************************************************************************
+def ReadText(FullPath):
+    #Read a pipe-delimited table as text, the way a person would look at it
+    return pd.read_csv(FullPath, sep = '|', dtype = str, keep_default_na = False)
+
+def RunPipeline(Root, *Arguments):
+    #Run a Pipeline command against the layout at Root in a new process, as it runs from the command line, so that no state is carried over from one run to the next
+    Code = 'import sys, Utilities; Utilities.RootFolder = sys.argv[1]; import Pipeline; print(Pipeline.Main(sys.argv[2:]))'
+    Run = subprocess.run([sys.executable, '-c', Code, str(Root)] + list(Arguments), capture_output = True, cwd = FullPath_Admin, text = True, timeout = 300)
+    assert Run.returncode == 0, Run.stderr
+    return Run.stdout.strip().splitlines()[-1] if Run.stdout.strip() else ''
+
+def WriteConfigurations(Root, Files, Columns):
+    #Write the file level configurations (one dict per source) and column level configurations (one dict per column, blanks defaulted) to the layout's Admin folder
+    os.makedirs(os.path.join(Root, 'Admin'), exist_ok = True)
+    pd.DataFrame(Files, columns = Utilities.FileDefinition_Configuration_File).to_csv(os.path.join(Root, 'Admin', 'ConfigurationFile.txt'), sep = '|', index = False)
+    pd.DataFrame([{**ColumnConfigurationDefaults, **Column} for Column in Columns], columns = Utilities.FileDefinition_Configuration_Column).to_csv(os.path.join(Root, 'Admin', 'ConfigurationColumn.txt'), sep = '|', index = False)
+
+def WriteExport(Root, Source, FileName, Text):
+    #Drop an export into /<Root>/Bronze/Inbound/<Source>/, as a bank or retailer would
+    Folder = os.path.join(Root, 'Bronze', 'Inbound', Source)
+    os.makedirs(Folder, exist_ok = True)
+    with open(os.path.join(Folder, FileName), 'w') as f: f.write(Text)
+
+#****************************************************************************************
+#FIXTURES
+#****************************************************************************************
+@pytest.fixture
+def Layout(tmp_path):
+    #An empty folder layout for a test, with Utilities pointed at it and nothing left over from another test
+    Utilities.RootFolder = str(tmp_path)
+    LogEntries, Result = Utilities.SetGlobalVariables(__file__, 'Test', [], '')
+    assert Result == Utilities.Result_Success
+    Utilities.DerivedKeyDimensions.clear()
+    Utilities.DimensionCache.clear()
+    Utilities.FactPartitions = None
+    Utilities.FactPartitionsChanged.clear()
+    Utilities.NaturalKeyIndexes.clear()
+    Utilities.RunTransaction = None
+    yield tmp_path
+    Utilities.RunTransaction = None
+    Utilities.RootFolder = ''
@@ -0,0 +1,134 @@
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import os
+import pandas as pd
+import Utilities
+from conftest import Columns_Checking, Files_Checking, ReadText, RunPipeline, WriteConfigurations, WriteExport
+
+#****************************************************************************************
+#TESTS
+#****************************************************************************************
+def test_LoadsFileFromBronzeIntoSilver(Layout):
+    WriteConfigurations(Layout, Files_Checking, Columns_Checking)
+    WriteExport(Layout, 'BankA', 'Export1.csv', 'Date,Amount,Merchant\n2024-01-05,-4.50,Coffee Shop\n2024-01-20,-30.00,Book Store\n2024-02-01,-5.25,Coffee Shop\n')
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+
+    #Every row lands in the partition of its month, with its Seller
+    Fact = pd.concat([ReadText(os.path.join(Layout, 'Silver', 'Facts', 'Transaction', 'BankA', f'{Month}.txt')) for Month in ['2024-01', '2024-02']], ignore_index = True)
+    Sellers = ReadText(os.path.join(Layout, 'Silver', 'Dimension', 'Seller.txt')).set_index('Name')['SellerGUID']
+    assert Fact[['Date', 'Amount']].values.tolist() == [['2024-01-05', '-4.5'], ['2024-01-20', '-30.0'], ['2024-02-01', '-5.25']]
+    assert Fact['SellerGUID'].tolist() == [Sellers['Coffee Shop'], Sellers['Book Store'], Sellers['Coffee Shop']]
+    assert Fact['BatchID'].nunique() == 1
+
+    #Each Seller is added once, though it's in two chunks
+    assert sorted(Sellers.index) == ['Book Store', 'Coffee Shop']
+    assert Sellers['Coffee Shop'] == Utilities.BuildSurrogateKeys('Seller', pd.DataFrame({'Name': ['Coffee Shop']}), ['Name']).iloc[0]
+
+def test_LogsValuesThatDontMatchTheirDatatype(Layout):
+    WriteConfigurations(Layout, Files_Checking, Columns_Checking)
+    WriteExport(Layout, 'BankA', 'Export1.csv', 'Date,Amount,Merchant\n2024-01-05,-4.50,Coffee Shop\n01/20/2024,-30.00,Book Store\n2024-02-01,unknown,Coffee Shop\n2024-02-02,-1.00,Garage\n')
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+
+    #The rows are loaded, with what couldn't be converted missing, and one warning for the file says how much
+    Log = pd.read_csv(os.path.join(Layout, 'Admin', 'Log.txt'), sep = '|', names = Utilities.FileDefinition_Log, dtype = str, keep_default_na = False)
+    Warnings = Log[Log['Severity'] == Utilities.Severity_Warning]
+    assert len(Warnings) == 1
+    assert Warnings['Result'].iloc[0].endswith('Date (1), Amount (1)') and Warnings['RowCount'].iloc[0] == '2'
+
+def test_AppendsOverlappingDimensionMembersOnce(Layout):
+    WriteConfigurations(Layout, Files_Checking, Columns_Checking)
+
+    #The second export repeats two Sellers of the first, and the second run has to find them in the Seller dimension written by the first
+    WriteExport(Layout, 'BankA', 'Export1.csv', 'Date,Amount,Merchant\n2024-01-05,-4.50,Coffee Shop\n2024-01-20,-30.00,Book Store\n2024-01-21,-9.00,Coffee Shop\n')
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+    WriteExport(Layout, 'BankA', 'Export2.csv', 'Date,Amount,Merchant\n2024-02-01,-5.25,Coffee Shop\n2024-02-02,-12.00,Book Store\n2024-02-03,-60.00,Garage\n')
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+
+    Sellers = ReadText(os.path.join(Layout, 'Silver', 'Dimension', 'Seller.txt'))
+    assert sorted(Sellers['Name']) == ['Book Store', 'Coffee Shop', 'Garage']
+    assert Sellers['SellerGUID'].is_unique
+
+def test_LoadedFilesAreArchivedAndRepeatsAreNotReadAgain(Layout, monkeypatch):
+    WriteConfigurations(Layout, Files_Checking, Columns_Checking)
+    Export = 'Date,Amount,Merchant\n2024-01-05,-4.50,Coffee Shop\n'
+    WriteExport(Layout, 'BankA', 'Export1.csv', Export)
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+
+    #The loaded file is archived under its BatchID, so nothing is left in Silver/Inbound for the next run to look at
+    Inbound = os.path.join(Layout, 'Silver', 'Inbound', 'BankA')
+    assert os.listdir(Inbound) == []
+    assert os.listdir(os.path.join(Layout, 'Bronze', 'Archive', 'BankA')) == ['Export1.1.csv']
+
+    #A copy that reached Silver/Inbound anyway is hashed once, found to be a repeat and moved to the Error folder; after that, no run reads any file
+    with open(os.path.join(Inbound, 'Export2.csv'), 'w') as f: f.write(Export)
+    Hashed = []
+    HashFile = Utilities.HashFile
+    monkeypatch.setattr(Utilities, 'HashFile', lambda FullPath: (FullPath.endswith('.csv') and Hashed.append(os.path.basename(FullPath))) or HashFile(FullPath)) #Only the exports, not the configuration files
+    import LoadBronzeToSilver
+    LoadBronzeToSilver.Main()
+    assert Hashed == ['Export2.csv']
+    assert os.listdir(Inbound) == []
+    assert os.listdir(os.path.join(Layout, 'Bronze', 'Error', 'BankA')) == ['Export2.Duplicate.csv']
+    Hashed.clear()
+    LoadBronzeToSilver.Main()
+    assert Hashed == []
+
+def test_FactRowsPointAtExistingMembersWithRandomKeys(Layout):
+    #Coffee Shop was added before keys were derived, so its key is a random one that the fact rows have to find, rather than work out
+    WriteConfigurations(Layout, Files_Checking, Columns_Checking)
+    os.makedirs(os.path.join(Layout, 'Silver', 'Dimension'), exist_ok = True)
+    pd.DataFrame({'SellerGUID': ['7d1c4b8e-1f0a-4c3e-9a55-2b6f0e9d4a11'], 'DateTimeInserted': ['2023-01-01 00:00:00.000000'], 'Name': ['Coffee Shop']}).reindex(columns = Utilities.Silver_Dimension_Definition_Seller).to_csv(os.path.join(Layout, 'Silver', 'Dimension', 'Seller.txt'), sep = '|', index = False)
+    WriteExport(Layout, 'BankA', 'Export1.csv', 'Date,Amount,Merchant\n2024-01-05,-4.50,Coffee Shop\n2024-01-20,-30.00,Book Store\n')
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+
+    #Every fact row points at a member of the dimension; the existing member keeps its key, and the new one gets its derived key
+    Fact = ReadText(os.path.join(Layout, 'Silver', 'Facts', 'Transaction', 'BankA', '2024-01.txt'))
+    Sellers = ReadText(os.path.join(Layout, 'Silver', 'Dimension', 'Seller.txt')).set_index('Name')['SellerGUID']
+    assert Fact['SellerGUID'].tolist() == ['7d1c4b8e-1f0a-4c3e-9a55-2b6f0e9d4a11', Sellers['Book Store']]
+    assert Sellers['Book Store'] == Utilities.BuildSurrogateKeys('Seller', pd.DataFrame({'Name': ['Book Store']}), ['Name']).iloc[0]
+
+def test_PartitionsAreWrittenAndPruned(Layout, monkeypatch):
+    WriteConfigurations(Layout, Files_Checking + [{'Account': 'Card', 'ChunkSize': 1, 'ConfigurationFileID': 2, 'Delimiter': ',', 'Source': 'BankB'}], Columns_Checking + [{**Column, 'ConfigurationFileID': 2} for Column in Columns_Checking])
+    WriteExport(Layout, 'BankA', 'Export1.csv', 'Date,Amount,Merchant\n2024-01-05,-4.50,Coffee Shop\n2024-01-20,-30.00,Book Store\n2024-03-01,-5.25,Coffee Shop\n')
+    WriteExport(Layout, 'BankB', 'Export1.csv', 'Date,Amount,Merchant\n2024-03-02,-8.00,Garage\n2024-03-09,-9.00,Garage\n')
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+
+    #One partition per source and month, each described by the manifest
+    Partitions = ReadText(os.path.join(Layout, 'Silver', 'Facts', 'Transaction', 'Partitions.txt')).sort_values(['Source', 'Partition'])
+    assert Partitions[['Source', 'Partition', 'RowCount', 'DateMin', 'DateMax']].values.tolist() == [
+        ['BankA', '2024-01', '2', '2024-01-05', '2024-01-20']
+        , ['BankA', '2024-03', '1', '2024-03-01', '2024-03-01']
+        , ['BankB', '2024-03', '2', '2024-03-02', '2024-03-09']
+    ]
+
+    #A read opens only the partitions that can hold what it asks for
+    Opened = []
+    ReadTableFile = Utilities.ReadTableFile
+    monkeypatch.setattr(Utilities, 'ReadTableFile', lambda FullPath, Columns = None: Opened.append(os.path.relpath(FullPath, Utilities.FullPath_Silver_Fact_Transaction)) or ReadTableFile(FullPath, Columns))
+    Utilities.FactPartitions = None
+    Data = Utilities.ReadSilverFact(['Amount', 'Date'], DateFirst = '2024-03-02', DateLast = '2024-03-31')
+    assert sorted(Opened) == [os.path.join('BankB', '2024-03.txt')]
+    assert Data['Amount'].astype(float).tolist() == [-8.0, -9.0]
+    Opened.clear()
+    Data = Utilities.ReadSilverFact(['Amount'], Sources = ['BankA'], DateFirst = '2024-01-10')
+    assert sorted(Opened) == [os.path.join('BankA', '2024-01.txt'), os.path.join('BankA', '2024-03.txt')]
+    assert Data['Amount'].astype(float).tolist() == [-30.0, -5.25]
+
+def test_PartitionManifestIsWrittenOncePerRun(Layout):
+    LogEntries, Result = Utilities.BeginRun('Test', [], '')
+    for Day in ['2024-01-05', '2024-02-05']:
+        Utilities.AppendToSilverFact(pd.DataFrame({'Amount': [-1.0], 'BatchID': [1], 'Date': [Day]}).reindex(columns = Utilities.Silver_Fact_Definition_Transaction), 'BankA')
+
+    #Only the partitions are staged as the rows are appended; the manifest is written at commit
+    assert Utilities.FullPath_Silver_Fact_Transaction_Partitions not in Utilities.RunTransaction['Writes']
+    LogEntries, Result = Utilities.CommitRun('Test', LogEntries, '')
+    assert Result == Utilities.Result_Success
+    assert sorted(ReadText(Utilities.FullPath_Silver_Fact_Transaction_Partitions)['Partition']) == ['2024-01', '2024-02']
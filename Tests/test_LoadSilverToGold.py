@@ -0,0 +1,56 @@
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import os
+import pandas as pd
+import Utilities
+from conftest import Columns_Checking, Files_Checking, ReadText, RunPipeline, WriteConfigurations, WriteExport
+
+#****************************************************************************************
+#TESTS
+#****************************************************************************************
+def test_GoldIDsMatchSilverKeys(Layout):
+    WriteConfigurations(Layout, Files_Checking, Columns_Checking)
+
+    #Coffee Shop arrives in two runs; both work out the same key for it, without reading it back from the Seller dimension
+    WriteExport(Layout, 'BankA', 'Export1.csv', 'Date,Amount,Merchant\n2024-01-05,-4.50,Coffee Shop\n2024-01-20,-30.00,Book Store\n')
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+    WriteExport(Layout, 'BankA', 'Export2.csv', 'Date,Amount,Merchant\n2024-02-01,-5.25,Coffee Shop\n')
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+    RunPipeline(Layout, 'gold')
+
+    Sellers = ReadText(os.path.join(Layout, 'Silver', 'Dimension', 'Seller.txt')).set_index('Name')['SellerGUID']
+    Fact = ReadText(os.path.join(Layout, 'Silver', 'Facts', 'Transaction', 'BankA', '2024-02.txt'))
+    assert Fact['SellerGUID'].tolist() == [Sellers['Coffee Shop']]
+
+    #Gold relates to each Seller by the ID of its key
+    SpendByMonth = ReadText(os.path.join(Layout, 'Gold', 'Facts', 'SpendByMonth.txt'))
+    IDs = Utilities.ConvertSurrogateKeyToID(Sellers)
+    assert sorted(zip(SpendByMonth['Month'].str[:7], SpendByMonth['SellerID'].astype('int64'))) == [('2024-01', IDs['Book Store']), ('2024-01', IDs['Coffee Shop']), ('2024-02', IDs['Coffee Shop'])]
+
+def test_GoldAddsFilesLoadedAfterAFailedFile(Layout):
+    WriteConfigurations(Layout, [{**Files_Checking[0], 'ChunkSize': 1}], Columns_Checking)
+
+    #The last row of the first export can't be read, so the file fails after its first chunks were staged; none of them is committed
+    WriteExport(Layout, 'BankA', 'Export1.csv', 'Date,Amount,Merchant\n2024-01-05,-4.50,Coffee Shop\n2024-01-06,-1.00,Book Store\n2024-01-07,-2.00,"Garage\n')
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+    RunPipeline(Layout, 'gold')
+    assert not os.path.exists(os.path.join(Layout, 'Silver', 'Facts', 'Transaction', 'BankA', '2024-01.txt'))
+    assert ReadText(os.path.join(Layout, 'Silver', 'Dimension', 'Seller.txt')).empty
+    os.remove(os.path.join(Layout, 'Silver', 'Inbound', 'BankA', 'Export1.csv')) #Still waiting in Silver/Inbound, where it would stop the next run before Export2
+
+    #The next file is loaded, and Gold adds its rows
+    WriteExport(Layout, 'BankA', 'Export2.csv', 'Date,Amount,Merchant\n2024-01-10,-20.00,Garage\n')
+    RunPipeline(Layout, 'bronze')
+    RunPipeline(Layout, 'silver')
+    RunPipeline(Layout, 'gold')
+
+    Fact = ReadText(os.path.join(Layout, 'Silver', 'Facts', 'Transaction', 'BankA', '2024-01.txt'))
+    assert Fact['BatchID'].tolist() == ['1']
+    assert ReadText(os.path.join(Layout, 'Silver', 'Dimension', 'Seller.txt'))['Name'].tolist() == ['Garage']
+    SpendByMonth = ReadText(os.path.join(Layout, 'Gold', 'Facts', 'SpendByMonth.txt'))
+    assert pd.to_numeric(SpendByMonth['Amount']).sum() == -20.0
+    assert pd.to_numeric(SpendByMonth['TransactionCount']).sum() == 1
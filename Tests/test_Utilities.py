@@ -0,0 +1,300 @@
+#****************************************************************************************
+#REFERENCES
+#****************************************************************************************
+import os
+import subprocess
+import sys
+import pandas as pd
+import pytest
+import QueryLog
+import Utilities
+from conftest import FullPath_Admin, ReadText
+
+#****************************************************************************************
+#FUNCTIONS
+#****************************************************************************************
+def WriteDimension(Dimension, Names):
+    #Add members to a Silver dimension, each with its derived key
+    Members = pd.DataFrame({'DateTimeInserted': '2024-01-01 00:00:00.000000', 'Name': Names})
+    Members[f'{Dimension}GUID'] = Utilities.BuildSurrogateKeys(Dimension, Members, ['Name'])
+    Utilities.WriteTable(os.path.join(Utilities.FullPath_Silver_Dimension, f'{Dimension}.txt'), Members.reindex(columns = getattr(Utilities, f'Silver_Dimension_Definition_{Dimension}')), Staged = False)
+    return Members.set_index('Name')[f'{Dimension}GUID']
+
+def BuildLogEntry(ExecutionGUID, ParentExecutionGUID, Begin):
+    #A log entry with only what's needed to place it in a call tree
+    return Utilities.LogRecord(**{**{Column: '' for Column in Utilities.FileDefinition_Log}, 'Begin': Begin, 'ExecutionGUID': ExecutionGUID, 'ParentExecutionGUID': ParentExecutionGUID, 'Severity': Utilities.Severity_Info})
+
+def OpenLogFile(tmp_path, monkeypatch):
+    #Point the log at a new, validated Log.txt, and don't start the background flush, so that only the test decides when entries are written
+    FullPath = os.path.join(tmp_path, 'Log.txt')
+    with open(FullPath, 'w', newline = '') as f: f.write(Utilities.DelimiterDefault.join(Utilities.FileDefinition_Log) + os.linesep)
+    monkeypatch.setattr(Utilities, 'FullPath_LogFile', FullPath)
+    monkeypatch.setattr(Utilities, 'IsValid_LogFile', True)
+    monkeypatch.setattr(Utilities, 'LogBackend', 'Text')
+    monkeypatch.setattr(Utilities.LogSink, 'Start', lambda self: None)
+    return FullPath
+
+#****************************************************************************************
+#TESTS
+#****************************************************************************************
+def test_DerivedKeysAreStableAcrossRuns(Layout):
+    #The same name gets the same key and ID in every process, today and in any later version; these values must never change, or every key already written changes with them
+    Names = pd.DataFrame({'Name': ['Coffee Shop', 'Book Store', 'Coffee Shop']})
+    Keys = Utilities.BuildSurrogateKeys('Seller', Names, ['Name'])
+    assert Keys.tolist() == ['090feee4-ce6f-5857-91b2-8268773aa526', '578cd2a1-78a4-5fc4-a908-02caaaae55ca', '090feee4-ce6f-5857-91b2-8268773aa526']
+    assert Utilities.ConvertSurrogateKeyToID(Keys).tolist() == [4638143108381650309, -3654185055980113508, 4638143108381650309]
+
+    #A new process, with a different string hash seed, works out the same keys
+    Code = 'import Utilities, pandas as pd; print(Utilities.BuildSurrogateKeys("Seller", pd.DataFrame({"Name": ["Coffee Shop", "Book Store"]}), ["Name"]).tolist())'
+    Run = subprocess.run([sys.executable, '-c', Code], capture_output = True, cwd = FullPath_Admin, env = {**os.environ, 'PYTHONHASHSEED': '1'}, text = True)
+    assert Run.stdout.strip() == str(Keys[:2].tolist())
+
+    #A key belongs to its dimension, and only a Random key is new every time
+    assert Utilities.BuildSurrogateKeys('Brand', Names, ['Name']).iloc[0] != Keys.iloc[0]
+    Utilities.SurrogateKeyMode = 'Random'
+    try: assert Utilities.BuildSurrogateKeys('Seller', Names, ['Name']).iloc[0] != Keys.iloc[0]
+    finally: Utilities.SurrogateKeyMode = 'Derived'
+
+def test_ResolveMappingsSeparatesMappedFromToMap(Layout):
+    #Coffee Shop is mapped for the account; Garage isn't, and neither is anything for another account
+    pd.DataFrame([{'AccountGUID': 'A1', 'BrandGUID': 'B1', 'CategoryGUID': 'C1', 'DateTimeInserted': '2024-01-01 00:00:00.000000', 'ProductServiceGUID': 'P1', 'SellerGUID': 'S1', 'SourceValue': 'Coffee Shop'}], columns = Utilities.FileDefinition_Configuration_BrandCategoryProductServiceSeller).to_csv(Utilities.FullPath_Configurations_BrandCategoryProductServiceSeller, sep = '|', index = False)
+    LogEntries, Result = Utilities.RetrieveMappings('Test', [], '')
+    assert Result == Utilities.Result_Success
+
+    Data = Utilities.ResolveMappings(pd.DataFrame({'Description': ['Coffee Shop', 'Garage', 'Garage']}), 'A1', 'Description')
+    assert Data.loc[0, Utilities.MappingColumns].tolist() == ['B1', 'C1', 'P1', 'S1']
+    assert Data.loc[1:, Utilities.MappingColumns].isna().all().all()
+    Data = Utilities.ResolveMappings(pd.DataFrame({'Description': ['Garage', 'Coffee Shop']}), 'A2', 'Description')
+    assert Data[Utilities.MappingColumns].isna().all().all()
+
+    #Each unmapped value is added to ToMap once per account, however many rows and chunks it's in
+    Utilities.ResolveMappings(pd.DataFrame({'Description': ['Garage']}), 'A1', 'Description')
+    Utilities.FlushMappings()
+    ToMap = ReadText(Utilities.FullPath_Configurations_ToMap)
+    assert sorted(zip(ToMap['AccountGUID'], ToMap['SourceValue'])) == [('A1', 'Garage'), ('A2', 'Coffee Shop'), ('A2', 'Garage')]
+
+def test_RetrieveMappingsMovesNamedToMapRowsToTheBridge(Layout):
+    Keys = {Dimension: WriteDimension(Dimension, ['Car']) for Dimension in Utilities.MappingDimensions}
+    pd.DataFrame([
+        {'AccountGUID': 'A1', 'Brand': 'Car', 'Category': 'Car', 'DateTimeInserted': '2024-01-01 00:00:00.000000', 'ProductService': 'Car', 'Seller': 'Car', 'SourceValue': 'Garage'}
+        , {'AccountGUID': 'A1', 'Brand': 'Car', 'Category': 'Car', 'DateTimeInserted': '2024-01-01 00:00:00.000000', 'ProductService': 'Car', 'Seller': 'Unknown', 'SourceValue': 'Parking'} #Not a Seller yet, so it stays in ToMap
+        , {'AccountGUID': 'A1', 'DateTimeInserted': '2024-01-01 00:00:00.000000', 'SourceValue': 'Books'} #Not filled in yet
+    ], columns = Utilities.FileDefinition_Configuration_ToMap).to_csv(Utilities.FullPath_Configurations_ToMap, sep = '|', index = False)
+    LogEntries, Result = Utilities.RetrieveMappings('Test', [], '')
+    assert Result == Utilities.Result_Success
+
+    #Garage now resolves straight away, to the keys of its names
+    Data = Utilities.ResolveMappings(pd.DataFrame({'Description': ['Garage', 'Parking']}), 'A1', 'Description')
+    assert Data.loc[0, Utilities.MappingColumns].tolist() == [Keys[Dimension]['Car'] for Dimension in Utilities.MappingDimensions]
+    assert Data.loc[1, Utilities.MappingColumns].isna().all()
+
+    Utilities.FlushMappings()
+    assert ReadText(Utilities.FullPath_Configurations_BrandCategoryProductServiceSeller)['SourceValue'].tolist() == ['Garage']
+    assert sorted(ReadText(Utilities.FullPath_Configurations_ToMap)['SourceValue']) == ['Books', 'Parking']
+
+def test_RollbackToSavepointUndoesOnlyWhatWasStagedAfterIt(Layout):
+    Table = os.path.join(Utilities.FullPath_Silver_Dimension, 'Seller.txt')
+    Sellers = lambda Names: pd.DataFrame({'DateTimeInserted': '2024-01-01', 'Name': Names, 'SellerGUID': Names})
+    Utilities.WriteTable(Table, Sellers(['Book Store']), Staged = False)
+    LogEntries, Result = Utilities.BeginRun('Test', [], '')
+
+    #The first file loads; the second stages rows, a fact partition and a move, then fails
+    Utilities.WriteTable(Table, Sellers(['Garage']), Append = True)
+    Utilities.AppendToSilverFact(pd.DataFrame({'Amount': [-1.0], 'BatchID': [1], 'Date': ['2024-01-05']}).reindex(columns = Utilities.Silver_Fact_Definition_Transaction), 'BankA')
+    Savepoint = Utilities.CreateSavepoint()
+    assert Utilities.RetrieveCachedFile(Table)['Name'].tolist() == ['Book Store', 'Garage']
+    Utilities.WriteTable(Table, Sellers(['Coffee Shop']), Append = True)
+    Utilities.AppendToCachedFile(Table, Sellers(['Coffee Shop']))
+    Utilities.AppendToSilverFact(pd.DataFrame({'Amount': [-2.0, -3.0], 'BatchID': [2, 2], 'Date': ['2024-01-06', '2024-02-01']}).reindex(columns = Utilities.Silver_Fact_Definition_Transaction), 'BankA')
+    assert Utilities.StageMove(os.path.join(Layout, 'Export2.csv'), os.path.join(Layout, 'Archive', 'Export2.csv'))
+    Utilities.RollbackToSavepoint(Savepoint)
+
+    #The run reads and commits only what the first file staged
+    assert Utilities.RetrieveCachedFile(Table)['Name'].tolist() == ['Book Store', 'Garage']
+    assert Utilities.RunTransaction['Moves'] == []
+    assert Utilities.RetrieveFactPartitions()[('BankA', '2024-01')]['RowCount'] == 1
+    LogEntries, Result = Utilities.CommitRun('Test', [], '')
+    assert Result == Utilities.Result_Success
+    assert ReadText(Table)['Name'].tolist() == ['Book Store', 'Garage']
+    assert ReadText(Utilities.FullPath_Silver_Fact_Transaction_Partitions)[['Partition', 'RowCount', 'BatchIDMax']].values.tolist() == [['2024-01', '1', '1']]
+    assert not os.path.exists(os.path.join(Utilities.FullPath_Silver_Fact_Transaction, 'BankA', '2024-02.txt'))
+
+def StageRun(Layout):
+    #Open a run that appends a row to a table and moves a file, for the commit to crash part way through
+    Table = os.path.join(Utilities.FullPath_Silver_Dimension, 'Seller.txt')
+    Utilities.WriteTable(Table, pd.DataFrame({'DateTimeInserted': ['2024-01-01'], 'Name': ['Book Store'], 'SellerGUID': ['S1']}), Staged = False)
+    Moved = os.path.join(Layout, 'Export1.csv')
+    with open(Moved, 'w') as f: f.write('Date,Amount\n')
+    LogEntries, Result = Utilities.BeginRun('Test', [], '')
+    Utilities.WriteTable(Table, pd.DataFrame({'DateTimeInserted': ['2024-01-02'], 'Name': ['Garage'], 'SellerGUID': ['S2']}), Append = True)
+    assert Utilities.StageMove(Moved, os.path.join(Utilities.FullPath_Bronze_Archive, 'BankA', 'Export1.csv'))
+    return Table, Moved
+
+def test_RecoverRunRollsBackACrashBeforeTheCommitPoint(Layout, monkeypatch):
+    Table, Moved = StageRun(Layout)
+
+    #The run crashes with its journal prepared and every new file written next to its target, but before the commit point
+    Replace = os.replace
+    def CrashAtCommitPoint(Source, Target):
+        if(Target == Utilities.FullPath_Journal_Committed): raise OSError('Crashed')
+        Replace(Source, Target)
+    monkeypatch.setattr(Utilities.os, 'replace', CrashAtCommitPoint)
+    LogEntries, Result = Utilities.CommitRun('Test', [], '')
+    monkeypatch.undo()
+    assert Result != Utilities.Result_Success
+    assert os.path.exists(Utilities.FullPath_Journal_Prepared) and os.path.exists(Table + '.commit')
+
+    #The next run undoes it: nothing the crashed run did is left
+    assert Utilities.RecoverRun() == ('Rollback', 2)
+    assert not os.path.exists(Utilities.FullPath_Journal_Prepared) and not os.path.exists(Table + '.commit')
+    assert ReadText(Table)['Name'].tolist() == ['Book Store']
+    assert os.path.exists(Moved)
+
+def test_RecoverRunFinishesACrashAfterTheCommitPoint(Layout, monkeypatch):
+    Table, Moved = StageRun(Layout)
+
+    #The run crashes after the commit point, having replaced the table but not moved the file
+    ApplyJournal = Utilities.ApplyJournal
+    def CrashPartWay(Operations):
+        ApplyJournal(Operations[:1])
+        raise OSError('Crashed')
+    monkeypatch.setattr(Utilities, 'ApplyJournal', CrashPartWay)
+    LogEntries, Result = Utilities.CommitRun('Test', [], '')
+    monkeypatch.undo()
+    assert Result != Utilities.Result_Success
+    assert os.path.exists(Utilities.FullPath_Journal_Committed) and os.path.exists(Moved)
+
+    #The next run finishes it, without doing again what was already done
+    assert Utilities.RecoverRun() == ('Replay', 2)
+    assert not os.path.exists(Utilities.FullPath_Journal_Committed)
+    assert ReadText(Table)['Name'].tolist() == ['Book Store', 'Garage']
+    assert not os.path.exists(Moved) and os.path.exists(os.path.join(Utilities.FullPath_Bronze_Archive, 'BankA', 'Export1.csv'))
+
+def test_ApplyDatatypesParsesEveryChunkTheSameWayAndCountsWhatItCantConvert():
+    #With no format, dates are read as ISO 8601 whatever the first value of the chunk is; anything else is missing, and counted
+    Data, Coerced = Utilities.ApplyDatatypes(pd.DataFrame({'Amount': ['$1,234.50', 'abc', None], 'Date': ['2024-01-05', '01/02/2024', None], 'Note': ['a', 'b', None]}), {'Amount': 'Currency', 'Date': 'Date', 'Note': 'Text'})
+    assert Data['Date'].iloc[0] == pd.Timestamp('2024-01-05') and Data['Date'].isna().tolist() == [False, True, True]
+    assert Data['Amount'].tolist()[0] == 1234.5 and Data['Amount'].isna().tolist() == [False, True, True]
+    assert Coerced == {'Amount': 1, 'Date': 1} #A value that was already missing isn't counted
+
+    #A format given in the Datatype is used for every chunk, rather than one guessed from the first value of each
+    for Values, Expected in [(['13/01/2024', '05/01/2024'], ['2024-01-13', '2024-01-05']), (['05/01/2024', '13/01/2024'], ['2024-01-05', '2024-01-13'])]:
+        Data, Coerced = Utilities.ApplyDatatypes(pd.DataFrame({'Date': Values}), {'Date': 'Date:%d/%m/%Y'})
+        assert Data['Date'].dt.strftime('%Y-%m-%d').tolist() == Expected
+        assert Coerced == {}
+    assert Utilities.SplitDatatype(' DateTime : %Y-%m-%d %H:%M ') == ('DateTime', '%Y-%m-%d %H:%M')
+    assert Utilities.SplitDatatype('Decimal') == ('Decimal', '')
+
+def test_LogSinkWritesEachBatchInOrderAndReadersOrderTheWholeLog(tmp_path, monkeypatch):
+    FullPath = OpenLogFile(tmp_path, monkeypatch)
+    Sink = Utilities.LogSink(Capacity = 2)
+    Sink.append(BuildLogEntry('Step2', 'Main', '2024-01-01 00:00:02.000000'))
+    Sink.append(BuildLogEntry('Step1', 'Main', '2024-01-01 00:00:01.000000')) #The buffer is full, so this batch is written
+    assert len(Sink) == 0
+    Sink.append(BuildLogEntry('Main', '', '2024-01-01 00:00:00.000000')) #Main began first, but ends last
+    Sink.Close()
+
+    #Each batch is ordered by Begin, but Main lands after the steps it called
+    assert ReadText(FullPath)['ExecutionGUID'].tolist() == ['Step1', 'Step2', 'Main']
+
+    #Readers order the whole log by Begin
+    LogDatabase = Utilities.ConnectLogDatabase(os.path.join(tmp_path, 'Log.db'))
+    try:
+        assert QueryLog.ImportLogFile(LogDatabase, FullPath) == 3
+        Columns, Rows = QueryLog.RetrieveCallTree(LogDatabase, 'Main')
+        assert [Row[Columns.index('ExecutionGUID')] for Row in Rows] == ['Main', 'Step1', 'Step2']
+    finally:
+        LogDatabase.close()
+
+def test_LogSinkKeepsOnlyTheNewestEntriesUntilTheLogFileIsValidated(tmp_path, monkeypatch):
+    FullPath = OpenLogFile(tmp_path, monkeypatch)
+    monkeypatch.setattr(Utilities, 'IsValid_LogFile', False)
+    Sink = Utilities.LogSink(Capacity = 3)
+    Sink.extend(BuildLogEntry(f'Step{Step}', 'Main', f'2024-01-01 00:00:{Step:02}.000000') for Step in range(10))
+    assert len(Sink) == 3
+
+    monkeypatch.setattr(Utilities, 'IsValid_LogFile', True)
+    Sink.Close()
+    assert ReadText(FullPath)['ExecutionGUID'].tolist() == ['Step7', 'Step8', 'Step9']
+
+def test_LogFileIsRotatedOnceItReachesLogFileMaxBytes(tmp_path, monkeypatch):
+    FullPath = OpenLogFile(tmp_path, monkeypatch)
+    Sink = Utilities.LogSink(Capacity = 1)
+    Sink.append(BuildLogEntry('Step1', 'Main', '2024-01-01 00:00:01.000000'))
+    monkeypatch.setattr(Utilities, 'LogFileMaxBytes', os.path.getsize(FullPath)) #Log.txt is now as large as it's allowed to be
+    Sink.append(BuildLogEntry('Step2', 'Main', '2024-01-01 00:00:02.000000'))
+
+    #The full log file is kept under a new name, and the new one starts with the column header
+    Rotated = [Name for Name in os.listdir(tmp_path) if Name.startswith('Log.') and (Name != 'Log.txt')]
+    assert len(Rotated) == 1
+    assert ReadText(os.path.join(tmp_path, Rotated[0]))['ExecutionGUID'].tolist() == ['Step1']
+    assert ReadText(FullPath)['ExecutionGUID'].tolist() == ['Step2']
+
+@pytest.mark.parametrize('Format', sorted(Utilities.StorageFormats))
+def test_TablesRoundTripInEveryStorageFormat(Layout, monkeypatch, Format):
+    monkeypatch.setattr(Utilities, 'StorageFormat', Format)
+    Table = os.path.join(Utilities.FullPath_Silver_Dimension, 'Seller.txt')
+    Rows = pd.DataFrame({'DateTimeInserted': ['2024-01-01', '2024-01-02', '2024-01-03'], 'Name': ['Book Store', 'Garage', 'Coffee Shop'], 'SellerGUID': ['S1', 'S2', 'S3']})
+
+    #Written straight to disk, replaced and appended to
+    Utilities.WriteTable(Table, Rows[:1], Staged = False)
+    Utilities.WriteTable(Table, Rows[1:2], Append = True, Staged = False)
+    assert os.path.exists(os.path.splitext(Table)[0] + Utilities.StorageFormats[Format])
+    pd.testing.assert_frame_equal(Utilities.ReadTable(Table), Rows[:2])
+
+    #Written by a run's commit
+    LogEntries, Result = Utilities.BeginRun('Test', [], '')
+    Utilities.WriteTable(Table, Rows[2:], Append = True)
+    LogEntries, Result = Utilities.CommitRun('Test', [], '')
+    assert Result == Utilities.Result_Success
+    pd.testing.assert_frame_equal(Utilities.ReadTable(Table), Rows)
+    pd.testing.assert_frame_equal(Utilities.ReadTable(Table, ['Name']), Rows[['Name']])
+
+@pytest.mark.parametrize('Formula', [
+    "row['Amount'].__class__" #Attributes
+    , "Abs.__globals__"
+    , "row['Description'].str.upper()"
+    , "__import__('os')" #Calls outside the whitelist
+    , "open('/etc/passwd')"
+    , "eval('1')"
+    , "(lambda: 1)()"
+    , "row['Amount'](1)"
+    , "Abs(*row)"
+    , "__builtins__" #Dunder and other unknown names
+    , "__name__"
+    , "Amount"
+    , "row[0]" #Anything subscripted but a column
+    , "Abs[0]"
+    , "[Value for Value in row]" #Anything else
+    , "f'{row}'"
+    , "{'a': 1}"
+    , "row['Amount'] if True else eval('1')"
+])
+def test_CompileExpressionRejectsAnythingOutsideTheWhitelist(Formula):
+    with pytest.raises(ValueError, match = 'is not valid'): Utilities.CompileExpression(Formula)
+
+def test_CompileExpressionRewritesFormulasToWorkOnWholeColumns():
+    Data = pd.DataFrame({'Amount': [-5.0, 2.0, 20.0], 'Description': ['Pay', 'Rent', 'Coffee']})
+    for Formula, Expected in [
+        ("row['Amount'] > 0 and row['Description'] == 'Rent'", [False, True, False]) #and, or, not
+        , ("row['Amount'] < 0 or row['Description'] == 'Coffee'", [True, False, True])
+        , ("not row['Amount'] > 0", [True, False, False])
+        , ("0 < row['Amount'] < 10", [False, True, False]) #A chained comparison
+        , ("row['Description'] in ['Pay', 'Rent']", [True, True, False]) #in and not in
+        , ("row['Description'] not in ['Pay', 'Rent']", [False, False, True])
+        , ("'Credit' if row['Amount'] > 0 else 'Debit'", ['Debit', 'Credit', 'Credit']) #x if Condition else y
+        , ("Upper(Left(row['Description'], 2))", ['PA', 'RE', 'CO'])
+        , ("Upper('x')", ['X', 'X', 'X']) #A constant given to a function that works on a column is repeated for every row
+        , ("Left('hello', 2)", ['he', 'he', 'he'])
+        , ("Upper(row['Description']) + '-' + Left('hello', 2)", ['PAY-he', 'RENT-he', 'COFFEE-he'])
+    ]:
+        assert Utilities.EvaluateExpression(Formula, Data).tolist() == Expected, Formula
+    assert Utilities.EvaluateExpression('Year(IngestDatetime)', Data, '2024-01-01 00:00:00.000000').tolist() == [2024, 2024, 2024]
+    assert Utilities.EvaluateExpression("Month(row['Description']) + Day(IngestDatetime)", pd.DataFrame({'Description': ['2024-03-09']}), '2024-01-02 00:00:00.000000').tolist() == [5]
+    assert Utilities.CompileExpression("row['Amount'] > 0 and row['Description'] == 'Rent'")[1] == {'Amount', 'Description'}
+
+    #A rule can use a column calculated by an earlier one, and when the file was ingested
+    Data = Utilities.ApplyExpressions(Data, (('Debit', "-row['Amount'] if row['Amount'] < 0 else 0"), ('IsLarge', "row['Debit'] > 1"), ('Ingested', 'IngestDatetime')), '2024-01-01 00:00:00.000000')
+    assert Data['IsLarge'].tolist() == [True, False, False]
+    assert Data['Ingested'].iloc[0] == '2024-01-01 00:00:00.000000'
+    with pytest.raises(ValueError, match = "don't exist: Balance"): Utilities.EvaluateExpression("row['Balance'] > 0", Data)